@@ -0,0 +1,64 @@
+"""Benchmark the cluster assignment step of the k-means algorithm.
+
+Compares the original per-observation assignment loop with the chunked,
+vectorized assignment engine used by stattools.cluster.KMeansCluster across
+different numbers of observations (n), features (p), and clusters (k).
+
+Usage:
+
+    PYTHONPATH=. python benchmarks/k_means_assignment.py
+"""
+
+import itertools
+import timeit
+
+import numpy as np
+
+from stattools.cluster.k_means import _ClusterAssigner
+
+
+def assign_clusters_loop(x, centers):
+    """The original assignment: one distance computation per observation."""
+    clusters = np.empty(shape=len(x), dtype=np.int_)
+    for i, obs in enumerate(x):
+        clusters[i] = np.argmin(np.linalg.norm(obs - centers, axis=1))
+    return clusters
+
+
+def time_call(func, repeat=3):
+    """Best wall time (in seconds) of `repeat` calls of `func`."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    rs = np.random.RandomState(0)
+    ns = (1000, 10000, 100000)
+    ps = (2, 10, 50)
+    ks = (5, 50)
+
+    print(f"{'n':>8} {'p':>4} {'k':>4} {'loop (s)':>10} {'chunked (s)':>12}"
+          f" {'speedup':>8} {'agree':>6}")
+    for n, p, k in itertools.product(ns, ps, ks):
+        x = rs.normal(size=(n, p))
+        centers = x[rs.choice(n, size=k, replace=False)]
+
+        assign = _ClusterAssigner(x, k)
+        t_new = time_call(lambda: assign(centers))
+        clusters = assign(centers).copy()
+
+        if n <= 10000:
+            t_old = time_call(lambda: assign_clusters_loop(x, centers),
+                              repeat=1)
+            agree = np.array_equal(clusters, assign_clusters_loop(x, centers))
+            speedup = f"{t_old / t_new:8.1f}"
+            t_old = f"{t_old:10.4f}"
+        else:
+            # The original loop is too slow to be worth waiting for here
+            t_old, speedup, agree = f"{'-':>10}", f"{'-':>8}", "-"
+
+        print(f"{n:>8} {p:>4} {k:>4} {t_old} {t_new:12.4f} {speedup}"
+              f" {str(agree):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
 """Unsupervised clustering algorithms."""
 
 from .k_means import KMeansCluster
+from .mini_batch import MiniBatchKMeans
@@ -16,11 +16,17 @@ import itertools
 import numpy as np
 
 from ..generic import Predictor
+from ..utils import parallel_map
+from ..utils import spawn_random_states
 from ..utils.validation import validate_bool
 from ..utils.validation import validate_float
 from ..utils.validation import validate_int
 from ..utils.validation import validate_sample
 
+# Default memory budget (in bytes) for the block of distances computed at once
+# when assigning observations to clusters
+_CHUNK_BYTES = 2 ** 24
+
 
 class KMeansCluster(Predictor):
     """Partition data into K clusters based on minimizing the
@@ -36,10 +42,14 @@ class KMeansCluster(Predictor):
         Indicate whether the input data should be standardized.
     random_state : numpy.random.RandomState
         The random number generator.
+    chunk_size : int or None
+        Number of observations whose distances to the cluster centers are
+        computed at once. If None, this is determined by a memory budget.
     """
     k: int = None
     standardize: bool = None
     random_state: np.random.RandomState
+    chunk_size: int = None
 
     # Cluster centers in terms of possibly standardized units
     _centers: np.ndarray = None
@@ -48,7 +58,8 @@ class KMeansCluster(Predictor):
     _x_mean: np.ndarray = None
     _x_std: np.ndarray = None
 
-    def __init__(self, k, standardize=True, random_state=None):
+    def __init__(self, k, standardize=True, random_state=None,
+                 chunk_size=None):
         """Initialize a ClusterKMeans object.
 
         Parameters
@@ -57,10 +68,22 @@ class KMeansCluster(Predictor):
             The number of clusters.
         standardize : bool
             Indicate whether the input data should be standardized.
+        random_state : int or numpy.random.RandomState object, optional
+            A numpy.random.RandomState object or a valid initializer for a
+            numpy.random.RandomState object. To be used as the random number
+            generator.
+        chunk_size : int, optional
+            Number of observations whose distances to the cluster centers are
+            computed at once. Smaller values use less memory. If None, the
+            chunk size is chosen so that each block of distances occupies at
+            most 16 MiB.
         """
         # Validate parameters
         self.k = validate_int(k, "k", minimum=2)
         self.standardize = validate_bool(standardize, "standardize")
+        if chunk_size is not None:
+            chunk_size = validate_int(chunk_size, "chunk_size", minimum=1)
+        self.chunk_size = chunk_size
 
         # Seed the RNG
         if isinstance(random_state, np.random.RandomState):
@@ -80,7 +103,8 @@ class KMeansCluster(Predictor):
         else:
             return self._centers
 
-    def fit(self, x, tol=1e-5, iterations=None, repeats=5):
+    def fit(self, x, tol=1e-5, iterations=None, repeats=5, algorithm="lloyd",
+            init="k-means++", n_jobs=1, backend="thread"):
         """Fit the K-means cluster model to data.
 
         Parameters
@@ -98,23 +122,80 @@ class KMeansCluster(Predictor):
             Number of times to repeat the algorithm with different initial
             center assignments. This can decrease the chance of finding only
             non-global minima of the loss function
+        algorithm : str, optional
+            Variant of the k-means algorithm to use. All variants produce the
+            same clusterings, but differ in how many distances they compute.
+            Acceptable values:
+                "lloyd" (default):
+                    Compute the distance between every observation and every
+                    center in each iteration (Lloyd's algorithm).
+                "hamerly":
+                    Maintain an upper bound on the distance to the assigned
+                    center and one lower bound on the distance to the other
+                    centers for each observation, and skip observations whose
+                    bounds show that their assignment cannot change (Hamerly
+                    (2010)). Uses O(n) extra memory.
+                "elkan":
+                    Maintain an upper bound and k lower bounds (one for each
+                    center) for each observation, and use the triangle
+                    inequality with the distances between centers to skip
+                    individual distance computations (Elkan (2003)). Uses
+                    O(n * k) extra memory.
+            The bounds pay off once most observations have settled into their
+            clusters, i.e., for well-clustered data and large k. Of the two
+            accelerated variants, "hamerly" usually has the lower overhead.
+        init : str, optional
+            How to choose the initial cluster centers in each repetition.
+            Acceptable values:
+                "k-means++" (default):
+                    Choose observations one at a time with probability
+                    proportional to their squared distance to the nearest
+                    center chosen so far (D^2 sampling, Arthur & Vassilvitskii
+                    (2007)). Several candidates are tried at each step and the
+                    one that reduces the loss the most is kept.
+                "k-means||":
+                    Oversample about 2 * k observations per round for a few
+                    rounds by independent D^2 sampling, then reduce the
+                    candidates to k centers by weighted k-means++ (Bahmani et
+                    al. (2012)). This needs only a few passes over the data.
+                "random":
+                    Choose k observations uniformly at random without
+                    replacement.
+            Good initial centers need fewer repetitions to reach the same loss.
+        n_jobs : int or None, optional
+            Number of repetitions to run in parallel. If negative, this counts
+            backwards from the number of CPUs (-1 means all CPUs). Each
+            repetition draws from its own random number generator spawned from
+            `random_state`, so the result does not depend on `n_jobs`.
+        backend : str, optional
+            Either "thread" or "process". The feature matrix is shared with the
+            workers without copying it in both cases. See
+            stattools.utils.parallel_map().
 
         Returns
         -------
         This KMeansCluster instance.
+
+        References
+        ----------
+        Charles Elkan. "Using the Triangle Inequality to Accelerate k-Means".
+            Proceedings of the Twentieth International Conference on Machine
+            Learning (2003), pp. 147--153.
+        Greg Hamerly. "Making k-means even faster". Proceedings of the 2010
+            SIAM International Conference on Data Mining (2010), pp. 130--140.
+            DOI: https://doi.org/10.1137/1.9781611972801.12
+        David Arthur and Sergei Vassilvitskii. "k-means++: The Advantages of
+            Careful Seeding". Proceedings of the Eighteenth Annual ACM-SIAM
+            Symposium on Discrete Algorithms (2007), pp. 1027--1035.
+        Bahman Bahmani, Benjamin Moseley, Andrea Vattani, Ravi Kumar, and
+            Sergei Vassilvitskii. "Scalable K-Means++". Proceedings of the VLDB
+            Endowment. Vol. 5, No. 7 (2012), pp. 622--633.
+            DOI: https://doi.org/10.14778/2180912.2180915
         """
         # Validate parameters
-        x, tol, iterations, repeats = \
-            _validate_fit_params(x, self.k, tol, iterations, repeats)
-
-        # n = number of observations, p = number of features
-        n, p = x.shape
-
-        # Initialize array of cluster centers
-        centers = np.empty(shape=(repeats, self.k, p), dtype=np.float_)
-
-        # Initialize array of within-cluster-sum-of-squares losses
-        loss = np.empty(shape=repeats)
+        x, tol, iterations, repeats, algorithm, init = \
+            _validate_fit_params(x, self.k, tol, iterations, repeats, algorithm,
+                                 init)
 
         # Standardize data if necessary
         if self.standardize:
@@ -123,48 +204,17 @@ class KMeansCluster(Predictor):
             if np.any(self._x_std == 0):
                 self._x_std[self._x_std == 0] = 1.0
             x = (x - self._x_mean) / self._x_std
+        x = np.asarray(x, dtype=np.float_)
 
         # Repeat the k-means clustering algorithm to decrease the chance of
-        # finding only non-global minima of the loss function
-        for i in range(repeats):
-            # Initialize random starting cluster centers by choosing k
-            # observations without replacement from the feature matrix
-            ind = self.random_state.choice(n, size=self.k, replace=False)
-            centers_ = x.take(ind, axis=0)
-
-            if iterations is None:
-                counter = itertools.count()
-            else:
-                counter = range(iterations)
-
-            # Perform the k-means clustering algorithm (an EM algorithm)
-            for _ in counter:
-                # Save the current centers for later
-                centers_old = centers_
-
-                # (E step) Assign each observation to a cluster
-                clusters = _assign_clusters(x, centers_)
-
-                # (M step) Get new centers as the means of the currently
-                # assigned clusters
-                centers_ = np.zeros(shape=(self.k, p), dtype=np.float_)
-                for j in range(self.k):
-                    centers_[j, :] = np.mean(x[clusters == j, :], axis=0)
-
-                # Check for convergence
-                if np.linalg.norm(centers_ - centers_old) < tol:
-                    break
-
-            # Sort the final centers in lexicographic order
-            ind = np.lexsort([centers_[:, p - i - 1] for i in range(p)])
-            centers_ = centers_[ind]
-
-            # Save the resulting centers and compute final cluster assignments
-            centers[i] = centers_
-            clusters = _assign_clusters(x, centers_)
-
-            # Evaluate the clusters by their within-cluster-sum-of-squares
-            loss[i] = _k_means_loss(x, clusters=clusters, centers=centers_)
+        # finding only non-global minima of the loss function. Each repetition
+        # gets an independent random number generator.
+        tasks = [(random_state,) for random_state in
+                 spawn_random_states(self.random_state, repeats)]
+        results = parallel_map(_k_means_run, (x, self.k, tol, iterations,
+                                              algorithm, init, self.chunk_size),
+                               tasks, n_jobs=n_jobs, backend=backend)
+        centers, loss = zip(*results)
 
         # Choose the cluster center assignment that minimizes the loss
         self._centers = centers[np.argmin(loss)]
@@ -198,10 +248,11 @@ class KMeansCluster(Predictor):
             x = (x - self._x_mean) / self._x_std
 
         # Return cluster assignments
-        return _assign_clusters(x, self._centers)
+        return _assign_clusters(x, self._centers, chunk_size=self.chunk_size)
 
 
-def _k_means_loss(x: np.ndarray, clusters: np.ndarray, centers: np.ndarray):
+def _k_means_loss(x: np.ndarray, clusters: np.ndarray, centers: np.ndarray,
+                  sq_dist: np.ndarray = None):
     """Compute the within-cluster-sum-of-squares loss function.
 
     Parameters
@@ -213,20 +264,216 @@ def _k_means_loss(x: np.ndarray, clusters: np.ndarray, centers: np.ndarray):
         of the i-th observation x[i, :].
     centers : numpy.ndarray
         Array of shape (k, p) of the centers of each of the k clusters.
+    sq_dist : numpy.ndarray, optional
+        Array of shape (n, ) of the squared distances between each observation
+        and the center of its cluster, if these are already known (e.g., from
+        _ClusterAssigner). Otherwise they are computed in chunks of rows.
 
     Returns
     -------
     The within-cluster-sum-of-squares loss (cf. equation (14.31) in Hastie,
     Tibshirani, & Friedman (2009)).
     """
-    loss = 0.0
-    for i, center in enumerate(centers):
-        n = np.sum(clusters == i)
-        loss += n * np.sum(np.linalg.norm(x[clusters == i] - center, axis=1))
-    return loss
+    if sq_dist is None:
+        sq_dist = np.empty(shape=len(x), dtype=np.float_)
+        chunk_size = _default_chunk_size(centers.shape[1])
+        for start in range(0, len(x), chunk_size):
+            stop = min(start + chunk_size, len(x))
+            diff = x[start:stop] - centers[clusters[start:stop]]
+            sq_dist[start:stop] = np.einsum("ij,ij->i", diff, diff)
+
+    counts = np.bincount(clusters, minlength=len(centers))
+    return np.sum(counts[clusters] * np.sqrt(sq_dist))
+
+
+def _default_chunk_size(width: int) -> int:
+    """Number of rows of a float array with `width` columns fitting in the
+    default chunk memory budget.
+    """
+    row_bytes = np.dtype(np.float_).itemsize * max(width, 1)
+    return max(1, _CHUNK_BYTES // row_bytes)
+
+
+class _ClusterAssigner(object):
+    """Assign the observations of a fixed feature matrix to their nearest
+    cluster centers.
+
+    Squared Euclidean distances are computed in chunks of rows using the
+    expansion ||x - c||^2 = ||x||^2 - 2 * x.c + ||c||^2, so that each chunk
+    costs a single matrix product. The squared norms of the observations and
+    all work buffers are computed once and reused every time the assigner is
+    called with new centers (e.g., in each iteration of the k-means algorithm).
+
+    Properties
+    ----------
+    x : numpy.ndarray
+        Feature matrix of shape (n, p) to cluster.
+    chunk_size : int
+        Number of observations processed at once.
+    clusters : numpy.ndarray
+        Array of shape (n, ) of the most recent cluster assignments. This
+        buffer is overwritten by each call.
+    sq_dist : numpy.ndarray
+        Array of shape (n, ) of the squared distances between each observation
+        and its most recently assigned center. This buffer is overwritten by
+        each call.
+    """
+
+    def __init__(self, x: np.ndarray, k: int, chunk_size: int = None):
+        """Initialize the assigner and allocate its buffers.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Feature matrix of shape (n, p) to cluster.
+        k : int
+            Number of cluster centers.
+        chunk_size : int, optional
+            Number of observations processed at once. If None, this is chosen
+            so that the (chunk_size, k) block of distances fits in the default
+            memory budget.
+        """
+        self.x = np.asarray(x, dtype=np.float_)
+        n = len(self.x)
+
+        if chunk_size is None:
+            chunk_size = _default_chunk_size(k)
+        self.chunk_size = min(chunk_size, max(n, 1))
+
+        # Squared norms of the observations never change
+        self._x_sq = np.einsum("ij,ij->i", self.x, self.x)
+
+        self.clusters = np.empty(shape=n, dtype=np.int_)
+        self.sq_dist = np.empty(shape=n, dtype=np.float_)
+        self._buffer = np.empty(shape=(self.chunk_size, k), dtype=np.float_)
+
+    def __call__(self, centers: np.ndarray) -> np.ndarray:
+        """Assign each observation to its nearest center.
+
+        Parameters
+        ----------
+        centers : numpy.ndarray
+            Array of shape (k, p) of the centers of each of the k clusters.
+
+        Returns
+        -------
+        clusters : numpy.ndarray
+            Array of shape (n, ) in which the i-th entry is the index of the
+            cluster of the i-th observation x[i, :].
+        """
+        centers = np.asarray(centers, dtype=np.float_)
+        c_sq = np.einsum("ij,ij->i", centers, centers)
+        n = len(self.x)
+
+        for start in range(0, n, self.chunk_size):
+            stop = min(start + self.chunk_size, n)
+            dist = self._sq_dist_chunk(self.x[start:stop],
+                                       self._x_sq[start:stop], centers, c_sq)
+
+            clusters = self.clusters[start:stop]
+            np.argmin(dist, axis=1, out=clusters)
+            self.sq_dist[start:stop] = dist[np.arange(stop - start), clusters]
+
+        # Guard against small negative values caused by cancellation
+        np.maximum(self.sq_dist, 0.0, out=self.sq_dist)
+
+        return self.clusters
+
+    def distances(self, centers: np.ndarray,
+                  index: np.ndarray = None) -> np.ndarray:
+        """Compute the Euclidean distances between observations and every
+        center.
+
+        Parameters
+        ----------
+        centers : numpy.ndarray
+            Array of shape (k, p) of the centers of each of the k clusters.
+        index : numpy.ndarray, optional
+            Integer array of shape (m, ) of the rows of `x` to consider. If
+            None, all rows are used.
+
+        Returns
+        -------
+        dist : numpy.ndarray
+            Array of shape (m, k) of distances.
+        """
+        centers = np.asarray(centers, dtype=np.float_)
+        c_sq = np.einsum("ij,ij->i", centers, centers)
+        if index is None:
+            index = np.arange(len(self.x))
+        m = len(index)
+
+        dist = np.empty(shape=(m, len(centers)), dtype=np.float_)
+        for start in range(0, m, self.chunk_size):
+            stop = min(start + self.chunk_size, m)
+            rows = index[start:stop]
+            dist[start:stop] = self._sq_dist_chunk(self.x[rows],
+                                                   self._x_sq[rows], centers,
+                                                   c_sq)
+        np.maximum(dist, 0.0, out=dist)
+        return np.sqrt(dist, out=dist)
+
+    def two_nearest(self, centers: np.ndarray, index: np.ndarray):
+        """Find the nearest and second nearest centers of a subset of the
+        observations.
+
+        Parameters
+        ----------
+        centers : numpy.ndarray
+            Array of shape (k, p) of the centers of each of the k clusters.
+        index : numpy.ndarray
+            Integer array of shape (m, ) of the rows of `x` to consider.
+
+        Returns
+        -------
+        clusters : numpy.ndarray
+            Array of shape (m, ) of the indices of the nearest centers.
+        first : numpy.ndarray
+            Array of shape (m, ) of the distances to the nearest centers.
+        second : numpy.ndarray
+            Array of shape (m, ) of the distances to the second nearest centers.
+        """
+        centers = np.asarray(centers, dtype=np.float_)
+        c_sq = np.einsum("ij,ij->i", centers, centers)
+        m = len(index)
+
+        clusters = np.empty(shape=m, dtype=np.int_)
+        first = np.empty(shape=m, dtype=np.float_)
+        second = np.empty(shape=m, dtype=np.float_)
+        for start in range(0, m, self.chunk_size):
+            stop = min(start + self.chunk_size, m)
+            rows = index[start:stop]
+            dist = self._sq_dist_chunk(self.x[rows], self._x_sq[rows], centers,
+                                       c_sq)
+
+            ind = np.arange(stop - start)
+            clusters[start:stop] = np.argmin(dist, axis=1)
+            first[start:stop] = dist[ind, clusters[start:stop]]
+            dist[ind, clusters[start:stop]] = np.inf
+            second[start:stop] = np.min(dist, axis=1)
+
+        for d in (first, second):
+            np.maximum(d, 0.0, out=d)
+            np.sqrt(d, out=d)
+        return clusters, first, second
+
+    def _sq_dist_chunk(self, x, x_sq, centers, c_sq):
+        """Compute squared distances between a chunk of observations and the
+        centers in the work buffer. The result is a view of the buffer.
+        """
+        dist = self._buffer[:len(x)]
 
+        # ||x||^2 - 2 * x.c + ||c||^2, computed in place
+        np.dot(x, centers.T, out=dist)
+        dist *= -2.0
+        dist += c_sq
+        dist += x_sq[:, np.newaxis]
 
-def _assign_clusters(x: np.ndarray, centers: np.ndarray) -> np.ndarray:
+        return dist
+
+
+def _assign_clusters(x: np.ndarray, centers: np.ndarray,
+                     chunk_size: int = None) -> np.ndarray:
     """Given cluster centers, assign data points to clusters.
 
     Parameters
@@ -235,20 +482,478 @@ def _assign_clusters(x: np.ndarray, centers: np.ndarray) -> np.ndarray:
         Feature matrix of shape (n, p) to cluster.
     centers : numpy.ndarray
         Array of shape (k, p) of the centers of each of the k clusters.
+    chunk_size : int, optional
+        Number of observations processed at once. See _ClusterAssigner.
+
+    Returns
+    -------
+    clusters : numpy.ndarray
+        Array of shape (n, ) in which the i-th entry is the index of the cluster
+        of the i-th observation x[i, :].
+    """
+    return _ClusterAssigner(x, len(centers), chunk_size=chunk_size)(centers)
+
+
+def _k_means_run(x: np.ndarray, k: int, tol: float, iterations: int,
+                 algorithm: str, init: str, chunk_size: int,
+                 random_state: np.random.RandomState):
+    """Run the k-means clustering algorithm once from random initial centers.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Feature matrix of shape (n, p) to cluster.
+    k : int
+        Number of clusters.
+    tol : float
+        Positive tolerance for algorithm convergence.
+    iterations : int or None
+        Maximum number of iterations to perform.
+    algorithm : str
+        Name of the k-means algorithm variant (see _K_MEANS_ALGORITHMS).
+    init : str
+        Name of the initialization method (see _K_MEANS_INITS).
+    chunk_size : int or None
+        Number of observations processed at once during cluster assignment.
+    random_state : numpy.random.RandomState
+        The random number generator.
+
+    Returns
+    -------
+    centers : numpy.ndarray
+        Array of shape (k, p) of the final cluster centers in lexicographic
+        order.
+    loss : float
+        The within-cluster-sum-of-squares loss of the final clusters.
+    """
+    p = x.shape[1]
+
+    # The cluster assignment engine reuses its buffers across iterations
+    assign = _ClusterAssigner(x, k, chunk_size=chunk_size)
+
+    # Choose the initial cluster centers
+    centers = _K_MEANS_INITS[init](x, k, random_state)
+
+    # Perform the k-means clustering algorithm (an EM algorithm)
+    centers = _K_MEANS_ALGORITHMS[algorithm](x, centers, tol, iterations,
+                                             assign)
+
+    # Sort the final centers in lexicographic order
+    ind = np.lexsort([centers[:, p - i - 1] for i in range(p)])
+    centers = centers[ind]
+
+    # Evaluate the clusters by their within-cluster-sum-of-squares
+    clusters = assign(centers)
+    loss = _k_means_loss(x, clusters=clusters, centers=centers,
+                         sq_dist=assign.sq_dist)
+
+    return centers, loss
+
+
+def _init_random(x: np.ndarray, k: int,
+                 random_state: np.random.RandomState) -> np.ndarray:
+    """Choose k observations uniformly at random without replacement as the
+    initial cluster centers.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Feature matrix of shape (n, p) to cluster.
+    k : int
+        Number of clusters.
+    random_state : numpy.random.RandomState
+        The random number generator.
+
+    Returns
+    -------
+    centers : numpy.ndarray
+        Array of shape (k, p) of the initial cluster centers.
+    """
+    ind = random_state.choice(len(x), size=k, replace=False)
+    return x.take(ind, axis=0)
+
+
+def _init_k_means_plusplus(x: np.ndarray, k: int,
+                           random_state: np.random.RandomState,
+                           weights: np.ndarray = None,
+                           n_trials: int = None) -> np.ndarray:
+    """Choose the initial cluster centers by (greedy) k-means++ seeding.
+
+    Each new center is sampled with probability proportional to the (weighted)
+    squared distance of the observations to their nearest center chosen so
+    far. Of `n_trials` such samples, the one which decreases the total squared
+    distance the most is kept.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Feature matrix of shape (n, p) to cluster.
+    k : int
+        Number of clusters.
+    random_state : numpy.random.RandomState
+        The random number generator.
+    weights : numpy.ndarray, optional
+        Array of shape (n, ) of non-negative observation weights. If None, each
+        observation has weight 1.
+    n_trials : int, optional
+        Number of candidates sampled for each new center. If None, this is
+        2 + floor(log(k)).
 
     Returns
     -------
+    centers : numpy.ndarray
+        Array of shape (k, p) of the initial cluster centers.
+    """
+    x = np.asarray(x, dtype=np.float_)
+    n, p = x.shape
+    if weights is None:
+        weights = np.ones(shape=n, dtype=np.float_)
+    if n_trials is None:
+        n_trials = 2 + int(np.log(k))
+
+    x_sq = np.einsum("ij,ij->i", x, x)
+    centers = np.empty(shape=(k, p), dtype=np.float_)
+
+    # The first center is sampled according to the weights alone
+    ind = _sample_proportional(weights, 1, random_state)[0]
+    centers[0] = x[ind]
+    d2 = x_sq - 2.0 * x.dot(x[ind]) + x_sq[ind]
+    np.maximum(d2, 0.0, out=d2)
+
+    for j in range(1, k):
+        # Sample candidates by D^2 sampling
+        cand = _sample_proportional(weights * d2, n_trials, random_state)
+
+        # Squared distances to each candidate (one matrix product), and the
+        # resulting nearest-center squared distances for each candidate
+        cand_d2 = x_sq[:, np.newaxis] - 2.0 * x.dot(x[cand].T) + x_sq[cand]
+        np.minimum(cand_d2, d2[:, np.newaxis], out=cand_d2)
+        np.maximum(cand_d2, 0.0, out=cand_d2)
+
+        # Keep the candidate with the smallest total squared distance
+        best = np.argmin(weights.dot(cand_d2))
+        centers[j] = x[cand[best]]
+        d2 = cand_d2[:, best]
+
+    return centers
+
+
+def _init_k_means_parallel(x: np.ndarray, k: int,
+                           random_state: np.random.RandomState,
+                           oversampling: float = None,
+                           rounds: int = 5) -> np.ndarray:
+    """Choose the initial cluster centers by k-means|| seeding.
+
+    In each round, every observation is independently chosen as a candidate
+    center with probability proportional to its squared distance to the
+    nearest candidate so far. The candidates are then weighted by the number of
+    observations closest to them and reduced to k centers by weighted k-means++
+    seeding.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Feature matrix of shape (n, p) to cluster.
+    k : int
+        Number of clusters.
+    random_state : numpy.random.RandomState
+        The random number generator.
+    oversampling : float, optional
+        Expected number of candidates sampled in each round. If None, this is
+        2 * k.
+    rounds : int, optional
+        Number of sampling rounds.
+
+    Returns
+    -------
+    centers : numpy.ndarray
+        Array of shape (k, p) of the initial cluster centers.
+    """
+    x = np.asarray(x, dtype=np.float_)
+    n = len(x)
+    if oversampling is None:
+        oversampling = 2.0 * k
+
+    # Start from one observation chosen uniformly at random
+    cand = [random_state.randint(n)]
+    d2 = np.sum((x - x[cand[0]]) ** 2, axis=1)
+
+    for _ in range(rounds):
+        phi = np.sum(d2)
+        if phi == 0:
+            break
+
+        # Sample new candidates independently of each other
+        prob = oversampling * d2 / phi
+        new = np.flatnonzero(random_state.uniform(size=n) < prob)
+        if new.size == 0:
+            continue
+        cand.extend(new)
+
+        # Update the squared distances to the nearest candidate
+        assign = _ClusterAssigner(x, new.size)
+        assign(x[new])
+        np.minimum(d2, assign.sq_dist, out=d2)
+
+    cand = np.unique(cand)
+    if cand.size < k:
+        # Too few candidates (e.g., many duplicate observations): add more
+        # observations chosen uniformly at random
+        rest = np.setdiff1d(np.arange(n), cand)
+        extra = random_state.choice(rest, size=k - cand.size, replace=False)
+        cand = np.concatenate((cand, extra))
+
+    # Weight each candidate by the number of observations closest to it
+    clusters = _ClusterAssigner(x, cand.size)(x[cand])
+    weights = np.bincount(clusters, minlength=cand.size).astype(np.float_)
+
+    return _init_k_means_plusplus(x[cand], k, random_state, weights=weights)
+
+
+def _sample_proportional(weights: np.ndarray, size: int,
+                         random_state: np.random.RandomState) -> np.ndarray:
+    """Sample indices with replacement with probabilities proportional to
+    non-negative weights. If all weights are zero, sample uniformly.
+    """
+    cumsum = np.cumsum(weights)
+    total = cumsum[-1]
+    if total <= 0:
+        return random_state.randint(len(weights), size=size)
+    ind = np.searchsorted(cumsum, random_state.uniform(size=size) * total,
+                          side="right")
+    return np.minimum(ind, len(weights) - 1)
+
+
+def _update_centers(x: np.ndarray, clusters: np.ndarray,
+                    centers: np.ndarray) -> np.ndarray:
+    """Compute new cluster centers as the means of the assigned clusters.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Feature matrix of shape (n, p) to cluster.
     clusters : numpy.ndarray
         Array of shape (n, ) in which the i-th entry is the index of the cluster
         of the i-th observation x[i, :].
+    centers : numpy.ndarray
+        Array of shape (k, p) of the current cluster centers. Centers of empty
+        clusters are left where they are.
+
+    Returns
+    -------
+    centers : numpy.ndarray
+        Array of shape (k, p) of the new cluster centers.
+    """
+    k, p = centers.shape
+    counts = np.bincount(clusters, minlength=k)
+    sums = np.empty(shape=(k, p), dtype=np.float_)
+    for j in range(p):
+        sums[:, j] = np.bincount(clusters, weights=x[:, j], minlength=k)
+
+    new_centers = np.array(centers, dtype=np.float_)
+    nonempty = counts > 0
+    new_centers[nonempty] = sums[nonempty] / counts[nonempty, np.newaxis]
+    return new_centers
+
+
+def _center_distances(centers: np.ndarray) -> np.ndarray:
+    """Compute the matrix of Euclidean distances between cluster centers."""
+    diff = centers[:, np.newaxis, :] - centers[np.newaxis, :, :]
+    return np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+
+
+def _row_distances(x: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Compute the Euclidean distances between each row of `x` and the
+    corresponding row of `centers`.
+    """
+    diff = x - centers
+    return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+
+def _k_means_lloyd(x: np.ndarray, centers: np.ndarray, tol: float,
+                   iterations: int, assign: "_ClusterAssigner") -> np.ndarray:
+    """Run Lloyd's k-means algorithm from given initial centers.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Feature matrix of shape (n, p) to cluster.
+    centers : numpy.ndarray
+        Array of shape (k, p) of the initial cluster centers.
+    tol : float
+        Positive tolerance for algorithm convergence.
+    iterations : int or None
+        Maximum number of iterations to perform.
+    assign : _ClusterAssigner
+        Cluster assignment engine for `x`.
+
+    Returns
+    -------
+    centers : numpy.ndarray
+        Array of shape (k, p) of the final cluster centers.
     """
-    clusters = np.empty(shape=len(x), dtype=np.int_)
-    for i, obs in enumerate(x):
-        clusters[i] = np.argmin(np.linalg.norm(obs - centers, axis=1))
-    return clusters
+    counter = itertools.count() if iterations is None else range(iterations)
+    for _ in counter:
+        # Save the current centers for later
+        centers_old = centers
 
+        # (E step) Assign each observation to a cluster
+        clusters = assign(centers)
 
-def _validate_fit_params(x, k, tol, iterations, repeats):
+        # (M step) Get new centers as the means of the currently assigned
+        # clusters
+        centers = _update_centers(x, clusters, centers)
+
+        # Check for convergence
+        if np.linalg.norm(centers - centers_old) < tol:
+            break
+
+    return centers
+
+
+def _k_means_hamerly(x: np.ndarray, centers: np.ndarray, tol: float,
+                     iterations: int, assign: "_ClusterAssigner") -> np.ndarray:
+    """Run Hamerly's accelerated k-means algorithm from given initial centers.
+
+    Each observation keeps an upper bound on the distance to its assigned
+    center and a lower bound on the distance to every other center. Only
+    observations whose upper bound exceeds both the lower bound and half the
+    distance from the assigned center to its nearest other center can change
+    clusters, so only those have their distances recomputed.
+
+    Parameters
+    ----------
+    See _k_means_lloyd().
+
+    Returns
+    -------
+    centers : numpy.ndarray
+        Array of shape (k, p) of the final cluster centers.
+    """
+    # Exact initial assignments and bounds
+    clusters, upper, lower = assign.two_nearest(centers, np.arange(len(x)))
+
+    counter = itertools.count() if iterations is None else range(iterations)
+    for t in counter:
+        centers_old = centers
+
+        # (E step) Reassign only the observations whose bounds permit it
+        if t > 0:
+            cc = _center_distances(centers)
+            np.fill_diagonal(cc, np.inf)
+            s = 0.5 * np.min(cc, axis=1)
+
+            bound = np.maximum(s[clusters], lower)
+            ind = np.flatnonzero(upper > bound)
+            if ind.size > 0:
+                # Tighten the upper bounds and check again
+                upper[ind] = _row_distances(x[ind], centers[clusters[ind]])
+                ind = ind[upper[ind] > bound[ind]]
+            if ind.size > 0:
+                clusters[ind], upper[ind], lower[ind] = \
+                    assign.two_nearest(centers, ind)
+
+        # (M step)
+        centers = _update_centers(x, clusters, centers)
+
+        # Check for convergence
+        if np.linalg.norm(centers - centers_old) < tol:
+            break
+
+        # Update the bounds by how far the centers moved
+        delta = np.linalg.norm(centers - centers_old, axis=1)
+        upper += delta[clusters]
+        if len(delta) > 1:
+            r = np.argmax(delta)
+            second = np.max(np.delete(delta, r))
+            lower -= np.where(clusters == r, second, delta[r])
+
+    return centers
+
+
+def _k_means_elkan(x: np.ndarray, centers: np.ndarray, tol: float,
+                   iterations: int, assign: "_ClusterAssigner") -> np.ndarray:
+    """Run Elkan's accelerated k-means algorithm from given initial centers.
+
+    Each observation keeps an upper bound on the distance to its assigned
+    center and a separate lower bound on the distance to each center. The
+    triangle inequality with the distances between centers and the lower
+    bounds then rule out most observations without computing their distances.
+    Observations with a remaining candidate center have all of their distances
+    recomputed together in each iteration, which also refreshes their lower
+    bounds.
+
+    Parameters
+    ----------
+    See _k_means_lloyd().
+
+    Returns
+    -------
+    centers : numpy.ndarray
+        Array of shape (k, p) of the final cluster centers.
+    """
+    n = len(x)
+
+    # Exact initial assignments and bounds
+    lower = assign.distances(centers)
+    clusters = np.argmin(lower, axis=1)
+    upper = lower[np.arange(n), clusters]
+
+    counter = itertools.count() if iterations is None else range(iterations)
+    for t in counter:
+        centers_old = centers
+
+        # (E step) Reassign only the observations whose bounds permit it
+        if t > 0:
+            cc = _center_distances(centers)
+            np.fill_diagonal(cc, np.inf)
+            s = 0.5 * np.min(cc, axis=1)
+
+            active = np.flatnonzero(upper > s[clusters])
+            if active.size > 0:
+                # Tighten the upper bounds of the remaining observations
+                d = _row_distances(x[active], centers[clusters[active]])
+                upper[active] = d
+                lower[active, clusters[active]] = d
+
+                # Recompute all distances for observations with a center that
+                # is not ruled out by its lower bound, which also refreshes all
+                # of their lower bounds
+                cand = upper[active, np.newaxis] > lower[active]
+                ind = active[np.any(cand, axis=1)]
+                if ind.size > 0:
+                    dist = assign.distances(centers, ind)
+                    lower[ind] = dist
+                    clusters[ind] = np.argmin(dist, axis=1)
+                    upper[ind] = dist[np.arange(ind.size), clusters[ind]]
+
+        # (M step)
+        centers = _update_centers(x, clusters, centers)
+
+        # Check for convergence
+        if np.linalg.norm(centers - centers_old) < tol:
+            break
+
+        # Update the bounds by how far the centers moved
+        delta = np.linalg.norm(centers - centers_old, axis=1)
+        lower -= delta
+        upper += delta[clusters]
+
+    return centers
+
+
+# Map algorithm names to the functions implementing them
+_K_MEANS_ALGORITHMS = {"lloyd": _k_means_lloyd,
+                       "hamerly": _k_means_hamerly,
+                       "elkan": _k_means_elkan}
+
+# Map initialization method names to the functions implementing them
+_K_MEANS_INITS = {"random": _init_random,
+                  "k-means++": _init_k_means_plusplus,
+                  "k-means||": _init_k_means_parallel}
+
+
+def _validate_fit_params(x, k, tol, iterations, repeats, algorithm, init):
     """Validate the parameters for KMeansCluster.fit().
 
     Parameters
@@ -270,4 +975,10 @@ def _validate_fit_params(x, k, tol, iterations, repeats):
 
     repeats = validate_int(repeats, "repeats", minimum=1)
 
-    return x, tol, iterations, repeats
+    if algorithm not in _K_MEANS_ALGORITHMS:
+        raise ValueError(f"Unknown k-means algorithm: {algorithm}")
+
+    if init not in _K_MEANS_INITS:
+        raise ValueError(f"Unknown k-means initialization method: {init}")
+
+    return x, tol, iterations, repeats, algorithm, init
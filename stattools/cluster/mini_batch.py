@@ -0,0 +1,254 @@
+"""Implementation of mini-batch k-means clustering.
+
+See Sculley (2010).
+
+References
+----------
+D. Sculley. "Web-Scale K-Means Clustering". Proceedings of the 19th
+    International Conference on World Wide Web (2010), pp. 1177--1178.
+    DOI: https://doi.org/10.1145/1772690.1772862
+"""
+
+import collections.abc
+
+import numpy as np
+
+from .k_means import KMeansCluster
+from .k_means import _ClusterAssigner
+from .k_means import _init_k_means_plusplus
+from ..utils import iter_batches
+from ..utils.validation import validate_float
+from ..utils.validation import validate_int
+from ..utils.validation import validate_sample
+
+# Weight of the newest validation loss in its exponentially weighted average
+_SMOOTHING = 0.1
+
+
+class MiniBatchKMeans(KMeansCluster):
+    """Partition data into K clusters using small random batches of the data
+    at a time.
+
+    Each batch moves every cluster center towards the mean of the batch
+    observations assigned to it, with a per-center learning rate equal to the
+    reciprocal of the number of observations assigned to that center so far.
+    Only one batch needs to be in memory at a time, so the data can be streamed
+    from disk (e.g., a memory-mapped .npy file or a CSV reader).
+
+    Properties
+    ----------
+    k : int
+        The number of clusters.
+    centers : numpy.ndarray
+        The centers of each cluster.
+    standardize : bool
+        Indicate whether the input data should be standardized. The means and
+        standard deviations are updated incrementally with each batch.
+    random_state : numpy.random.RandomState
+        The random number generator.
+    scores : list
+        The average squared distance between the validation observations and
+        their nearest centers after each batch (only recorded when fitting with
+        a validation sample).
+    """
+    scores: list = None
+
+    # Number of observations assigned to each cluster so far
+    _counts: np.ndarray = None
+
+    # Number of observations seen so far
+    _n_seen: int = 0
+
+    # Column-wise sums of squared deviations from the mean of the observations
+    # seen so far (used to update the standard deviations incrementally)
+    _x_m2: np.ndarray = None
+
+    def fit(self, x, batch_size=1000, epochs=1, tol=1e-4, validation=None,
+            max_no_improvement=10):
+        """Fit the mini-batch K-means cluster model to data.
+
+        Parameters
+        ----------
+        x : array-like or iterator
+            Feature matrix to determine the clustering. This can be an array
+            (including a numpy.memmap) or an iterator of array-like chunks of
+            rows. See stattools.utils.iter_batches() for how each is split into
+            batches.
+        batch_size : int, optional
+            Number of observations in each batch.
+        epochs : int, optional
+            Number of passes over the data. Must be 1 if `x` is an iterator,
+            since an iterator of chunks can only be consumed once.
+        tol : float, optional
+            Positive tolerance for algorithm convergence. If `validation` is
+            given, the validation loss is smoothed by an exponentially weighted
+            average over the batches, and a batch counts as an improvement if
+            it decreases the smallest smoothed loss so far by a relative amount
+            of at least `tol`.
+        validation : array-like, optional
+            Held-out sample used to monitor convergence. If None, every batch
+            in every epoch is processed.
+        max_no_improvement : int, optional
+            If `validation` is given, the algorithm stops after this many
+            consecutive batches without improvement.
+
+        Returns
+        -------
+        This MiniBatchKMeans instance.
+        """
+        # Validate parameters
+        batch_size = validate_int(batch_size, "batch_size", minimum=1)
+        epochs = validate_int(epochs, "epochs", minimum=1)
+        tol = validate_float(tol, "tol", positive=True)
+        max_no_improvement = validate_int(max_no_improvement,
+                                          "max_no_improvement", minimum=1)
+        if epochs > 1 and isinstance(x, collections.abc.Iterator):
+            raise ValueError("Multiple epochs require an array of data.")
+        if validation is not None:
+            validation = validate_sample(validation, n_dim=2)
+
+        # Start from scratch
+        self._centers = None
+        self._counts = None
+        self._n_seen = 0
+        self.scores = []
+
+        # Smoothed validation loss, its smallest value so far, and the number
+        # of consecutive batches which did not improve it
+        smoothed = None
+        best = np.inf
+        no_improvement = 0
+        for _ in range(epochs):
+            for batch in iter_batches(x, batch_size, self.random_state):
+                self.partial_fit(batch)
+
+                if validation is not None and self.fitted:
+                    loss = self._validation_loss(validation)
+                    self.scores.append(loss)
+                    if smoothed is None:
+                        smoothed = loss
+                    else:
+                        smoothed += _SMOOTHING * (loss - smoothed)
+                    if smoothed < (1 - tol) * best:
+                        best = smoothed
+                        no_improvement = 0
+                    else:
+                        no_improvement += 1
+                        if no_improvement >= max_no_improvement:
+                            return self
+
+        return self
+
+    def partial_fit(self, x):
+        """Update the cluster centers using one batch of observations.
+
+        The first batch must contain at least k observations. The initial
+        cluster centers are chosen from it by k-means++ seeding.
+
+        Parameters
+        ----------
+        x : array-like
+            Feature matrix of shape (n, p) of the batch.
+
+        Returns
+        -------
+        This MiniBatchKMeans instance.
+        """
+        x = validate_sample(x, n_dim=2)
+        if self._n_seen > 0 and x.shape[1] != self._centers.shape[1]:
+            raise ValueError(f"Data matrix has wrong number of columns: "
+                             f"expected {self._centers.shape[1]}, found "
+                             f"{x.shape[1]}")
+        if len(x) == 0:
+            return self
+
+        # Standardize data if necessary
+        if self.standardize:
+            self._update_standardization(x)
+            x = (x - self._x_mean) / self._x_std
+        self._n_seen += len(x)
+
+        # Choose the initial cluster centers from the first batch
+        if self._centers is None:
+            if len(x) < self.k:
+                raise ValueError("The first batch must contain at least "
+                                 f"{self.k} observations.")
+            self._centers = _init_k_means_plusplus(x, self.k, self.random_state)
+            self._counts = np.zeros(shape=self.k, dtype=np.int_)
+
+        # Assign each observation in the batch to a cluster
+        clusters = _ClusterAssigner(x, self.k, self.chunk_size)(self._centers)
+
+        # Move each center towards the mean of its batch observations, with
+        # per-center learning rate 1 / (number of observations assigned so far)
+        counts = np.bincount(clusters, minlength=self.k)
+        sums = np.empty(shape=self._centers.shape, dtype=np.float_)
+        for j in range(x.shape[1]):
+            sums[:, j] = np.bincount(clusters, weights=x[:, j],
+                                     minlength=self.k)
+        self._counts += counts
+        nonempty = counts > 0
+        self._centers[nonempty] += \
+            (sums[nonempty] - counts[nonempty, np.newaxis]
+             * self._centers[nonempty]) / self._counts[nonempty, np.newaxis]
+
+        self.fitted = True
+        return self
+
+    def _update_standardization(self, x):
+        """Merge the column means and standard deviations of a batch into the
+        running estimates, and re-express the centers in the new standardized
+        units.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Feature matrix of shape (n, p) of the batch.
+
+        References
+        ----------
+        Tony F. Chan, Gene H. Golub, and Randall J. LeVeque. "Updating Formulae
+            and a Pairwise Algorithm for Computing Sample Variances".
+            COMPSTAT 1982, pp. 30--41. DOI: 10.1007/978-3-642-51461-6_3
+        """
+        n_batch = len(x)
+        mean_batch = x.mean(axis=0)
+        m2_batch = np.sum((x - mean_batch) ** 2, axis=0)
+
+        if self._n_seen == 0:
+            mean, m2 = mean_batch, m2_batch
+        else:
+            n = self._n_seen + n_batch
+            delta = mean_batch - self._x_mean
+            mean = self._x_mean + delta * n_batch / n
+            m2 = self._x_m2 + m2_batch + delta ** 2 * self._n_seen * n_batch / n
+
+        std = np.sqrt(m2 / (self._n_seen + n_batch))
+        std[std == 0] = 1.0
+
+        # The centers are stored in standardized units
+        if self._centers is not None:
+            centers = self._x_mean + self._x_std * self._centers
+            self._centers = (centers - mean) / std
+
+        self._x_mean, self._x_std, self._x_m2 = mean, std, m2
+
+    def _validation_loss(self, x):
+        """Average squared distance between observations and their nearest
+        cluster centers.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            Feature matrix of shape (n, p).
+
+        Returns
+        -------
+        The average squared distance (in standardized units if the model
+        standardizes its input).
+        """
+        if self.standardize:
+            x = (x - self._x_mean) / self._x_std
+        assign = _ClusterAssigner(x, self.k, self.chunk_size)
+        assign(self._centers)
+        return np.mean(assign.sq_dist)
@@ -1,11 +1,19 @@
 """Unit tests for the KMeansCluster class."""
 
+import os
+import tempfile
 import unittest
 from itertools import product
 
 import numpy as np
+import pandas as pd
 
 from stattools.cluster import KMeansCluster
+from stattools.cluster import MiniBatchKMeans
+from stattools.cluster.k_means import _ClusterAssigner
+from stattools.cluster.k_means import _K_MEANS_ALGORITHMS
+from stattools.cluster.k_means import _K_MEANS_INITS
+from stattools.cluster.k_means import _k_means_loss
 
 
 class TestKMeansCluster(unittest.TestCase):
@@ -37,6 +45,149 @@ class TestKMeansCluster(unittest.TestCase):
                 assert all(
                     c1 == c2 for c1, c2 in zip(clusters[ind], clusters[ind]))
 
+    def test_chunked_assignment(self):
+        """Check that chunked assignment agrees with brute force distances."""
+        rs = np.random.RandomState(0)
+        n, p, k = 257, 4, 6
+        x = rs.normal(size=(n, p))
+        centers = rs.normal(size=(k, p))
+
+        dist = np.linalg.norm(x[:, np.newaxis, :] - centers, axis=2)
+        expected = np.argmin(dist, axis=1)
+
+        for chunk_size in (None, 1, 10, n, 2 * n):
+            assign = _ClusterAssigner(x, k, chunk_size=chunk_size)
+            np.testing.assert_equal(assign(centers), expected)
+            np.testing.assert_almost_equal(assign.sq_dist,
+                                           np.min(dist, axis=1) ** 2)
+
+            # The loss is the same whether or not distances are reused
+            loss = _k_means_loss(x, expected, centers)
+            np.testing.assert_almost_equal(
+                _k_means_loss(x, expected, centers, sq_dist=assign.sq_dist),
+                loss)
+
+    def test_accelerated_algorithms(self):
+        """Check that Hamerly's and Elkan's algorithms reproduce Lloyd's."""
+        rs = np.random.RandomState(0)
+        for n, p, k in product((200, 1000), (2, 5), (3, 10, 25)):
+            means = rs.uniform(low=-10, high=10, size=(k, p))
+            x = means[rs.randint(k, size=n)] + rs.normal(size=(n, p))
+            init = x[rs.choice(n, size=k, replace=False)]
+            assign = _ClusterAssigner(x, k)
+
+            lloyd = _K_MEANS_ALGORITHMS["lloyd"](x, init, 1e-8, None, assign)
+            for algorithm in ("hamerly", "elkan"):
+                centers = _K_MEANS_ALGORITHMS[algorithm](x, init, 1e-8, None,
+                                                         assign)
+                np.testing.assert_almost_equal(centers, lloyd)
+
+            # The same holds for complete fits with the same random seeds
+            clusters = KMeansCluster(k=k, random_state=1).fit(x).predict(x)
+            for algorithm in ("hamerly", "elkan"):
+                model = KMeansCluster(k=k, random_state=1)
+                model.fit(x, algorithm=algorithm)
+                np.testing.assert_equal(model.predict(x), clusters)
+
+        with self.assertRaises(ValueError):
+            KMeansCluster(k=2).fit(np.arange(10), algorithm="unknown")
+
+    def test_seeding(self):
+        """Check that seeded centers are distinct observations, and that a
+        single repetition suffices for well-separated clusters.
+        """
+        rs = np.random.RandomState(0)
+        k, n, p = 8, 800, 2
+        means = 10 * rs.permutation(k * p).reshape(k, p)
+        x = means[np.arange(n) % k] + rs.uniform(size=(n, p))
+
+        for init in ("k-means++", "k-means||"):
+            centers = _K_MEANS_INITS[init](x, k, rs)
+            self.assertEqual(centers.shape, (k, p))
+            self.assertEqual(len(np.unique(centers, axis=0)), k)
+            self.assertTrue(all(any(np.array_equal(c, row) for row in x)
+                                for c in centers))
+
+            model = KMeansCluster(k=k, standardize=False, random_state=rs)
+            clusters = model.fit(x, repeats=1, init=init).predict(x)
+            for i in range(k):
+                self.assertEqual(len(np.unique(clusters[i::k])), 1)
+
+        with self.assertRaises(ValueError):
+            KMeansCluster(k=2).fit(np.arange(10), init="unknown")
+
+    def test_parallel_repeats(self):
+        """Check that parallel repetitions reproduce the serial result."""
+        rs = np.random.RandomState(0)
+        x = rs.normal(size=(300, 3))
+
+        centers = KMeansCluster(k=5, random_state=1).fit(x, repeats=4).centers
+        for n_jobs, backend in ((2, "thread"), (-1, "thread"), (3, "process")):
+            model = KMeansCluster(k=5, random_state=1)
+            model.fit(x, repeats=4, n_jobs=n_jobs, backend=backend)
+            np.testing.assert_equal(model.centers, centers)
+
+
+class TestMiniBatchKMeans(unittest.TestCase):
+    def test_recover_centers(self):
+        """Check that well-separated cluster centers are recovered from
+        arrays, memory-mapped arrays, lists, data frames, and iterators of
+        chunks.
+        """
+        rs = np.random.RandomState(0)
+        k, n, p = 4, 4000, 3
+        means = 10 * np.arange(k * p).reshape(k, p)
+        x = means[rs.randint(k, size=n)] + rs.normal(size=(n, p))
+        validation = means[rs.randint(k, size=200)] + rs.normal(size=(200, p))
+
+        chunks = np.array_split(x, 8)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "x.npy")
+            np.save(filename, x)
+            sources = (lambda: x,
+                       lambda: np.load(filename, mmap_mode="r"),
+                       lambda: x.tolist(),
+                       lambda: pd.DataFrame(x),
+                       lambda: iter(chunks))
+            for source in sources:
+                model = MiniBatchKMeans(k=k, random_state=0)
+                model.fit(source(), batch_size=100, validation=validation)
+                self.assertEqual(model.centers.shape, (k, p))
+                centers = model.centers[np.lexsort(model.centers.T[::-1])]
+                np.testing.assert_allclose(centers, means, atol=0.5)
+                self.assertGreater(len(model.scores), 0)
+
+        # The incremental standardization matches the batch version
+        model = MiniBatchKMeans(k=k, random_state=0).fit(x, batch_size=300)
+        np.testing.assert_almost_equal(model._x_mean, x.mean(axis=0))
+        np.testing.assert_almost_equal(model._x_std, x.std(axis=0))
+
+        # A single pass over the data is required for an iterable of chunks
+        with self.assertRaises(ValueError):
+            MiniBatchKMeans(k=k).fit(iter(chunks), epochs=2)
+
+    def test_early_stopping(self):
+        """A single noisy batch does not stop a multi-epoch fit, but the fit
+        stops once the validation loss stops improving.
+        """
+        rs = np.random.RandomState(1)
+        k, n, p = 5, 20000, 2
+        means = 3 * rs.normal(size=(k, p))
+        x = means[rs.randint(k, size=n)] + rs.normal(size=(n, p))
+        validation = means[rs.randint(k, size=500)] + rs.normal(size=(500, p))
+
+        model = MiniBatchKMeans(k=k, random_state=0)
+        model.fit(x, batch_size=100, epochs=3, validation=validation)
+        n_batches = 3 * n // 100
+        self.assertGreater(len(model.scores), 20)
+        self.assertLess(len(model.scores), n_batches)
+
+        # Without early stopping, every batch is processed
+        model = MiniBatchKMeans(k=k, random_state=0)
+        model.fit(x, batch_size=100, epochs=3, validation=validation,
+                  max_no_improvement=n_batches)
+        self.assertEqual(len(model.scores), n_batches)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -116,8 +116,8 @@ class Regressor(Predictor, metaclass=abc.ABCMeta):
         ----------
         x : array-like, shape (n, p)
             Explanatory variables.
-        y : array-like, shape (n,)
-            Response variable.
+        y : array-like, shape (n,) or (n, m)
+            Response variable (a matrix for regressors with m responses).
         args : sequence, optional
             Positional arguments to pass to this regressor's predict() method.
         kwargs : dict, optional
@@ -126,11 +126,11 @@ class Regressor(Predictor, metaclass=abc.ABCMeta):
         Returns
         -------
         mse : float
-            The mean squared prediction error.
+            The mean squared prediction error (over all the responses).
         """
         # Validate input
-        x, y = validate_samples(x, y, n_dim=(None, 1), equal_lengths=True)
-        return np.mean((y - self.predict(x, *args, **kwargs)) ** 2)
+        x, y = validate_samples(x, y, n_dim=None, equal_lengths=True)
+        return np.mean((y - self._predict_like(y, x, *args, **kwargs)) ** 2)
 
     def mae(self, x, y, *args, **kwargs):
         """Compute the mean absolute error of the model for given values of the
@@ -140,8 +140,8 @@ class Regressor(Predictor, metaclass=abc.ABCMeta):
         ----------
         x : array-like, shape (n, p)
             Explanatory variables.
-        y : array-like, shape (n,)
-            Response variable.
+        y : array-like, shape (n,) or (n, m)
+            Response variable (a matrix for regressors with m responses).
         args : sequence, optional
             Positional arguments to pass to this regressor's predict() method.
         kwargs : dict, optional
@@ -150,8 +150,18 @@ class Regressor(Predictor, metaclass=abc.ABCMeta):
         Returns
         -------
         mae : float
-            The mean absolute prediction error.
+            The mean absolute prediction error (over all the responses).
         """
         # Validate input
-        x, y = validate_samples(x, y, n_dim=(None, 1), equal_lengths=True)
-        return np.mean(np.abs(y - self.predict(x, *args, **kwargs)))
+        x, y = validate_samples(x, y, n_dim=None, equal_lengths=True)
+        return np.mean(np.abs(y - self._predict_like(y, x, *args, **kwargs)))
+
+    def _predict_like(self, y, x, *args, **kwargs):
+        """Predict the response and check that it has the same shape as the
+        observed response `y` (so that the errors are not broadcast)."""
+        prediction = self.predict(x, *args, **kwargs)
+        if np.shape(prediction) != np.shape(y):
+            raise ValueError(f"Response variable has shape {np.shape(y)}, "
+                             f"but the predictions have shape "
+                             f"{np.shape(prediction)}.")
+        return prediction
@@ -2,5 +2,6 @@
 
 from .linear import LinearRegression
 from .linear_penalized import ElasticNet
+from .linear_penalized import ElasticNetCV
 from .linear_penalized import Ridge
 from .logistic import LogisticRegression
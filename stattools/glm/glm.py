@@ -5,6 +5,7 @@ import warnings
 
 import numpy as np
 import pandas as pd
+import scipy.sparse
 
 from ..generic import Fittable, Classifier
 from ..utils.validation import validate_samples
@@ -24,17 +25,21 @@ class GLM(Fittable, metaclass=abc.ABCMeta):
         ignored if `standardize` is True.
     names : list
         List of feature/explanatory variable names.
-    intercept : float
-        The intercept of the GLM.
+    intercept : float or numpy.ndarray
+        The intercept of the GLM (an array with one intercept per response
+        for models with multiple linear predictors).
     coef : numpy.ndarray
-        Array of coefficients of each explanatory variable in the GLM.
+        Array of coefficients of each explanatory variable in the GLM (a matrix
+        with one column per response for models with multiple linear
+        predictors).
     """
 
     standardize: bool = True
     fit_intercept: bool = True
     names: list = None
 
-    # Internal representation of the model coefficients (including intercept)
+    # Internal representation of the model coefficients (including intercept),
+    # either a vector or a matrix with one column per linear predictor
     _coef: np.ndarray = None
 
     # Vector of means of the explanatory variables
@@ -46,10 +51,12 @@ class GLM(Fittable, metaclass=abc.ABCMeta):
     # Number of explanatory variables (not including the intercept if any)
     _p: int = None
 
-    # Mean of the response variable (for regression only)
+    # Mean of the response variable (for regression only; a vector for
+    # multiple responses)
     _y_mean: float = 0.0
 
-    # Standard deviation of the response variable (for regression only)
+    # Standard deviation of the response variable (for regression only; a
+    # vector for multiple responses)
     _y_std: float = 1.0
 
     @property
@@ -59,9 +66,8 @@ class GLM(Fittable, metaclass=abc.ABCMeta):
             raise self.unfitted_exception
 
         if self.standardize:
-            return (self._y_mean
-                    - self._y_std * np.sum(self._coef
-                                           * self._x_mean / self._x_std))
+            shift = (self._x_mean / self._x_std).dot(self._coef)
+            return self._y_mean - self._y_std * shift
         elif self.fit_intercept:
             return self._coef[0]
         else:
@@ -74,7 +80,7 @@ class GLM(Fittable, metaclass=abc.ABCMeta):
             raise self.unfitted_exception
 
         if self.standardize:
-            return self._y_std * self._coef / self._x_std
+            return self._y_std * (self._coef.T / self._x_std).T
         elif self.fit_intercept:
             return self._coef[1:]
         else:
@@ -98,28 +104,30 @@ class GLM(Fittable, metaclass=abc.ABCMeta):
         """
         if not self.fitted:
             raise self.unfitted_exception
-        x = validate_samples(x, n_dim=2)
+        if scipy.sparse.issparse(x):
+            x = scipy.sparse.csr_matrix(x)
+        else:
+            x = validate_samples(x, n_dim=2)
         if x.shape[1] != self._p:
             raise ValueError("Wrong number of explanatory variables.")
 
         return self._inv_link(self.intercept + x.dot(self.coef))
 
-    def _preprocess_features(self, x, names):
-        """Apply necessary validation and preprocessing to the explanatory
-        variable of a generalized linear model to prepare for fitting.
+    def _validate_features(self, x, names):
+        """Validate the explanatory variable of a generalized linear model and
+        determine the feature names and the number of features.
 
         Parameters
         ----------
-        x : array-like, shape (n, p)
-            Explanatory variables (matrix of n observations of p explanatory
-            variables/features).
+        x : array-like or scipy.sparse matrix, shape (n, p)
+            Explanatory variables.
         names : list
             List of feature names corresponding to the columns of `x`.
 
         Returns
         -------
-        x : numpy.ndarray, shape (n, p) or (n, p + 1)
-            Updated explanatory variable.
+        x : numpy.ndarray or scipy.sparse.csc_matrix, shape (n, p)
+            Validated explanatory variable.
         """
         # Try to extract feature names from a pandas.DataFrame
         # This must be done now because validate_samples() returns a Numpy array
@@ -129,8 +137,12 @@ class GLM(Fittable, metaclass=abc.ABCMeta):
             todo_names = False
 
         # Check that x is a matrix
-        x = validate_samples(x, n_dim=2)
-        n, self._p = x.shape
+        sparse = scipy.sparse.issparse(x)
+        if sparse:
+            x = scipy.sparse.csc_matrix(x, dtype=np.float_)
+        else:
+            x = validate_samples(x, n_dim=2)
+        self._p = x.shape[1]
 
         # Determine feature names if not done above
         if todo_names:
@@ -145,48 +157,318 @@ class GLM(Fittable, metaclass=abc.ABCMeta):
                 else:
                     raise ValueError("Invalid feature names given.")
 
+        return x
+
+    def _preprocess_features(self, x, names):
+        """Apply necessary validation and preprocessing to the explanatory
+        variable of a generalized linear model to prepare for fitting.
+
+        Sparse explanatory variables are never densified. If the model
+        standardizes its input, they are returned wrapped in a
+        _StandardizedSparse object, which folds the means and standard
+        deviations into its matrix-vector products. Otherwise they are returned
+        as a scipy.sparse CSC matrix (with a column of ones prepended if the
+        model fits an intercept).
+
+        Parameters
+        ----------
+        x : array-like or scipy.sparse matrix, shape (n, p)
+            Explanatory variables (matrix of n observations of p explanatory
+            variables/features).
+        names : list
+            List of feature names corresponding to the columns of `x`.
+
+        Returns
+        -------
+        x : numpy.ndarray or scipy.sparse.csc_matrix or _StandardizedSparse,
+                shape (n, p) or (n, p + 1)
+            Updated explanatory variable.
+        """
+        x = self._validate_features(x=x, names=names)
+        n = x.shape[0]
+        sparse = scipy.sparse.issparse(x)
+
         # Standardize or add an intercept column as needed
         if self.standardize:
-            self._x_mean = x.mean(axis=0)
-            self._x_std = x.std(axis=0, ddof=0)
+            if sparse:
+                self._x_mean = np.asarray(x.mean(axis=0)).ravel()
+                x_sq_mean = np.asarray(x.multiply(x).mean(axis=0)).ravel()
+                self._x_std = np.sqrt(np.clip(x_sq_mean - self._x_mean ** 2,
+                                              a_min=0, a_max=None))
+            else:
+                self._x_mean = x.mean(axis=0)
+                self._x_std = x.std(axis=0, ddof=0)
             if np.any(self._x_std == 0):
                 warnings.warn("Some explanatory variables are constant.")
                 self._x_std[self._x_std == 0] = 1.0
-            x = (x - self._x_mean) / self._x_std
+            if sparse:
+                x = _StandardizedSparse(x, self._x_mean, self._x_std)
+            else:
+                x = (x - self._x_mean) / self._x_std
         elif self.fit_intercept:
-            x = np.concatenate((np.ones((n, 1)), x), axis=1)
+            if sparse:
+                x = scipy.sparse.hstack((np.ones((n, 1)), x), format="csc")
+            else:
+                x = np.concatenate((np.ones((n, 1)), x), axis=1)
 
         return x
 
-    def _preprocess_response(self, y, x):
+    def _preprocess_response(self, y, x, multi_response=False):
         """Apply necessary validation and preprocessing to the response variable
         of a generalized linear model to prepare for fitting.
 
         Parameters
         ----------
-        y : array-like, shape (n, )
+        y : array-like, shape (n, ) or (n, m)
             Response variable.
         x : array-like, shape (n, p)
             Explanatory variable. If provided, it is checked whether `x` and `y`
             have the same length (i.e., number of observations).
+        multi_response : bool, optional
+            Indicates whether `y` may be a matrix with one column for each of
+            m responses (which are standardized separately).
 
         Returns
         -------
-        y : numpy.ndarray, shape (n, )
+        y : numpy.ndarray, shape (n, ) or (n, m)
             Updated response variable.
         """
+        n_dim = None if multi_response else 1
         if x is None:
-            y = validate_samples(y, n_dim=1)
+            y = validate_samples(y, n_dim=n_dim)
+        elif _issparse(x):
+            y = validate_samples(y, n_dim=n_dim)
+            if len(y) != x.shape[0]:
+                raise ValueError("Each sample must have the same length.")
         else:
-            y, _ = validate_samples(y, x, n_dim=(1, None), equal_lengths=True)
+            y, _ = validate_samples(y, x, n_dim=(n_dim, None),
+                                    equal_lengths=True)
+        if y.ndim > 2:
+            raise ValueError("The response variable has too many dimensions.")
 
         # Standardize if necessary
         if not isinstance(self, Classifier) and self.standardize:
-            self._y_mean = y.mean()
-            self._y_std = y.std(ddof=0)
-            if self._y_std == 0:
+            self._y_mean = y.mean(axis=0)
+            self._y_std = y.std(axis=0, ddof=0)
+            if np.any(self._y_std == 0):
                 warnings.warn("Response variable is constant.")
-                self._y_std = 1.0
+                self._y_std = np.where(self._y_std == 0, 1.0,
+                                       self._y_std)[()]
             y = (y - self._y_mean) / self._y_std
 
         return y
+
+
+class _StandardizedSparse(object):
+    """Sparse matrix of explanatory variables standardized implicitly.
+
+    This represents the matrix z = (x - mean) / scale without forming it (it
+    is dense even when x is sparse). The means and scales are instead folded
+    into the products with vectors:
+        z.dot(v) = x.dot(v / scale) - mean.dot(v / scale),
+        z.T.dot(u) = (x.T.dot(u) - mean * sum(u)) / scale.
+    Both cost O(nnz(x) + n + p) operations.
+
+    Properties
+    ----------
+    x : scipy.sparse.csc_matrix, shape (n, p)
+        The sparse matrix (a csr_matrix for mini-batches; see _BatchLoss).
+    mean : numpy.ndarray, shape (p,)
+        Column means of `x`.
+    scale : numpy.ndarray, shape (p,)
+        Column scales of `x` (nonzero).
+    shape : tuple
+        Shape of the standardized matrix.
+    T : _StandardizedSparse.Transpose
+        The transpose of the standardized matrix (only supporting dot()).
+    """
+
+    def __init__(self, x, mean, scale):
+        """Initialize a _StandardizedSparse object.
+
+        Parameters
+        ----------
+        x : scipy.sparse.csc_matrix, shape (n, p)
+            The sparse matrix.
+        mean : numpy.ndarray, shape (p,)
+            Column means of `x`.
+        scale : numpy.ndarray, shape (p,)
+            Column scales of `x` (nonzero).
+        """
+        self.x = x
+        self.mean = mean
+        self.scale = scale
+        self.shape = x.shape
+        self.T = self.Transpose(self)
+
+    class Transpose(object):
+        """Transpose of a _StandardizedSparse matrix."""
+
+        def __init__(self, z):
+            self.z = z
+            self.shape = z.shape[::-1]
+
+        def dot(self, u):
+            """Multiply the transposed standardized matrix by a vector or
+            matrix."""
+            return self.z.rdot(u)
+
+    def dot(self, v):
+        """Multiply the standardized matrix by a vector or matrix.
+
+        Parameters
+        ----------
+        v : numpy.ndarray, shape (p,) or (p, k)
+            Vector or matrix to multiply.
+
+        Returns
+        -------
+        The product of shape (n,) or (n, k).
+        """
+        v = np.asarray(v)
+        v = v / self.scale.reshape((-1,) + (1,) * (v.ndim - 1))
+        return self.x.dot(v) - self.mean.dot(v)
+
+    def rdot(self, u):
+        """Multiply the transpose of the standardized matrix by a vector or
+        matrix.
+
+        Parameters
+        ----------
+        u : numpy.ndarray, shape (n,) or (n, k)
+            Vector or matrix to multiply.
+
+        Returns
+        -------
+        The product of shape (p,) or (p, k).
+        """
+        u = np.asarray(u)
+        prod = self.x.T.dot(u) - np.multiply.outer(self.mean, u.sum(axis=0))
+        return prod / self.scale.reshape((-1,) + (1,) * (u.ndim - 1))
+
+    def sum_squares(self):
+        """Column sums of squares of the standardized matrix."""
+        n = self.shape[0]
+        x_sq = np.asarray(self.x.multiply(self.x).sum(axis=0)).ravel()
+        return (x_sq - n * self.mean ** 2) / self.scale ** 2
+
+    def gram(self, weights=None):
+        """Compute the weighted Gram matrix z.T.dot(diag(weights)).dot(z) as a
+        dense array (see _gram())."""
+        if weights is None:
+            weights = np.ones(self.shape[0])
+        x_w = self.x.T.dot(weights)
+        gram = _gram(self.x, weights) - np.outer(self.mean, x_w)
+        gram -= np.outer(x_w, self.mean)
+        gram += np.sum(weights) * np.outer(self.mean, self.mean)
+        return gram / np.outer(self.scale, self.scale)
+
+
+class _BatchLoss(object):
+    """Mixin for loss functions of the linear predictor x.dot(coef) averaging
+    over the observations of training data `x` and `y`, allowing them to be
+    evaluated on a subset of the observations (a mini-batch) for stochastic
+    optimizers.
+
+    The loss function methods accept an `index` argument selecting the rows of
+    the mini-batch (an integer array or a slice). Sparse explanatory variables
+    are copied once to a row-major format the first time a mini-batch is
+    selected, since selecting rows of column-major matrices is slow.
+
+    The linear predictor of the full training data is cached for the last
+    coefficients it was computed for, so evaluating the loss function, its
+    gradient, and its Hessian (or Hessian-vector products) at the same
+    coefficients costs only one product x.dot(coef).
+    """
+
+    x = None
+    y = None
+    _x_rows = None
+    _cache = None
+
+    def _linear_predictor(self, x, coef, index=None):
+        """Compute the linear predictor x.dot(coef), reusing the cached value
+        for the full training data if `coef` has not changed.
+
+        Parameters
+        ----------
+        x : numpy.ndarray or scipy.sparse matrix or _StandardizedSparse
+            The explanatory variables of the mini-batch (see _batch()).
+        coef : numpy.ndarray
+            The coefficients.
+        index : None or numpy.ndarray or slice, optional
+            Rows of the mini-batch. Mini-batch predictors are not cached.
+
+        Returns
+        -------
+        The linear predictor. This must not be modified in place.
+        """
+        if index is not None:
+            return x.dot(coef)
+        if self._cache is not None and np.array_equal(self._cache[0], coef):
+            return self._cache[1]
+        eta = x.dot(coef)
+        self._cache = (np.array(coef), eta)
+        return eta
+
+    def _batch(self, index=None):
+        """Select the training data of a mini-batch.
+
+        Parameters
+        ----------
+        index : None or numpy.ndarray or slice, optional
+            Rows of the mini-batch. If None, all rows are used.
+
+        Returns
+        -------
+        x, y : The rows of the explanatory and response variables.
+        """
+        if index is None:
+            return self.x, self.y
+        if self._x_rows is None:
+            if isinstance(self.x, _StandardizedSparse):
+                self._x_rows = _StandardizedSparse(self.x.x.tocsr(),
+                                                   self.x.mean, self.x.scale)
+            elif scipy.sparse.issparse(self.x):
+                self._x_rows = self.x.tocsr()
+            else:
+                self._x_rows = self.x
+        if isinstance(self._x_rows, _StandardizedSparse):
+            x = _StandardizedSparse(self._x_rows.x[index], self._x_rows.mean,
+                                    self._x_rows.scale)
+        else:
+            x = self._x_rows[index]
+        return x, self.y[index]
+
+
+def _issparse(x):
+    """Check whether a matrix of explanatory variables is sparse (i.e., a
+    scipy.sparse matrix or a _StandardizedSparse object)."""
+    return scipy.sparse.issparse(x) or isinstance(x, _StandardizedSparse)
+
+
+def _gram(x, weights=None):
+    """Compute the (weighted) Gram matrix x.T.dot(diag(weights)).dot(x) without
+    forming the diagonal matrix.
+
+    Parameters
+    ----------
+    x : numpy.ndarray or scipy.sparse matrix or _StandardizedSparse,
+            shape (n, p)
+        Matrix of explanatory variables.
+    weights : numpy.ndarray, shape (n,), optional
+        Observation weights. If None, all the weights are 1.
+
+    Returns
+    -------
+    gram : numpy.ndarray, shape (p, p)
+        The Gram matrix as a dense array.
+    """
+    if isinstance(x, _StandardizedSparse):
+        return x.gram(weights)
+    elif scipy.sparse.issparse(x):
+        x_w = x if weights is None else scipy.sparse.diags(weights).dot(x)
+        return x_w.T.dot(x).toarray()
+    else:
+        x_w = x if weights is None else x * weights[:, np.newaxis]
+        return x_w.T.dot(x)
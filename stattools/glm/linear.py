@@ -8,22 +8,31 @@ Seber, George A. F. and Lee, Alan J. (2003) Linear regression analysis. Second
 """
 
 import abc
+import warnings
 
 import numpy as np
+import scipy.linalg
+import scipy.sparse.linalg
 
 from .glm import GLM
+from .glm import _BatchLoss
+from .glm import _gram
+from .glm import _issparse
 from ..generic import Regressor
 from ..optimization import Optimizer
 from ..optimization.gradient_descent import validate_gd_params
+from ..utils.validation import validate_samples
 
 
-class MSELoss(object):
+class MSELoss(_BatchLoss):
     """Mean squared error loss function for linear regression:
         L(b) = 0.5 * sum((y - x.dot(b)) ** 2) / n,
     where n is the number of observations.
 
     Minimizing this loss function is equivalent to maximizing the likelihood
-    function of the linear regression model.
+    function of the linear regression model. The loss function and its
+    gradient can be restricted to a mini-batch of observations with the
+    `index` argument (see _BatchLoss).
     """
 
     def __init__(self, x, y):
@@ -31,26 +40,46 @@ class MSELoss(object):
 
         Parameters
         ----------
-        x : array-like, shape (n, p)
-            Explanatory variable.
+        x : array-like or scipy.sparse matrix, shape (n, p)
+            Explanatory variable. Sparse matrices are not densified.
         y : array-like, shape (n, )
             Response variable.
         """
-        self.x = np.asarray(x)
+        self.x = x if _issparse(x) else np.asarray(x)
         self.y = np.asarray(y)
-        self.n = len(self.x)
+        self.n = self.x.shape[0]
 
-    def __call__(self, coef):
+    def __call__(self, coef, index=None):
         """Mean squared error loss for the training data."""
-        return 0.5 * np.sum((self.y - self.x.dot(coef)) ** 2) / self.n
+        x, y = self._batch(index)
+        residual = y - self._linear_predictor(x, coef, index)
+        return 0.5 * residual.dot(residual) / len(y)
 
-    def grad(self, coef):
+    def grad(self, coef, index=None):
         """Gradient of the mean squared error loss."""
-        return self.x.T.dot(self.x.dot(coef) - self.y) / self.n
+        x, y = self._batch(index)
+        return x.T.dot(self._linear_predictor(x, coef, index) - y) / len(y)
+
+    def value_and_grad(self, coef, index=None):
+        """Mean squared error loss and its gradient, computed together."""
+        x, y = self._batch(index)
+        residual = self._linear_predictor(x, coef, index) - y
+        return (0.5 * residual.dot(residual) / len(y),
+                x.T.dot(residual) / len(y))
+
+    def value_grad_hess(self, coef):
+        """Mean squared error loss, its gradient, and its Hessian, computed
+        together."""
+        return (*self.value_and_grad(coef), self.hess(coef))
 
     def hess(self, _):
         """Hessian of the mean squared error loss."""
-        return self.x.T.dot(self.x) / self.n
+        return _gram(self.x) / self.n
+
+    def hessp(self, _, v):
+        """Product of the Hessian of the mean squared error loss with a vector
+        (without forming the Hessian)."""
+        return self.x.T.dot(self.x.dot(v)) / self.n
 
 
 class LinearModel(GLM, Regressor, metaclass=abc.ABCMeta):
@@ -91,36 +120,69 @@ class LinearRegression(LinearModel):
     estimation.
     """
 
-    def fit(self, x, y, names=None, solver="qr", **kwargs):
+    # Number of observations seen so far by partial_fit()
+    _n_seen: int = 0
+
+    # How partial_fit() accumulates the observations ("normal" or "tsqr")
+    _stream_solver: str = None
+
+    # Column means of [x, y] over the observations seen so far ("normal")
+    _xy_mean: np.ndarray = None
+
+    # Matrix of sums of cross products of deviations from the column means of
+    # [x, y] over the observations seen so far ("normal")
+    _xy_m2: np.ndarray = None
+
+    # Triangular factor of the QR factorization of [1, x, y] over the
+    # observations seen so far ("tsqr")
+    _xy_r: np.ndarray = None
+
+    def fit(self, x, y, names=None, solver=None, **kwargs):
         """Fit the linear regression model via least squares.
 
         Parameters
         ----------
-        x : array-like, shape (n, p)
+        x : array-like or scipy.sparse matrix, shape (n, p)
             Design matrix consisting of n observations of p explanatory
-            variables.
-        y : array-like, shape (n,)
-            Response vector.
+            variables. Sparse matrices are standardized implicitly and never
+            densified.
+        y : array-like, shape (n,) or (n, m)
+            Response vector, or matrix with one column for each of m responses
+            sharing the design matrix. For the "qr" and "lstsq" solvers, the
+            design matrix is factorized once for all the responses. Then the
+            coefficients and predictions have one column per response.
         names : list, optional
             List of feature names corresponding to the columns of `x`.
         solver : None or str or stattools.optimization.Optimizer, optional
             Specify how to estimate the linear regression model coefficients.
             Acceptable values:
-                None or "qr" (default):
+                None (default):
+                    "qr" for dense `x` and "lsqr" for sparse `x`.
+                "qr":
                     Use the QR factorization of the design matrix.
                 "lstsq":
                     This is basically a wrapper for numpy.linalg.lstsq().
+                "lsqr":
+                    Use the iterative LSQR algorithm, which only needs products
+                    of the design matrix and its transpose with vectors (run
+                    once per response). Acceptable keyword arguments (kwargs):
+                    atol, btol, iter_lim (tolerances default to 1e-10). See
+                    scipy.sparse.linalg.lsqr for descriptions.
                 "gd":
-                    Use gradient descent to minimize the mean squared error.
+                    Use gradient descent to minimize the mean squared error
+                    (only for a single response).
                     Acceptable keyword arguments (kwargs):
                     rate, momentum, nesterov, anneal, iterations
                     See mltools.optimization.GradientDescent for descriptions.
                 mltools.optimization.Optimizer instance:
-                    Specify an optimizer to minimize the MSE loss function.
+                    Specify an optimizer to minimize the MSE loss function
+                    (only for a single response).
         kwargs : dict, optional
             If `solver` is "gd", these specify gradient descent parameters rate,
             momentum, nesterov, anneal, and iterations. See
             mltools.optimization.GradientDescent for descriptions.
+            If `solver` is "lsqr", these are keyword arguments for
+            scipy.sparse.linalg.lsqr().
             If `solver` is an mltools.optimization.Optimizer, these are keyword
             arguments for its optimize() method.
 
@@ -130,12 +192,33 @@ class LinearRegression(LinearModel):
         """
         # Validate input
         x = self._preprocess_features(x=x, names=names)
-        y = self._preprocess_response(y=y, x=x)
+        y = self._preprocess_response(y=y, x=x, multi_response=True)
+        self._n_seen = 0
+
+        if solver is None:
+            solver = "lsqr" if _issparse(x) else "qr"
+        if solver in ("qr", "lstsq") and _issparse(x):
+            raise ValueError(f"Solver '{solver}' does not support sparse "
+                             "explanatory variables; use 'lsqr' instead.")
+
+        if y.ndim == 2 and (solver == "gd" or isinstance(solver, Optimizer)):
+            raise ValueError(f"Solver '{solver}' does not support multiple "
+                             "responses.")
 
-        if solver is None or solver == "qr":
+        if solver == "qr":
             # Fit the model using the QR factorization of the design matrix
+            # (one triangular solve for all the responses)
             q, r = np.linalg.qr(x, mode="reduced")
-            self._coef = np.linalg.solve(r, q.T.dot(y))
+            self._coef = scipy.linalg.solve_triangular(r, q.T.dot(y))
+        elif solver == "lsqr":
+            # Fit the model iteratively using only matrix-vector products
+            lsqr_params = {"atol": 1e-10, "btol": 1e-10}
+            lsqr_params.update(kwargs)
+            if y.ndim == 1:
+                self._coef = _lsqr(x, y, **lsqr_params)
+            else:
+                self._coef = np.column_stack([_lsqr(x, y_j, **lsqr_params)
+                                              for y_j in y.T])
         elif solver == "lstsq":
             # Fit the model by solving the least squares problem directly
             self._coef, *_ = np.linalg.lstsq(x, y, rcond=None)
@@ -159,6 +242,188 @@ class LinearRegression(LinearModel):
         self.fitted = True
         return self
 
+    def partial_fit(self, x, y, names=None, solver="normal"):
+        """Update the least squares fit with one batch of observations.
+
+        Only summary statistics of size O(p^2) are kept between batches, so
+        the data can be streamed from disk in chunks. After each batch, the
+        model (including the standardization of the variables) is the least
+        squares fit to all the observations seen so far, as computed by fit().
+
+        Parameters
+        ----------
+        x : array-like, shape (n, p)
+            Design matrix of the batch.
+        y : array-like, shape (n,)
+            Response vector of the batch.
+        names : list, optional
+            List of feature names corresponding to the columns of `x`. Only
+            used for the first batch.
+        solver : str, optional
+            How to accumulate the observations. Only used for the first batch.
+            Acceptable values:
+                "normal" (default):
+                    Accumulate the column means and the centered cross
+                    products of [x, y], merging batches with the pairwise
+                    updates of Chan et al. (1982), and solve the normal
+                    equations.
+                "tsqr":
+                    Accumulate the triangular factor R of the QR factorization
+                    of [1, x, y] by factoring R stacked on top of each batch
+                    (tall-skinny QR). This is about twice as expensive per
+                    batch but does not square the condition number of the
+                    design matrix.
+
+        Returns
+        -------
+        This LinearRegression instance.
+
+        References
+        ----------
+        Tony F. Chan, Gene H. Golub, and Randall J. LeVeque. "Updating Formulae
+            and a Pairwise Algorithm for Computing Sample Variances".
+            COMPSTAT 1982, pp. 30--41. DOI: 10.1007/978-3-642-51461-6_3
+        James Demmel, Laura Grigori, Mark Hoemmen, and Julien Langou.
+            "Communication-optimal Parallel and Sequential QR and LU
+            Factorizations". SIAM Journal on Scientific Computing Vol. 34,
+            No. 1 (2012), pp. A206--A239. DOI: 10.1137/080731992
+        """
+        if _issparse(x):
+            raise ValueError("partial_fit() does not support sparse "
+                             "explanatory variables.")
+
+        # Validate input
+        if self._n_seen == 0:
+            if solver not in ("normal", "tsqr"):
+                raise ValueError(
+                    f"Unknown value for parameter 'solver': {solver}")
+            x = self._validate_features(x=x, names=names)
+            self._stream_solver = solver
+        x, y = validate_samples(x, y, n_dim=(2, 1), equal_lengths=True)
+        if x.shape[1] != self._p:
+            raise ValueError(f"Data matrix has wrong number of columns: "
+                             f"expected {self._p}, found {x.shape[1]}")
+        if len(x) == 0:
+            return self
+
+        # Merge the batch into the summary statistics
+        xy = np.column_stack((x, y)).astype(np.float_)
+        if self._stream_solver == "normal":
+            self._update_moments(xy)
+        else:
+            xy = np.column_stack((np.ones(len(xy)), xy))
+            if self._n_seen > 0:
+                xy = np.concatenate((self._xy_r, xy))
+            self._xy_r = np.linalg.qr(xy, mode="r")
+        self._n_seen += len(x)
+
+        self._solve_streamed()
+        self.fitted = True
+        return self
+
+    def _update_moments(self, xy):
+        """Merge the column means and centered cross products of a batch of
+        [x, y] into the running statistics.
+
+        Parameters
+        ----------
+        xy : numpy.ndarray, shape (n, p + 1)
+            The batch.
+        """
+        n_batch = len(xy)
+        mean_batch = xy.mean(axis=0)
+        centered = xy - mean_batch
+        m2_batch = centered.T.dot(centered)
+
+        if self._n_seen == 0:
+            self._xy_mean, self._xy_m2 = mean_batch, m2_batch
+        else:
+            n = self._n_seen + n_batch
+            delta = mean_batch - self._xy_mean
+            self._xy_mean = self._xy_mean + delta * n_batch / n
+            self._xy_m2 = self._xy_m2 + m2_batch \
+                + np.outer(delta, delta) * self._n_seen * n_batch / n
+
+    def _solve_streamed(self):
+        """Compute the standardization and the coefficients from the summary
+        statistics accumulated by partial_fit().
+        """
+        n, p = self._n_seen, self._p
+
+        # The centered cross products are m2 = r.T.dot(r), where r is the
+        # triangular factor of the centered [x, y]. For the "tsqr" solver,
+        # this is the trailing block of the triangular factor of [1, x, y],
+        # whose first row is sqrt(n) * [1, means] (up to sign).
+        if self._stream_solver == "normal":
+            mean, m2, r = self._xy_mean, self._xy_m2, None
+            var = np.diag(m2) / n
+        else:
+            mean = self._xy_r[0, 1:] / self._xy_r[0, 0]
+            m2, r = None, self._xy_r[1:, 1:]
+            var = np.sum(r ** 2, axis=0) / n
+
+        if self.standardize:
+            self._x_mean, self._y_mean = mean[:p], mean[p]
+            self._x_std, self._y_std = np.sqrt(var[:p]), np.sqrt(var[p])
+            if np.any(self._x_std == 0):
+                warnings.warn("Some explanatory variables are constant.")
+                self._x_std[self._x_std == 0] = 1.0
+            if self._y_std == 0:
+                warnings.warn("Response variable is constant.")
+                self._y_std = 1.0
+
+            # Solve the least squares problem for the standardized variables
+            scale = np.append(self._x_std, self._y_std)
+            if r is None:
+                self._coef = _solve_gram(m2 / np.outer(scale, scale))
+            else:
+                self._coef = _solve_triangular(r / scale)
+        elif self.fit_intercept:
+            # The slopes come from the centered variables
+            coef = _solve_gram(m2) if r is None else _solve_triangular(r)
+            intercept = mean[p] - mean[:p].dot(coef)
+            self._coef = np.concatenate(([intercept], coef))
+        elif r is None:
+            self._coef = _solve_gram(m2 + n * np.outer(mean, mean))
+        else:
+            # Triangular factor of [x, y] (without the column of ones)
+            self._coef = _solve_triangular(
+                np.linalg.qr(self._xy_r[:, 1:], mode="r"))
+
+
+def _solve_gram(gram):
+    """Solve the normal equations of a least squares problem.
+
+    Parameters
+    ----------
+    gram : numpy.ndarray, shape (p + 1, p + 1)
+        The Gram matrix [x, y].T.dot([x, y]).
+
+    Returns
+    -------
+    The least squares solution of x.dot(coef) = y.
+    """
+    p = len(gram) - 1
+    return np.linalg.lstsq(gram[:p, :p], gram[:p, p], rcond=None)[0]
+
+
+def _solve_triangular(r):
+    """Solve a least squares problem given the triangular factor of its
+    augmented design matrix.
+
+    Parameters
+    ----------
+    r : numpy.ndarray, shape (k, p + 1)
+        The triangular factor of the QR factorization of [x, y] (k < p + 1 if
+        there are fewer than p + 1 observations).
+
+    Returns
+    -------
+    The least squares solution of x.dot(coef) = y.
+    """
+    p = r.shape[1] - 1
+    return np.linalg.lstsq(r[:, :p], r[:, p], rcond=None)[0]
+
 
 def _fit_lr_gd(x, y, rate, momentum, nesterov, anneal, iterations):
     """Fit a linear regression model using gradient descent.
@@ -215,3 +480,30 @@ def _fit_lr_gd(x, y, rate, momentum, nesterov, anneal, iterations):
             step = rate / (1 + t / anneal)
             coef = coef - step * x.T.dot(x.dot(coef) - y) / n
     return coef
+
+
+def _lsqr(x, y, damp=0.0, **kwargs):
+    """Solve the (damped) least squares problem
+        minimize ||y - x.dot(b)||^2 + damp^2 * ||b||^2
+    with scipy.sparse.linalg.lsqr().
+
+    Parameters
+    ----------
+    x : numpy.ndarray or scipy.sparse matrix or _StandardizedSparse,
+            shape (n, p)
+        Design matrix. Only its products with vectors are used.
+    y : numpy.ndarray, shape (n,)
+        Response vector.
+    damp : float, optional
+        Damping (ridge) parameter.
+    kwargs : dict, optional
+        Additional keyword arguments for scipy.sparse.linalg.lsqr().
+
+    Returns
+    -------
+    coef : numpy.ndarray, shape (p,)
+        The least squares solution.
+    """
+    operator = scipy.sparse.linalg.LinearOperator(
+        shape=x.shape, matvec=x.dot, rmatvec=x.T.dot, dtype=np.float_)
+    return scipy.sparse.linalg.lsqr(operator, y, damp=damp, **kwargs)[0]
@@ -4,11 +4,21 @@ import warnings
 
 import matplotlib.pyplot as plt
 import numpy as np
+import scipy.linalg
 
+from .glm import _StandardizedSparse
+from .glm import _gram
+from .glm import _issparse
 from .linear import LinearModel
+from .linear import _lsqr
+from ..utils import parallel_map
 from ..utils import validate_float
 from ..utils import validate_int
 
+# Largest number of explanatory variables for which the "auto" coordinate
+# descent mode precomputes the Gram matrix
+_GRAM_MAX_FEATURES = 500
+
 
 class Ridge(LinearModel):
     """Ridge regression: linear regression with an L2 penalty."""
@@ -26,17 +36,25 @@ class Ridge(LinearModel):
 
         super(Ridge, self).__init__(standardize=True)
 
-    def fit(self, x, y, names=None):
+    def fit(self, x, y, names=None, tol=1e-10):
         """Fit the ridge regression model.
 
         Parameters
         ----------
-        x : array-like, shape (n, p)
-            Explanatory variables.
-        y : array-like, shape (n,)
-            Response variable.
+        x : array-like or scipy.sparse matrix, shape (n, p)
+            Explanatory variables. Sparse matrices are standardized implicitly
+            and never densified.
+        y : array-like, shape (n,) or (n, m)
+            Response variable, or matrix with one column for each of m
+            responses sharing the explanatory variables. For dense `x`, the
+            penalized Gram matrix is factorized once for all the responses.
+            Then the coefficients and predictions have one column per
+            response.
         names : list, optional
             List of feature names corresponding to the columns of `x`.
+        tol : float, optional
+            Tolerance of the LSQR algorithm used for sparse `x` (see
+            scipy.sparse.linalg.lsqr()). Ignored for dense `x`.
 
         Returns
         -------
@@ -44,13 +62,28 @@ class Ridge(LinearModel):
         """
         # Validate input
         x = self._preprocess_features(x=x, names=names)
-        y = self._preprocess_response(y=y, x=x)
-
-        # Fit the model by least squares
+        y = self._preprocess_response(y=y, x=x, multi_response=True)
+
+        if _issparse(x):
+            # Solve the damped least squares problem iteratively (once per
+            # response)
+            damp = np.sqrt(self.lam)
+            if y.ndim == 1:
+                self._coef = _lsqr(x, y, damp=damp, atol=tol, btol=tol)
+            else:
+                self._coef = np.column_stack([
+                    _lsqr(x, y_j, damp=damp, atol=tol, btol=tol)
+                    for y_j in y.T])
+            self.fitted = True
+            return self
+
+        # Fit the model by solving the penalized normal equations with the
+        # Cholesky factorization (the penalized Gram matrix is positive
+        # definite)
         a = x.T.dot(x) + self.lam * np.identity(self._p)
         b = x.T.dot(y)
 
-        self._coef, *_ = np.linalg.lstsq(a=a, b=b, rcond=None)
+        self._coef = scipy.linalg.cho_solve(scipy.linalg.cho_factor(a), b)
         self.fitted = True
         return self
 
@@ -68,13 +101,44 @@ def _enet_loss(x, y, coef, lam, alpha):
     return 0.5 * mse + lam * (alpha * l1 + (1 - alpha) * 0.5 * l2)
 
 
-def _enet_cd(x, y, coef0, lam, alpha, tol, max_iter, random, seed, callback):
+def _enet_mode(mode, n, p):
+    """Choose the coordinate descent variant for the elastic net.
+
+    Parameters
+    ----------
+    mode : str
+        One of "auto", "naive", or "covariance" (see _enet_cd()).
+    n : int
+        Number of observations.
+    p : int
+        Number of explanatory variables.
+
+    Returns
+    -------
+    mode : str
+        Either "naive" or "covariance".
+    """
+    if mode == "auto":
+        # Following glmnet, the Gram matrix pays off when it is small and when
+        # forming it is cheaper than a few sweeps over the data
+        if n > p and p <= _GRAM_MAX_FEATURES:
+            return "covariance"
+        else:
+            return "naive"
+    elif mode in ("naive", "covariance"):
+        return mode
+    else:
+        raise ValueError(f"Unknown coordinate descent mode: {mode}")
+
+
+def _enet_cd(x, y, coef0, lam, alpha, tol, max_iter, random, seed, callback,
+             mode="auto", gram=None, xty=None, features=None):
     """Approximate the elastic net estimator for the linear model coefficients
     by coordinate descent.
 
     Parameters
     ----------
-    x : array-like, shape (n, p)
+    x : array-like or _StandardizedSparse, shape (n, p)
         Explanatory variables (AKA features/predictors/regressors).
     y : array-like, shape (n,)
         Response variable (AKA targets).
@@ -101,6 +165,26 @@ def _enet_cd(x, y, coef0, lam, alpha, tol, max_iter, random, seed, callback):
     callback : callable
         Optional function of the standardized coefficients to call during every
         iteration of the coordinate descent algorithm.
+    mode : str, optional
+        How the partial residual correlations x[:, j].dot(residual) / n are
+        kept up to date. One of
+            "naive": keep the residual y - x.dot(coef), updating it in O(n)
+                operations after each coefficient change,
+            "covariance": keep the correlations themselves, updating them in
+                O(p) operations after each coefficient change using the Gram
+                matrix x.T.dot(x) (computed once),
+            "auto": "covariance" if n > p and p is at most 500, and "naive"
+                otherwise.
+        For sparse `x` in the "naive" mode, the residual is kept without the
+        centering of the explanatory variables, so that each update only
+        touches the nonzero entries of one column.
+    gram : numpy.ndarray, shape (p, p), optional
+        Precomputed x.T.dot(x) for the "covariance" mode.
+    xty : numpy.ndarray, shape (p,), optional
+        Precomputed x.T.dot(y) for the "covariance" mode.
+    features : numpy.ndarray, optional
+        Indices of the coefficients to update. The other coefficients are kept
+        fixed. If None, all the coefficients are updated.
 
     Returns
     -------
@@ -119,17 +203,61 @@ def _enet_cd(x, y, coef0, lam, alpha, tol, max_iter, random, seed, callback):
     tol = validate_float(tol, "tol", positive=True)
     max_iter = validate_int(max_iter, "max_iter", minimum=1)
 
-    # Number of explanatory variables
-    p = x.shape[1]
+    # Number of observations and explanatory variables
+    n, p = x.shape
+    mode = _enet_mode(mode, n, p)
 
     # Initialize a random number generator
     rng = np.random.RandomState(seed)
 
     # Initialize the coefficient vector
-    coef = np.copy(coef0)
+    coef = np.array(coef0, dtype=np.float_)
     if callback is not None:
         callback(coef)
 
+    # Coefficients to update
+    if features is None:
+        features = np.arange(p)
+    if len(features) == 0:
+        return coef, 0
+
+    # Initialize the correlations of the explanatory variables with the
+    # residual, and the mean squares of the explanatory variables (these are 1
+    # for standardized variables, and 0 for constant ones). Only the nonzero
+    # coefficients contribute to the residual.
+    nonzero = np.flatnonzero(coef)
+    x_sq = np.zeros(p)
+    sparse = isinstance(x, _StandardizedSparse) and mode == "naive"
+    if mode == "covariance":
+        if gram is None:
+            gram = _gram(x)
+        if xty is None:
+            xty = x.T.dot(y)
+        corr = (xty - gram[:, nonzero].dot(coef[nonzero])) / n
+        x_sq[features] = np.diag(gram)[features] / n
+    elif sparse:
+        # With z = (x - mean) / scale, the residual is y - z.dot(coef), which
+        # differs from y - x.dot(coef / scale) by a constant. Since the
+        # columns of z are centered, only the sum of the uncentered residual
+        # is needed to correct the correlations:
+        #   z[:, j].dot(y - z.dot(coef))
+        #       = (x[:, j].dot(residual) - mean[j] * sum(residual)) / scale[j]
+        indptr, indices, data = x.x.indptr, x.x.indices, x.x.data
+        x_mean, x_scale = x.mean, x.scale
+        x_sum = n * x_mean
+        residual = y - x.x.dot(coef / x_scale)
+        residual_sum = np.sum(residual)
+        x_sq[features] = x.sum_squares()[features] / n
+    else:
+        x = np.asfortranarray(x)
+        residual = y - x[:, nonzero].dot(coef[nonzero])
+        x_sq[features] = np.einsum("ij,ij->j", x[:, features],
+                                   x[:, features]) / n
+
+    # Soft-thresholding level and denominator of the coordinate updates
+    threshold = lam * alpha
+    shrinkage = lam * (1 - alpha)
+
     # Coordinate descent algorithm
     n_iter = 0
     while True:
@@ -138,23 +266,51 @@ def _enet_cd(x, y, coef0, lam, alpha, tol, max_iter, random, seed, callback):
         coef_update_max = 0.0
 
         # Cycle through coefficients OR choose coefficients at random
-        for j in range(p):
+        for j in features:
             if random:
-                j = rng.randint(p)
+                j = features[rng.randint(len(features))]
 
             # Previous coefficient at index j
             coef_j_prev = coef[j]
 
             # Compute the update
-            temp = coef[j] + np.mean((y - x.dot(coef)) * x[:, j])
-            coef[j] = _soft_threshold(temp, lam * alpha) / 1 + lam * (1 - alpha)
+            if mode == "covariance":
+                corr_j = corr[j]
+            elif sparse:
+                rows = indices[indptr[j]:indptr[j + 1]]
+                values = data[indptr[j]:indptr[j + 1]]
+                corr_j = (values.dot(residual[rows])
+                          - x_mean[j] * residual_sum) / (x_scale[j] * n)
+            else:
+                corr_j = x[:, j].dot(residual) / n
+            temp = corr_j + x_sq[j] * coef_j_prev
+            if temp > threshold:
+                coef_j = (temp - threshold) / (x_sq[j] + shrinkage)
+            elif temp < -threshold:
+                coef_j = (temp + threshold) / (x_sq[j] + shrinkage)
+            else:
+                coef_j = 0.0
+
+            # Update the residual or the correlations
+            delta = coef_j - coef_j_prev
+            if delta != 0:
+                coef[j] = coef_j
+                if mode == "covariance":
+                    corr -= (delta / n) * gram[j]
+                elif sparse:
+                    step = delta / x_scale[j]
+                    residual[rows] -= step * values
+                    residual_sum -= step * x_sum[j]
+                else:
+                    residual -= delta * x[:, j]
+
             if callback is not None:
                 callback(coef)
 
-            if np.abs(coef[j]) > coef_max:
-                coef_max = np.abs(coef[j])
-            if np.abs(coef[j] - coef_j_prev) > coef_update_max:
-                coef_update_max = np.abs(coef[j] - coef_j_prev)
+            if abs(coef_j) > coef_max:
+                coef_max = abs(coef_j)
+            if abs(delta) > coef_update_max:
+                coef_update_max = abs(delta)
 
         # Check for stopping criteria
         if (coef_max == 0 or coef_update_max / coef_max < tol or
@@ -164,7 +320,8 @@ def _enet_cd(x, y, coef0, lam, alpha, tol, max_iter, random, seed, callback):
     return coef, n_iter
 
 
-def _enet_path(x, y, coef0, lambdas, alpha, tol, max_iter, random, seed):
+def _enet_path(x, y, coef0, lambdas, alpha, tol, max_iter, random, seed,
+               mode="auto", screen=True):
     """Compute an elastic net regularization path.
 
     Parameters
@@ -193,6 +350,14 @@ def _enet_path(x, y, coef0, lambdas, alpha, tol, max_iter, random, seed):
     seed : int
         Seed for a NumPy RandomState object. Used if `random` is True; otherwise
         ignored.
+    mode : str, optional
+        Coordinate descent variant (see _enet_cd()). In the "covariance" mode,
+        the Gram matrix is computed once for the whole path.
+    screen : bool, optional
+        If True, only cycle through the coefficients that pass the sequential
+        strong rule, using active set iterations, and add back any discarded
+        coefficients that violate the optimality conditions (see
+        _enet_screened_cd()).
 
     Returns
     -------
@@ -206,17 +371,182 @@ def _enet_path(x, y, coef0, lambdas, alpha, tol, max_iter, random, seed):
     # Ensure `lambdas` is sorted in reverse order
     lambdas = np.flipud(np.sort(lambdas))
 
+    # Precompute the sufficient statistics once for the whole path
+    mode = _enet_mode(mode, *x.shape)
+    if mode == "covariance":
+        gram = _gram(x)
+        xty = x.T.dot(y)
+    else:
+        if not _issparse(x):
+            x = np.asfortranarray(x)
+        gram = xty = None
+
     # Compute the path
     path = np.empty((len(lambdas), x.shape[1]))
+    lam_prev = None
     for i, lam in enumerate(lambdas):
-        coef0, *_ = _enet_cd(x=x, y=y, coef0=coef0, lam=lam, alpha=alpha,
-                             tol=tol, max_iter=max_iter, random=random,
-                             seed=seed, callback=None)
+        if screen:
+            coef0 = _enet_screened_cd(x=x, y=y, coef0=coef0, lam=lam,
+                                      lam_prev=lam_prev, alpha=alpha, tol=tol,
+                                      max_iter=max_iter, random=random,
+                                      seed=seed, mode=mode, gram=gram, xty=xty)
+        else:
+            coef0, *_ = _enet_cd(x=x, y=y, coef0=coef0, lam=lam, alpha=alpha,
+                                 tol=tol, max_iter=max_iter, random=random,
+                                 seed=seed, callback=None, mode=mode, gram=gram,
+                                 xty=xty)
         path[i, :] = coef0
+        lam_prev = lam
 
     return path, lambdas
 
 
+def _enet_corr(x, y, coef, gram=None, xty=None):
+    """Compute the correlations x.T.dot(y - x.dot(coef)) / n of the explanatory
+    variables with the residual.
+
+    Parameters
+    ----------
+    x : numpy.ndarray or _StandardizedSparse, shape (n, p)
+        Explanatory variables.
+    y : numpy.ndarray, shape (n,)
+        Response variable.
+    coef : numpy.ndarray, shape (p,)
+        Coefficient vector.
+    gram : numpy.ndarray, shape (p, p), optional
+        Precomputed x.T.dot(x). If given, `xty` must be given too, and the
+        correlations are computed without touching `x`.
+    xty : numpy.ndarray, shape (p,), optional
+        Precomputed x.T.dot(y).
+
+    Returns
+    -------
+    corr : numpy.ndarray, shape (p,)
+        The correlations.
+    """
+    nonzero = np.flatnonzero(coef)
+    if gram is None:
+        if _issparse(x):
+            residual = y - x.dot(coef)
+        else:
+            residual = y - x[:, nonzero].dot(coef[nonzero])
+        return x.T.dot(residual) / len(y)
+    else:
+        return (xty - gram[:, nonzero].dot(coef[nonzero])) / len(y)
+
+
+def _enet_screened_cd(x, y, coef0, lam, lam_prev, alpha, tol, max_iter, random,
+                      seed, mode, gram, xty):
+    """Approximate the elastic net estimator by coordinate descent over the
+    coefficients that pass the sequential strong rule.
+
+    The strong set consists of the nonzero coefficients of `coef0` and the
+    coefficients j for which
+
+        |x[:, j].dot(y - x.dot(coef0)) / n| >= alpha * (2 * lam - lam_prev),
+
+    where `coef0` is the solution for the previous regularization constant
+    `lam_prev`. Coordinate descent is run on the strong set by active set
+    iterations (see _enet_active_set()). The coefficients outside the strong
+    set are then checked against the optimality (KKT) conditions. The
+    violators are added to the strong set and the fit is repeated, so the
+    result is the same as without screening.
+
+    Parameters
+    ----------
+    x, y, coef0, lam, alpha, tol, max_iter, random, seed, mode, gram, xty
+        See _enet_cd().
+    lam_prev : float or None
+        The regularization constant for which `coef0` is the solution. If None,
+        `coef0` is the solution for the smallest regularization constant that
+        makes all coefficients zero (if `coef0` is zero) or for `lam`
+        (otherwise).
+
+    Returns
+    -------
+    coef : numpy.ndarray, shape (p,)
+        Approximate elastic net estimator for the linear model coefficients.
+
+    References
+    ----------
+    Robert Tibshirani, Jacob Bien, Jerome Friedman, Trevor Hastie, Noah Simon,
+        Jonathan Taylor, and Ryan J. Tibshirani. "Strong rules for discarding
+        predictors in lasso-type problems". Journal of the Royal Statistical
+        Society: Series B. Vol. 74, No. 2 (2012), pp. 245--266.
+        DOI: https://doi.org/10.1111/j.1467-9868.2011.01004.x
+    """
+    coef = np.array(coef0, dtype=np.float_)
+    corr = np.abs(_enet_corr(x, y, coef, gram, xty))
+
+    # Sequential strong rule
+    if lam_prev is None:
+        if np.any(coef) or alpha == 0:
+            lam_prev = lam
+        else:
+            lam_prev = max(lam, np.max(corr) / alpha)
+    strong = (corr >= alpha * (2 * lam - lam_prev)) | (coef != 0)
+
+    while True:
+        coef = _enet_active_set(x=x, y=y, coef0=coef, lam=lam, alpha=alpha,
+                                tol=tol, max_iter=max_iter, random=random,
+                                seed=seed, mode=mode, gram=gram, xty=xty,
+                                features=np.flatnonzero(strong))
+
+        # Check the optimality conditions of the discarded coefficients (which
+        # are zero)
+        corr = np.abs(_enet_corr(x, y, coef, gram, xty))
+        violations = ~strong & (corr > lam * alpha)
+        if not np.any(violations):
+            return coef
+        strong |= violations
+
+
+def _enet_active_set(x, y, coef0, lam, alpha, tol, max_iter, random, seed,
+                     mode, gram, xty, features):
+    """Approximate the elastic net estimator by active set iterations.
+
+    A sweep through the candidate coefficients determines the active set (the
+    nonzero coefficients), and coordinate descent is then run to convergence on
+    the active set only. Another sweep through the candidate coefficients
+    confirms the solution if it does not change the active set; otherwise the
+    process repeats.
+
+    Parameters
+    ----------
+    x, y, coef0, lam, alpha, tol, max_iter, random, seed, mode, gram, xty
+        See _enet_cd().
+    features : numpy.ndarray
+        Indices of the candidate coefficients. The other coefficients are kept
+        fixed.
+
+    Returns
+    -------
+    coef : numpy.ndarray, shape (p,)
+        Approximate elastic net estimator for the linear model coefficients.
+    """
+    coef = coef0
+    active = None
+    for _ in range(max_iter):
+        # Sweep through all the candidate coefficients once
+        coef, _ = _enet_cd(x=x, y=y, coef0=coef, lam=lam, alpha=alpha, tol=tol,
+                           max_iter=1, random=random, seed=seed, callback=None,
+                           mode=mode, gram=gram, xty=xty, features=features)
+
+        # Stop if the sweep confirms the active set
+        active_new = features[coef[features] != 0]
+        if active is not None and np.array_equal(active_new, active):
+            break
+        active = active_new
+
+        # Converge on the active set
+        coef, _ = _enet_cd(x=x, y=y, coef0=coef, lam=lam, alpha=alpha, tol=tol,
+                           max_iter=max_iter, random=random, seed=seed,
+                           callback=None, mode=mode, gram=gram, xty=xty,
+                           features=active)
+
+    return coef
+
+
 class ElasticNet(LinearModel):
     """Linear regression with the elastic net penalty (i.e., a linear
     combination of L1 (LASSO) and L2 (ridge) penalties).
@@ -241,7 +571,8 @@ class ElasticNet(LinearModel):
         super(ElasticNet, self).__init__(standardize=True, fit_intercept=True)
 
     def fit(self, x, y, names=None, tol=1e-4, max_iter=1000, random=False,
-            seed=None, callback=None, warm_start=True, verbose=False):
+            seed=None, callback=None, warm_start=True, verbose=False,
+            mode="auto"):
         """Fit the elastic net model using coordinate descent.
 
         Parameters
@@ -253,7 +584,9 @@ class ElasticNet(LinearModel):
             different observations of the explanatory variables (i.e., n=number
             of observations, p=number of explanatory variables). If `x` is a
             scalar or one-dimensional array, then it is interpreted as a single
-            explanatory variable (i.e., a matrix of shape (n, 1)).
+            explanatory variable (i.e., a matrix of shape (n, 1)). Sparse
+            matrices (scipy.sparse) are standardized implicitly and never
+            densified.
         y : array-like, shape (n,)
             The response variable vector (AKA target vector).
         names : list, optional
@@ -277,6 +610,12 @@ class ElasticNet(LinearModel):
             coefficient vector (if available).
         verbose : bool, optional
             If True, print some fitting convergence results to stdout.
+        mode : str, optional
+            Coordinate descent variant. "covariance" precomputes the Gram
+            matrix of the explanatory variables and makes each coordinate
+            update cost O(p) operations; "naive" keeps the residual and makes
+            each coordinate update cost O(n) operations. "auto" chooses
+            "covariance" if n > p and p is at most 500.
 
         Returns
         -------
@@ -302,7 +641,8 @@ class ElasticNet(LinearModel):
         self._coef, n_iter = _enet_cd(x=x, y=y, coef0=coef0, lam=self.lam,
                                       alpha=self.alpha, tol=tol,
                                       max_iter=max_iter, random=random,
-                                      seed=seed, callback=callback)
+                                      seed=seed, callback=callback,
+                                      mode=mode)
 
         if verbose:
             # Final value of the loss function of the standardized data
@@ -319,13 +659,13 @@ class ElasticNet(LinearModel):
         return self
 
     def path(self, x, y, lam_min, lam_max, n_lam=50, names=None, tol=1e-4,
-             max_iter=1000, random=False, seed=None):
+             max_iter=1000, random=False, seed=None, mode="auto", screen=True):
         """Return a regularization path for the coefficients accross a grid of
         lambda values.
 
         Parameters
         ----------
-        x : array-like, shape (n, p)
+        x : array-like or scipy.sparse matrix, shape (n, p)
             The explanatory variable matrix.
         y : array-like, shape (n,)
             The response variable vector.
@@ -348,6 +688,15 @@ class ElasticNet(LinearModel):
         seed : int, optional
             Seed for a NumPy RandomState object. Used if `random` is True;
             otherwise ignored.
+        mode : str, optional
+            Coordinate descent variant (see fit()). In the "covariance" mode,
+            the Gram matrix is computed once for the whole path.
+        screen : bool, optional
+            If True, only cycle through the coefficients that pass the
+            sequential strong rule (Tibshirani et al. (2012)) and that are
+            nonzero, checking the optimality conditions of the others
+            afterwards. This gives the same path much faster when few
+            coefficients are nonzero.
 
         Returns
         -------
@@ -371,7 +720,7 @@ class ElasticNet(LinearModel):
         lambdas = np.geomspace(lam_min, lam_max, n_lam)
         return _enet_path(x=x, y=y, coef0=coef0, lambdas=lambdas,
                           alpha=self.alpha, tol=tol, max_iter=max_iter,
-                          random=random, seed=seed)
+                          random=random, seed=seed, mode=mode, screen=screen)
 
     def path_plot(self, x, y, lam_min, lam_max, n_lam=50, tol=1e-4,
                   max_iter=1000, random=False, seed=None, ax=None, **kwargs):
@@ -425,3 +774,230 @@ class ElasticNet(LinearModel):
         ax.set(xlim=(-np.log(lam_max), -np.log(lam_min)))
 
         return ax
+
+
+class ElasticNetCV(ElasticNet):
+    """Elastic net linear regression with the regularization constant chosen by
+    K-fold cross-validation.
+
+    Properties
+    ----------
+    alpha : float
+        L1/L2 mixing parameter.
+    lam : float
+        The selected regularization constant (see the `rule` argument of
+        fit()).
+    lambdas : numpy.ndarray
+        The grid of regularization constants, from the biggest to the smallest.
+    cv_error : numpy.ndarray
+        The cross-validated mean squared prediction error for each lambda in
+        `lambdas`.
+    cv_se : numpy.ndarray
+        Standard error of `cv_error` (the standard deviation of the fold errors
+        divided by the square root of the number of folds).
+    lam_min : float
+        The lambda minimizing the cross-validated error.
+    lam_1se : float
+        The biggest lambda whose cross-validated error is within one standard
+        error of the minimum.
+    random_state : numpy.random.RandomState
+        The random number generator used to assign observations to folds.
+    """
+    lambdas: np.ndarray = None
+    cv_error: np.ndarray = None
+    cv_se: np.ndarray = None
+    lam_min: float = None
+    lam_1se: float = None
+    random_state: np.random.RandomState = None
+
+    def __init__(self, alpha=1, n_lam=50, lam_min_ratio=1e-3, n_folds=10,
+                 random_state=None):
+        """Initialize an elastic net model with cross-validation.
+
+        Parameters
+        ----------
+        alpha : float (in [0, 1])
+            L1/L2 mixing parameter. alpha=1 means L1 penalty only, alpha=0 means
+            L2 penalty only. 0<alpha<1 means weighted sum of L1 and L2
+            penalties.
+        n_lam : int, optional
+            Number of lambdas to consider. They are spaced logarithmically
+            between lam_max * lam_min_ratio and lam_max, where lam_max is the
+            smallest lambda for which all the coefficients are zero (or, if
+            alpha is close to 0, for which they would be zero with alpha=0.001).
+        lam_min_ratio : float (in (0, 1]), optional
+            Ratio of the smallest to the biggest lambda.
+        n_folds : int, optional
+            Number of cross-validation folds.
+        random_state : int or numpy.random.RandomState object, optional
+            A numpy.random.RandomState object or a valid initializer for a
+            numpy.random.RandomState object. To be used to assign observations
+            to folds.
+        """
+        # Validate parameters
+        self.alpha = validate_float(alpha, "alpha", minimum=0.0, maximum=1.0)
+        self.n_lam = validate_int(n_lam, "n_lam", minimum=1)
+        self.lam_min_ratio = validate_float(lam_min_ratio, "lam_min_ratio",
+                                            positive=True, maximum=1.0)
+        self.n_folds = validate_int(n_folds, "n_folds", minimum=2)
+
+        # Seed the RNG
+        if isinstance(random_state, np.random.RandomState):
+            self.random_state = random_state
+        else:
+            self.random_state = np.random.RandomState(random_state)
+
+        super(ElasticNet, self).__init__(standardize=True, fit_intercept=True)
+
+    def fit(self, x, y, names=None, tol=1e-4, max_iter=1000, rule="min",
+            mode="auto", screen=True, n_jobs=1, backend="process"):
+        """Choose the regularization constant by cross-validation and fit the
+        elastic net model with it.
+
+        The regularization path is computed on each training fold with warm
+        starts along the lambda grid, and the mean squared prediction error is
+        recorded on the held-out fold. Each training fold is standardized by
+        its own means and standard deviations, so the held-out observations
+        play no part in fitting the path. The model is then refitted on all
+        the data.
+
+        Parameters
+        ----------
+        x : array-like, shape (n, p)
+            The explanatory variable matrix.
+        y : array-like, shape (n,)
+            The response variable vector.
+        names : list, optional
+            List of feature names corresponding to the columns of `x`.
+        tol : float, optional
+            Convergence tolerance.
+        max_iter : int, optional
+            Number of iterations of coordinate descent to perform.
+        rule : str, optional
+            Which lambda to use for the final model: "min" for `lam_min` or
+            "1se" for `lam_1se`.
+        mode : str, optional
+            Coordinate descent variant (see ElasticNet.fit()).
+        screen : bool, optional
+            Whether to use strong rule screening (see ElasticNet.path()).
+        n_jobs : int or None, optional
+            Number of folds to process in parallel. If negative, this counts
+            backwards from the number of CPUs (-1 means all CPUs). Each fold
+            copies its training rows of the explanatory variable matrix, so up
+            to `n_jobs` such copies (each about (n_folds - 1) / n_folds the size
+            of `x`) are held in memory at once.
+        backend : str, optional
+            Either "process" or "thread". Coordinate descent runs mostly in the
+            Python interpreter, so only processes give a speedup. The
+            standardized data is shared with the workers without copying it in
+            both cases (apart from the copies of the training rows). See
+            stattools.utils.parallel_map().
+
+        Returns
+        -------
+        This ElasticNetCV instance.
+        """
+        if rule not in ("min", "1se"):
+            raise ValueError(f"Unknown lambda selection rule: {rule}")
+
+        if _issparse(x):
+            raise ValueError("ElasticNetCV does not support sparse explanatory "
+                             "variables.")
+
+        # Validate explanatory and response variables
+        x = self._preprocess_features(x=x, names=names)
+        y = self._preprocess_response(y=y, x=x)
+        n = len(y)
+        if n < self.n_folds:
+            raise ValueError(f"Need at least {self.n_folds} observations for "
+                             f"{self.n_folds}-fold cross-validation.")
+
+        # Grid of lambdas, starting from the smallest lambda for which all the
+        # coefficients are zero
+        lam_max = np.max(np.abs(x.T.dot(y))) / (n * max(self.alpha, 1e-3))
+        if lam_max == 0:
+            lam_max = 1.0
+        self.lambdas = np.geomspace(lam_max, lam_max * self.lam_min_ratio,
+                                    self.n_lam)
+
+        # Regularization path and prediction errors for each fold
+        folds = self.random_state.permutation(n) % self.n_folds
+        tasks = [(np.flatnonzero(folds == k),) for k in range(self.n_folds)]
+        errors = parallel_map(_enet_cv_fold,
+                              (x, y, self.lambdas, self.alpha, tol, max_iter,
+                               mode, screen),
+                              tasks, n_jobs=n_jobs, backend=backend)
+
+        # Errors in the units of the response variable
+        errors = np.asarray(errors) * self._y_std ** 2
+        self.cv_error = np.mean(errors, axis=0)
+        self.cv_se = np.std(errors, axis=0, ddof=1) / np.sqrt(self.n_folds)
+
+        best = np.argmin(self.cv_error)
+        self.lam_min = self.lambdas[best]
+        within = self.cv_error <= self.cv_error[best] + self.cv_se[best]
+        self.lam_1se = self.lambdas[np.argmax(within)]
+
+        # Refit on all the data, warm starting along the grid
+        self.lam = self.lam_min if rule == "min" else self.lam_1se
+        path, _ = _enet_path(x=x, y=y, coef0=np.zeros(self._p),
+                             lambdas=self.lambdas[self.lambdas >= self.lam],
+                             alpha=self.alpha, tol=tol, max_iter=max_iter,
+                             random=False, seed=None, mode=mode, screen=screen)
+        self._coef = path[-1]
+
+        self.fitted = True
+        return self
+
+
+def _enet_cv_fold(x, y, lambdas, alpha, tol, max_iter, mode, screen, test):
+    """Compute the prediction errors of an elastic net regularization path
+    fitted without one cross-validation fold.
+
+    Parameters
+    ----------
+    x : numpy.ndarray, shape (n, p)
+        Standardized explanatory variables.
+    y : numpy.ndarray, shape (n,)
+        Standardized response variable.
+    lambdas : numpy.ndarray, shape (k,)
+        Decreasing regularization constants (for the training observations
+        standardized separately).
+    alpha, tol, max_iter, mode, screen
+        See _enet_path().
+    test : numpy.ndarray
+        Indices of the held-out observations.
+
+    Returns
+    -------
+    errors : numpy.ndarray, shape (k,)
+        Mean squared prediction error on the held-out observations for each
+        lambda, in the standardized units of `y`.
+    """
+    train = np.ones(len(y), dtype=np.bool_)
+    train[test] = False
+
+    # Standardize the training fold by its own means and standard deviations,
+    # so that the held-out observations do not affect the fitted path (the
+    # boolean indexing copies the training rows)
+    x_train, y_train = x[train], y[train]
+    x_mean, y_mean = x_train.mean(axis=0), y_train.mean()
+    x_std, y_std = x_train.std(axis=0), y_train.std()
+    x_std[x_std == 0] = 1.0
+    if y_std == 0:
+        y_std = 1.0
+    x_train -= x_mean
+    x_train /= x_std
+    y_train -= y_mean
+    y_train /= y_std
+
+    path, _ = _enet_path(x=x_train, y=y_train, coef0=np.zeros(x.shape[1]),
+                         lambdas=lambdas, alpha=alpha, tol=tol,
+                         max_iter=max_iter, random=False, seed=None, mode=mode,
+                         screen=screen)
+
+    # Predictions in the standardized units of the whole data
+    x_test = (x[test] - x_mean) / x_std
+    residuals = (y[test] - y_mean)[:, np.newaxis] \
+        - y_std * x_test.dot(path.T)
+    return np.mean(residuals ** 2, axis=0)
@@ -1,13 +1,25 @@
 """Defines the LogisticRegression class."""
 
 import numpy as np
+import scipy.linalg
+import scipy.special
 
 from .glm import GLM
+from .glm import _BatchLoss
+from .glm import _gram
+from .glm import _issparse
 from ..generic import Classifier
+from ..optimization import LBFGS
+from ..optimization import NewtonCG
 from ..optimization import Optimizer
+from ..optimization import ProximalGradient
 from ..regularization import lasso, ridge
 from ..utils import validate_bool
 from ..utils import validate_float
+from ..utils import validate_int
+
+# Largest number of features for which IRLS is the default optimizer
+_IRLS_MAX_FEATURES = 200
 
 
 def sigmoid(x):
@@ -15,11 +27,19 @@ def sigmoid(x):
     return 1.0 / (1.0 + np.exp(np.negative(x)))
 
 
-class CrossEntropyLoss(object):
+def softmax(x):
+    """Compute the softmax activation function exp(x) / sum(exp(x)) along the
+    rows of a matrix."""
+    return scipy.special.softmax(x, axis=1)
+
+
+class CrossEntropyLoss(_BatchLoss):
     """Average cross entropy loss function for logistic regression.
 
     Minimizing this loss function is equivalent to maximizing the likelihood
-    function in the logistic regression model.
+    function in the logistic regression model. The loss function and its
+    gradient can be restricted to a mini-batch of observations with the
+    `index` argument (see _BatchLoss).
     """
 
     def __init__(self, x, y):
@@ -27,29 +47,147 @@ class CrossEntropyLoss(object):
 
         Parameters
         ----------
-        x : array-like, shape (n, p)
-            Explanatory variable.
+        x : array-like or scipy.sparse matrix, shape (n, p)
+            Explanatory variable. Sparse matrices are not densified.
         y : array-like, shape (n, )
             Response variable.
         """
-        self.x = np.asarray(x)
+        self.x = x if _issparse(x) else np.asarray(x)
         self.y = np.asarray(y)
-        self.n = len(self.x)
+        self.n = self.x.shape[0]
 
-    def __call__(self, coef):
+    def __call__(self, coef, index=None):
         """Compute the average cross entropy loss for the training data."""
-        logits = self.x.dot(coef)
-        return np.mean(np.log1p(np.exp(-logits)) + (1 - self.y) * logits)
+        x, y = self._batch(index)
+        logits = self._linear_predictor(x, coef, index)
+        return np.mean(np.logaddexp(0, -logits) + (1 - y) * logits)
 
-    def grad(self, coef):
+    def grad(self, coef, index=None):
         """Compute the gradient of the average cross entropy loss."""
-        return -self.x.T.dot(self.y - sigmoid(self.x.dot(coef))) / self.n
+        x, y = self._batch(index)
+        prob = sigmoid(self._linear_predictor(x, coef, index))
+        return -x.T.dot(y - prob) / len(y)
+
+    def value_and_grad(self, coef, index=None):
+        """Compute the average cross entropy loss and its gradient together."""
+        x, y = self._batch(index)
+        logits = self._linear_predictor(x, coef, index)
+        value = np.mean(np.logaddexp(0, -logits) + (1 - y) * logits)
+        return value, -x.T.dot(y - sigmoid(logits)) / len(y)
+
+    def value_grad_hess(self, coef):
+        """Compute the average cross entropy loss, its gradient, and its
+        Hessian together."""
+        logits = self._linear_predictor(self.x, coef)
+        value = np.mean(np.logaddexp(0, -logits) + (1 - self.y) * logits)
+        prob = sigmoid(logits)
+        grad = -self.x.T.dot(self.y - prob) / self.n
+        return value, grad, _gram(self.x, prob * (1.0 - prob)) / self.n
 
     def hess(self, coef):
         """Compute the Hessian of the average cross entropy loss."""
-        logits = self.x.dot(coef)
-        weights = np.diag(sigmoid(logits) * (1.0 - sigmoid(logits)))
-        return self.x.T.dot(weights).dot(self.x) / self.n
+        prob = sigmoid(self._linear_predictor(self.x, coef))
+        return _gram(self.x, prob * (1.0 - prob)) / self.n
+
+    def hessp(self, coef, v):
+        """Compute the product of the Hessian of the average cross entropy loss
+        with a vector (without forming the Hessian)."""
+        prob = sigmoid(self._linear_predictor(self.x, coef))
+        return self.x.T.dot(prob * (1.0 - prob) * self.x.dot(v)) / self.n
+
+
+class SoftmaxCrossEntropyLoss(_BatchLoss):
+    """Average cross entropy loss function for multinomial logistic
+    regression:
+        L(b) = mean(logsumexp(x.dot(b), axis=1) - x.dot(b)[i, y[i]]),
+    where b is a matrix with one column of coefficients per class.
+
+    The coefficient matrix is passed to the methods flattened (in row-major
+    order) into a vector of length p * k, so that the loss function works with
+    the optimizers in stattools.optimization. The linear predictors of all k
+    classes are computed in one matrix product. The loss function and its
+    gradient can be restricted to a mini-batch of observations with the
+    `index` argument (see _BatchLoss).
+    """
+
+    def __init__(self, x, y, k):
+        """Initialize with the training data.
+
+        Parameters
+        ----------
+        x : array-like or scipy.sparse matrix, shape (n, p)
+            Explanatory variable. Sparse matrices are not densified.
+        y : array-like, shape (n, )
+            Response variable (class indices 0, 1, ..., k - 1).
+        k : int
+            Number of classes.
+        """
+        self.x = x if _issparse(x) else np.asarray(x)
+        self.y = np.asarray(y)
+        self.k = k
+        self.n, self.p = self.x.shape
+
+    def _logits(self, x, coef, index=None):
+        """Compute the linear predictors of all classes."""
+        return self._linear_predictor(x, np.reshape(coef, (self.p, self.k)),
+                                      index)
+
+    def _prob(self, coef):
+        """Compute the class probabilities."""
+        return softmax(self._logits(self.x, coef))
+
+    def __call__(self, coef, index=None):
+        """Compute the average cross entropy loss for the training data."""
+        x, y = self._batch(index)
+        logits = self._logits(x, coef, index)
+        return np.mean(scipy.special.logsumexp(logits, axis=1)
+                       - logits[np.arange(len(y)), y])
+
+    def grad(self, coef, index=None):
+        """Compute the gradient of the average cross entropy loss."""
+        return self.value_and_grad(coef, index=index)[1]
+
+    def value_and_grad(self, coef, index=None):
+        """Compute the average cross entropy loss and its gradient with one
+        pass over the data for each."""
+        x, y = self._batch(index)
+        logits = self._logits(x, coef, index)
+        log_norm = scipy.special.logsumexp(logits, axis=1)
+        rows = np.arange(len(y))
+        value = np.mean(log_norm - logits[rows, y])
+
+        prob = np.exp(logits - log_norm[:, np.newaxis])
+        prob[rows, y] -= 1
+        return value, x.T.dot(prob).ravel() / len(y)
+
+    def value_grad_hess(self, coef):
+        """Compute the average cross entropy loss, its gradient, and its
+        Hessian together (see hess())."""
+        return (*self.value_and_grad(coef), self.hess(coef))
+
+    def hess(self, coef):
+        """Compute the Hessian of the average cross entropy loss.
+
+        This is a (p * k) x (p * k) matrix made of k^2 weighted Gram matrices,
+        so it is only practical for small p * k; see hessp().
+        """
+        prob = self._prob(coef)
+        hess = np.empty((self.p, self.k, self.p, self.k))
+        for a in range(self.k):
+            for b in range(a, self.k):
+                weights = prob[:, a] * ((a == b) - prob[:, b])
+                hess[:, a, :, b] = _gram(self.x, weights) / self.n
+                hess[:, b, :, a] = hess[:, a, :, b].T
+        return hess.reshape((self.p * self.k, self.p * self.k))
+
+    def hessp(self, coef, v):
+        """Compute the product of the Hessian of the average cross entropy loss
+        with a vector (without forming the Hessian).
+        """
+        prob = self._prob(coef)
+        xv = self.x.dot(np.reshape(v, (self.p, self.k)))
+        prod = prob * (xv - np.sum(prob * xv, axis=1, keepdims=True))
+        return self.x.T.dot(prod).ravel() / self.n
 
 
 class LogisticRegression(GLM, Classifier):
@@ -64,12 +202,11 @@ class LogisticRegression(GLM, Classifier):
     # Loss function
     loss = None
 
-    # The link function for logistic regression is the logit function, whose
-    # inverse is the sigmoid function
-    _inv_link = staticmethod(sigmoid)
+    # Indicates whether the model is multinomial (softmax) logistic regression
+    multinomial: bool = False
 
     def __init__(self, reg=None, penalty=0.1, standardize=True,
-                 fit_intercept=True):
+                 fit_intercept=True, multinomial=False):
         """Initialize a LogisticRegression object.
 
         Parameters
@@ -86,31 +223,81 @@ class LogisticRegression(GLM, Classifier):
             centered to have mean 0 and scaled to have variance 1.
         fit_intercept : bool, optional
             Indicates whether the model should fit an intercept term.
+        multinomial : bool, optional
+            If True, fit a multinomial logistic regression model for any number
+            of classes, with one vector of coefficients per class and class
+            probabilities given by the softmax function. If False, the
+            response must have two classes.
         """
         self.reg = reg
         self.standardize = validate_bool(standardize, "standardize")
         self.fit_intercept = validate_bool(fit_intercept, "fit_intercept")
+        self.multinomial = validate_bool(multinomial, "multinomial")
         self.penalty = validate_float(penalty, "penalty", positive=True)
 
-    def fit(self, x, y, optimizer, names=None, *args, **kwargs):
+    @staticmethod
+    def _inv_link(logits):
+        """Inverse of the link function: the sigmoid function for binary
+        logistic regression (a vector of logits) or the softmax function for
+        multinomial logistic regression (a matrix of logits, one column per
+        class).
+        """
+        if np.ndim(logits) == 2:
+            return softmax(logits)
+        else:
+            return sigmoid(logits)
+
+    def fit(self, x, y, optimizer=None, names=None, *args, **kwargs):
         """Fit the logistic regression model.
 
         Parameters
         ----------
-        x : array-like, shape (n, p)
-            Explanatory variable.
+        x : array-like or scipy.sparse matrix, shape (n, p)
+            Explanatory variable. Sparse matrices are standardized implicitly
+            and never densified.
         y : array-like, shape (n, )
             Response variable.
-        optimizer : Optimizer, optional
-            Specifies the optimization algorithm used. If the model's `penalty`
-            is None, this is ignored. Otherwise, this is required because it
-            specifies how to minimize the penalized loss function.
+        optimizer : None or str or Optimizer, optional
+            Specifies how to minimize the (penalized) average cross entropy.
+            Acceptable values:
+                None (default):
+                    "proximal" for the "l1" penalty. Otherwise, "irls" for
+                    binary logistic regression with a dense `x` with at most
+                    200 columns, and "lbfgs" for multinomial logistic
+                    regression, sparse `x`, or more columns (IRLS forms and
+                    factors the p x p Hessian in every iteration).
+                "irls":
+                    Iteratively reweighted least squares (i.e., Newton's
+                    method with step halving). Supports no penalty or the "l2"
+                    penalty, and only binary logistic regression. Acceptable
+                    keyword arguments (kwargs): tol, max_iter. See
+                    _fit_logistic_irls() for descriptions.
+                "lbfgs":
+                    The limited-memory BFGS quasi-Newton method. Supports no
+                    penalty or the "l2" penalty. Acceptable keyword arguments
+                    (kwargs): tol (gradient tolerance), max_iter.
+                "newton-cg":
+                    The Newton-CG (truncated Newton) method, which only uses
+                    Hessian-vector products. Supports no penalty or the "l2"
+                    penalty. Acceptable keyword arguments (kwargs): tol
+                    (gradient tolerance), max_iter.
+                "proximal":
+                    The accelerated proximal gradient method (FISTA), which
+                    handles the "l1" penalty exactly and gives coefficients
+                    that are exactly zero. Supports every penalty. Acceptable
+                    keyword arguments (kwargs): tol (gradient mapping
+                    tolerance), max_iter.
+                stattools.optimization.Optimizer instance:
+                    Minimize the loss function with the optimizer. For
+                    multinomial logistic regression, the loss function takes
+                    the coefficient matrix flattened into a vector.
         names : list, optional
             List of feature names corresponding to the columns of `x`.
         args : sequence, optional
             Additional positional arguments to pass to `optimizer`'s optimize().
         kwargs : dict, optional
-            Additional keyword arguments to pass to `optimizer`'s optimize().
+            Additional keyword arguments to pass to `optimizer`'s optimize() or
+            to the IRLS algorithm.
 
         Returns
         -------
@@ -118,11 +305,19 @@ class LogisticRegression(GLM, Classifier):
         """
         # Validate input
         x = self._preprocess_features(x=x, names=names)
-        y = self._preprocess_classes(y=y, max_classes=2)
+        y = self._preprocess_classes(y=y, max_classes=(None if self.multinomial
+                                                        else 2))
         y = self._preprocess_response(y=y, x=x)
 
         # Maximum likelihood estimation by minimizing the average cross entropy
-        self.loss = CrossEntropyLoss(x, y)
+        p = x.shape[1]
+        if self.multinomial:
+            k = len(self.classes)
+            self.loss = SoftmaxCrossEntropyLoss(x, y, k)
+            shape = (p, k)
+        else:
+            self.loss = CrossEntropyLoss(x, y)
+            shape = (p,)
 
         if self.reg == "l1":
             self.loss = lasso(penalty=self.penalty, loss=self.loss)
@@ -131,11 +326,41 @@ class LogisticRegression(GLM, Classifier):
         elif self.reg is not None:
             raise ValueError(f"Unknown penalty type: {self.reg}")
 
-        if not isinstance(optimizer, Optimizer):
-            raise ValueError(f"Unknown minimization method: {optimizer}")
+        if optimizer is None:
+            if self.reg == "l1":
+                optimizer = "proximal"
+            else:
+                # IRLS needs a dense p x p Hessian in each iteration
+                if self.multinomial or _issparse(x) \
+                        or p > _IRLS_MAX_FEATURES:
+                    optimizer = "lbfgs"
+                else:
+                    optimizer = "irls"
 
-        self._coef = optimizer.optimize(x0=np.zeros(x.shape[1]), func=self.loss,
-                                        *args, **kwargs)
+        if isinstance(optimizer, Optimizer):
+            coef = optimizer.optimize(x0=np.zeros(np.prod(shape)),
+                                      func=self.loss, *args, **kwargs)
+        elif optimizer == "proximal":
+            coef = _fit_proximal(self.loss, np.zeros(np.prod(shape)), **kwargs)
+        elif optimizer in ("irls", "lbfgs", "newton-cg"):
+            if self.reg == "l1":
+                raise ValueError(f"Optimizer '{optimizer}' does not support "
+                                 "the L1 penalty.")
+            if optimizer == "irls":
+                if self.multinomial:
+                    raise ValueError("IRLS only supports binary logistic "
+                                     "regression.")
+                penalty = self.penalty if self.reg == "l2" else 0.0
+                coef = _fit_logistic_irls(x, y, penalty=penalty, **kwargs)
+            elif optimizer == "lbfgs":
+                coef = _fit_lbfgs(self.loss, np.zeros(np.prod(shape)),
+                                  **kwargs)
+            else:
+                coef = _fit_newton_cg(self.loss, np.zeros(np.prod(shape)),
+                                      **kwargs)
+        else:
+            raise ValueError(f"Unknown minimization method: {optimizer}")
+        self._coef = np.reshape(coef, shape)
 
         self.fitted = True
         return self
@@ -151,8 +376,166 @@ class LogisticRegression(GLM, Classifier):
 
         Returns
         -------
-        Matrix of shape (len(x), 2). The (i, j)-th entry is the probability that
-        the i-th observation corresponds to the j-th class.
+        Matrix of shape (len(x), k), where k is the number of classes. The
+        (i, j)-th entry is the probability that the i-th observation corresponds
+        to the j-th class.
         """
         estimate = self.estimate(x)
+        if self.multinomial:
+            return estimate
         return np.column_stack((1 - estimate, estimate))
+
+
+def _fit_logistic_irls(x, y, penalty=0.0, tol=1e-8, max_iter=100):
+    """Fit a logistic regression model by iteratively reweighted least squares
+    (IRLS).
+
+    Each iteration is a Newton step for the penalized average cross entropy
+        L(b) = mean(log(1 + exp(x.dot(b))) - y * x.dot(b)) + penalty * b.dot(b),
+    i.e., the solution of the weighted least squares problem with weights
+    w = p * (1 - p), where p = sigmoid(x.dot(b)). The weighted Gram matrix
+    x.T.dot(diag(w)).dot(x) is formed by scaling the rows of x (the diagonal
+    matrix is never formed), and the step is computed by a Cholesky solve. If a
+    step increases the loss, it is halved until it does not.
+
+    Parameters
+    ----------
+    x : numpy.ndarray or scipy.sparse matrix or _StandardizedSparse,
+            shape (n, p)
+        Explanatory variables.
+    y : numpy.ndarray, shape (n,)
+        Response variable (0's and 1's).
+    penalty : float, optional
+        L2 regularization constant (nonnegative).
+    tol : float, optional
+        Positive convergence tolerance. The algorithm stops when the change in
+        the deviance D = 2 * n * L(b) is less than tol * (|D| + 0.1), as in R's
+        glm().
+    max_iter : int, optional
+        Maximum number of iterations.
+
+    Returns
+    -------
+    coef : numpy.ndarray, shape (p,)
+        The estimated coefficients.
+    """
+    tol = validate_float(tol, "tol", positive=True)
+    max_iter = validate_int(max_iter, "max_iter", minimum=1)
+
+    n, p = x.shape
+    coef = np.zeros(p)
+    logits = np.zeros(n)
+
+    def deviance(eta, b):
+        loss = np.mean(np.logaddexp(0, eta) - y * eta) + penalty * b.dot(b)
+        return 2 * n * loss
+
+    dev = deviance(logits, coef)
+    for _ in range(max_iter):
+        # Newton step from the weighted least squares problem
+        prob = sigmoid(logits)
+        grad = x.T.dot(prob - y) / n + 2 * penalty * coef
+        hess = _gram(x, prob * (1 - prob)) / n
+        hess[np.diag_indices(p)] += 2 * penalty
+        try:
+            step = scipy.linalg.cho_solve(scipy.linalg.cho_factor(hess), grad)
+        except np.linalg.LinAlgError:
+            # The Hessian is singular (e.g., for separable data)
+            step = np.linalg.lstsq(hess, grad, rcond=None)[0]
+
+        # Step halving
+        dev_old = dev
+        coef_old, logits_old = coef, logits
+        for _ in range(30):
+            coef = coef_old - step
+            logits = x.dot(coef)
+            dev = deviance(logits, coef)
+            if dev <= dev_old:
+                break
+            step = step / 2
+        else:
+            coef, logits, dev = coef_old, logits_old, dev_old
+
+        if abs(dev_old - dev) < tol * (abs(dev) + 0.1):
+            break
+
+    return coef
+
+
+def _fit_lbfgs(loss, coef0, tol=1e-6, max_iter=1000):
+    """Minimize a loss function by the limited-memory BFGS method.
+
+    Parameters
+    ----------
+    loss : callable
+        The loss function. It must have a `grad` method. If it has a
+        `value_and_grad` method, that is used to compute both at once.
+    coef0 : numpy.ndarray
+        Initial guess for the minimizer.
+    tol : float, optional
+        Positive tolerance for the largest absolute value of the gradient.
+    max_iter : int, optional
+        Maximum number of iterations.
+
+    Returns
+    -------
+    coef : numpy.ndarray
+        The approximate minimizer.
+    """
+    tol = validate_float(tol, "tol", positive=True)
+
+    # Only stop on the gradient tolerance, not on the relative decrease of the
+    # loss (which stops too early for flat losses)
+    lbfgs = LBFGS(iterations=max_iter, gtol=tol, ftol=0.0)
+    return lbfgs.optimize(x0=coef0, func=loss)
+
+
+def _fit_newton_cg(loss, coef0, tol=1e-8, max_iter=100):
+    """Minimize a loss function by the Newton-CG method.
+
+    Parameters
+    ----------
+    loss : callable
+        The loss function. It must have `grad` and `hessp` methods.
+    coef0 : numpy.ndarray
+        Initial guess for the minimizer.
+    tol : float, optional
+        Positive tolerance for the largest absolute value of the gradient.
+    max_iter : int, optional
+        Maximum number of Newton iterations.
+
+    Returns
+    -------
+    coef : numpy.ndarray
+        The approximate minimizer.
+    """
+    tol = validate_float(tol, "tol", positive=True)
+    newton_cg = NewtonCG(iterations=max_iter, gtol=tol)
+    return newton_cg.optimize(x0=coef0, func=loss)
+
+
+def _fit_proximal(loss, coef0, tol=1e-6, max_iter=1000):
+    """Minimize a (possibly L1-penalized) loss function by the accelerated
+    proximal gradient method.
+
+    Parameters
+    ----------
+    loss : callable
+        The loss function. It must have a `grad` method, or `prox` and `smooth`
+        attributes (see stattools.regularization.lasso).
+    coef0 : numpy.ndarray
+        Initial guess for the minimizer.
+    tol : float, optional
+        Positive tolerance for the largest absolute value of the gradient
+        mapping.
+    max_iter : int, optional
+        Maximum number of iterations.
+
+    Returns
+    -------
+    coef : numpy.ndarray
+        The approximate minimizer.
+    """
+    tol = validate_float(tol, "tol", positive=True)
+    proximal = ProximalGradient(iterations=max_iter, gtol=tol)
+    return proximal.optimize(x0=coef0, func=loss)
@@ -5,8 +5,11 @@ import unittest
 
 import numpy as np
 import pandas as pd
+import scipy.sparse
 
 from stattools.glm.glm import GLM
+from stattools.glm.linear import MSELoss
+from stattools.glm.logistic import CrossEntropyLoss
 
 
 class ExampleGLM(GLM):
@@ -63,6 +66,39 @@ class TestGLM(unittest.TestCase):
             with self.assertRaises(ValueError):
                 _ = ExampleGLM().fit(x, y, names=bad_names)
 
+    def test_sparse_standardization(self):
+        """Sparse features are standardized implicitly, and the standardized
+        matrix acts like the dense one in matrix products and loss functions.
+        """
+        rs = np.random.RandomState(0)
+        n, p = 50, 8
+        x_sparse = scipy.sparse.random(n, p, density=0.3, random_state=rs,
+                                       format="csr")
+        x = x_sparse.toarray()
+        y = rs.randint(2, size=n)
+
+        z = ExampleGLM()._preprocess_features(x, names=None)
+        z_sparse = ExampleGLM()._preprocess_features(x_sparse, names=None)
+        self.assertFalse(isinstance(z_sparse, np.ndarray))
+        self.assertEqual(z_sparse.shape, z.shape)
+
+        v = rs.normal(size=p)
+        u = rs.normal(size=(n, 3))
+        np.testing.assert_allclose(z_sparse.dot(v), z.dot(v))
+        np.testing.assert_allclose(z_sparse.T.dot(u), z.T.dot(u))
+
+        for loss in (MSELoss, CrossEntropyLoss):
+            dense, sparse = loss(z, y), loss(z_sparse, y)
+            self.assertAlmostEqual(sparse(v), dense(v))
+            np.testing.assert_allclose(sparse.grad(v), dense.grad(v))
+            np.testing.assert_allclose(sparse.hess(v), dense.hess(v))
+
+        # Without standardization, the intercept column is added sparsely
+        model = ExampleGLM(standardize=False)
+        x1_sparse = model._preprocess_features(x_sparse, names=None)
+        self.assertTrue(scipy.sparse.issparse(x1_sparse))
+        np.testing.assert_allclose(x1_sparse.toarray()[:, 0], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,8 +5,10 @@ import unittest
 import warnings
 
 import numpy as np
+import scipy.sparse
 
 from stattools.glm import LinearRegression
+from stattools.glm import Ridge
 from stattools.optimization import GradientDescent, NewtonRaphson
 
 
@@ -180,6 +182,112 @@ class TestLinearRegression(unittest.TestCase):
                                            decimal=2)
             np.testing.assert_almost_equal(model.coef, coef, decimal=2)
 
+    def test_sparse(self):
+        """Sparse explanatory variables give the same fit as dense ones."""
+        rs = np.random.RandomState(1)
+        n, p = 200, 15
+        x_sparse = scipy.sparse.random(n, p, density=0.2, random_state=rs,
+                                       format="csr")
+        x = x_sparse.toarray()
+        y = 1 + x[:, :3].dot([2, -1, 3]) + rs.normal(size=n)
+
+        for standardize in (True, False):
+            dense = LinearRegression(standardize=standardize).fit(x, y)
+            sparse = LinearRegression(standardize=standardize)
+            sparse.fit(x_sparse, y)
+            np.testing.assert_allclose(sparse.coef, dense.coef, atol=1e-8)
+            np.testing.assert_allclose(sparse.intercept, dense.intercept,
+                                       atol=1e-8)
+            np.testing.assert_allclose(sparse.predict(x_sparse),
+                                       dense.predict(x), atol=1e-8)
+
+        # The LSQR solver also works with dense input
+        model = LinearRegression().fit(x, y, solver="lsqr")
+        np.testing.assert_allclose(model.coef, dense.coef, atol=1e-8)
+
+        with self.assertRaises(ValueError):
+            LinearRegression().fit(x_sparse, y, solver="qr")
+
+        # Ridge regression
+        dense = Ridge(lam=0.5).fit(x, y)
+        sparse = Ridge(lam=0.5).fit(x_sparse, y)
+        np.testing.assert_allclose(sparse.coef, dense.coef, atol=1e-8)
+        np.testing.assert_allclose(sparse.intercept, dense.intercept,
+                                   atol=1e-8)
+
+    def test_multi_response(self):
+        """Fitting several responses at once gives the same models as fitting
+        each response separately.
+        """
+        rs = np.random.RandomState(3)
+        n, p, m = 150, 8, 4
+        x_sparse = scipy.sparse.random(n, p, density=0.3, random_state=rs,
+                                       format="csc")
+        x = x_sparse.toarray()
+        y = 2 + x.dot(rs.normal(size=(p, m))) + rs.normal(size=(n, m))
+
+        fits = []
+        for standardize in (True, False):
+            for solver in ("qr", "lstsq", "lsqr"):
+                fits.append((lambda: LinearRegression(standardize=standardize),
+                             x, {"solver": solver}))
+            fits.append((lambda: LinearRegression(standardize=standardize),
+                         x_sparse, {}))
+        fits.append((lambda: Ridge(lam=0.5), x, {}))
+        fits.append((lambda: Ridge(lam=0.5), x_sparse, {}))
+
+        for make_model, features, kwargs in fits:
+            model = make_model().fit(features, y, **kwargs)
+            self.assertEqual(model.coef.shape, (p, m))
+            self.assertEqual(model.intercept.shape, (m,))
+            self.assertEqual(model.predict(x).shape, (n, m))
+            for j in range(m):
+                single = make_model().fit(features, y[:, j], **kwargs)
+                np.testing.assert_allclose(model.coef[:, j], single.coef,
+                                           atol=1e-8)
+                np.testing.assert_allclose(model.intercept[j],
+                                           single.intercept, atol=1e-8)
+            residuals = y - model.predict(x)
+            self.assertAlmostEqual(model.mse(x, y), np.mean(residuals ** 2))
+            self.assertAlmostEqual(model.mae(x, y),
+                                   np.mean(np.abs(residuals)))
+
+        with self.assertRaises(ValueError):
+            LinearRegression().fit(x, y, solver="gd")
+        with self.assertRaises(ValueError):
+            model.mse(x, y[:, :1])
+
+    def test_partial_fit(self):
+        """Fitting batch by batch gives the same model as fitting at once."""
+        rs = np.random.RandomState(2)
+        n, p = 500, 6
+        x = 1e3 + rs.normal(size=(n, p)) * rs.uniform(1, 50, size=p)
+        y = 4 + x.dot(rs.normal(size=p)) + rs.normal(size=n)
+        batches = np.array_split(np.arange(n), 7)
+
+        configs = ((True, True), (False, True), (False, False))
+        for (standardize, fit_intercept), solver in itertools.product(
+                configs, ("normal", "tsqr")):
+            batch = LinearRegression(standardize=standardize,
+                                     fit_intercept=fit_intercept).fit(x, y)
+            model = LinearRegression(standardize=standardize,
+                                     fit_intercept=fit_intercept)
+            for i in batches:
+                model.partial_fit(x[i], y[i], solver=solver)
+            np.testing.assert_allclose(model.coef, batch.coef, rtol=1e-8)
+            np.testing.assert_allclose(model.intercept, batch.intercept,
+                                       rtol=1e-8)
+            if standardize:
+                np.testing.assert_allclose(model._x_mean, batch._x_mean)
+                np.testing.assert_allclose(model._x_std, batch._x_std)
+                np.testing.assert_allclose(model._y_mean, batch._y_mean)
+                np.testing.assert_allclose(model._y_std, batch._y_std)
+
+        with self.assertRaises(ValueError):
+            model.partial_fit(x[:, :-1], y)
+        with self.assertRaises(ValueError):
+            LinearRegression().partial_fit(x, y, solver="svd")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,183 @@
+"""Unit tests for the regularized linear models."""
+
+import itertools
+import unittest
+
+import numpy as np
+import scipy.sparse
+
+from stattools.glm import ElasticNet
+from stattools.glm import ElasticNetCV
+from stattools.glm.linear_penalized import _enet_cv_fold
+
+
+def _kkt_violation(x, y, coef, lam, alpha):
+    """Largest violation of the elastic net optimality conditions for
+    standardized data.
+    """
+    n = len(y)
+    grad = x.T.dot(y - x.dot(coef)) / n - lam * (1 - alpha) * coef
+    active = coef != 0
+    violation = np.zeros_like(coef)
+    violation[active] = np.abs(grad[active]
+                               - lam * alpha * np.sign(coef[active]))
+    violation[~active] = np.clip(np.abs(grad[~active]) - lam * alpha, 0, None)
+    return np.max(violation)
+
+
+class TestElasticNet(unittest.TestCase):
+    def test_coordinate_descent_modes(self):
+        """Both coordinate descent modes reach the elastic net solution."""
+        rs = np.random.RandomState(0)
+        n, p = 200, 30
+        x = rs.normal(size=(n, p))
+        y = 3 + x[:, :5].dot(np.arange(1, 6)) + rs.normal(size=n)
+
+        for alpha, lam in itertools.product((1, 0.5, 0.1), (0.01, 0.1, 1)):
+            coefs = []
+            for mode in ("naive", "covariance"):
+                model = ElasticNet(lam=lam, alpha=alpha)
+                model.fit(x, y, tol=1e-10, mode=mode)
+                coefs.append(model.coef)
+
+                xs = (x - model._x_mean) / model._x_std
+                ys = (y - model._y_mean) / model._y_std
+                self.assertLess(_kkt_violation(xs, ys, model._coef, lam,
+                                               alpha), 1e-6)
+            np.testing.assert_allclose(coefs[0], coefs[1], atol=1e-8)
+
+        with self.assertRaises(ValueError):
+            ElasticNet().fit(x, y, mode="gram")
+
+    def test_path_modes(self):
+        """Both coordinate descent modes give the same regularization path."""
+        rs = np.random.RandomState(1)
+        n, p = 100, 10
+        x = rs.normal(size=(n, p))
+        y = x[:, 0] - 2 * x[:, 1] + rs.normal(size=n)
+
+        model = ElasticNet(alpha=0.5)
+        path_naive, lambdas = model.path(x, y, lam_min=1e-3, lam_max=1,
+                                         n_lam=20, tol=1e-10, mode="naive")
+        path_cov, _ = model.path(x, y, lam_min=1e-3, lam_max=1, n_lam=20,
+                                 tol=1e-10, mode="covariance")
+        np.testing.assert_allclose(path_naive, path_cov, atol=1e-8)
+        self.assertTrue(np.all(np.diff(lambdas) < 0))
+
+    def test_path_screening(self):
+        """Strong rule screening and active set iterations give the same path
+        as plain coordinate descent when p > n.
+        """
+        rs = np.random.RandomState(2)
+        n, p = 50, 200
+        x = rs.normal(size=(n, p))
+        y = x[:, :3].dot([1, -2, 3]) + rs.normal(size=n)
+
+        for alpha in (1, 0.5):
+            model = ElasticNet(alpha=alpha)
+            kwargs = dict(lam_min=1e-2, lam_max=1, n_lam=20, tol=1e-10)
+            path, lambdas = model.path(x, y, screen=True, **kwargs)
+            path_full, _ = model.path(x, y, screen=False, **kwargs)
+            np.testing.assert_allclose(path, path_full, atol=1e-8)
+
+            xs = (x - model._x_mean) / model._x_std
+            ys = (y - model._y_mean) / model._y_std
+            for coef, lam in zip(path, lambdas):
+                self.assertLess(_kkt_violation(xs, ys, coef, lam, alpha), 1e-6)
+
+    def test_sparse(self):
+        """Sparse explanatory variables give the same fits and paths as dense
+        ones in both coordinate descent modes.
+        """
+        rs = np.random.RandomState(4)
+        n, p = 150, 30
+        x_sparse = scipy.sparse.random(n, p, density=0.1, random_state=rs,
+                                       format="csc")
+        x = x_sparse.toarray()
+        y = 2 + x[:, :4].dot([5, -3, 4, 2]) + rs.normal(size=n)
+
+        for mode in ("naive", "covariance"):
+            dense = ElasticNet(lam=0.05, alpha=0.5)
+            dense.fit(x, y, tol=1e-10, mode=mode)
+            sparse = ElasticNet(lam=0.05, alpha=0.5)
+            sparse.fit(x_sparse, y, tol=1e-10, mode=mode)
+            np.testing.assert_allclose(sparse.coef, dense.coef, atol=1e-8)
+            np.testing.assert_allclose(sparse.intercept, dense.intercept,
+                                       atol=1e-8)
+
+            kwargs = dict(lam_min=1e-3, lam_max=1, n_lam=10, tol=1e-10,
+                          mode=mode)
+            path, _ = ElasticNet().path(x, y, **kwargs)
+            path_sparse, _ = ElasticNet().path(x_sparse, y, **kwargs)
+            np.testing.assert_allclose(path_sparse, path, atol=1e-8)
+
+
+class TestElasticNetCV(unittest.TestCase):
+    def test_cross_validation(self):
+        """The selected penalty is consistent with the cross-validation
+        curve, and the final model is the elastic net fit at that penalty.
+        """
+        rs = np.random.RandomState(3)
+        n, p = 150, 40
+        x = rs.normal(size=(n, p))
+        y = 2 + x[:, :4].dot([3, -2, 1, 2]) + rs.normal(size=n)
+
+        model = ElasticNetCV(alpha=0.5, n_lam=30, n_folds=5, random_state=0)
+        model.fit(x, y, tol=1e-10)
+        self.assertEqual(model.cv_error.shape, (30,))
+        self.assertEqual(model.cv_se.shape, (30,))
+        self.assertEqual(model.lam, model.lam_min)
+        self.assertEqual(model.lam_min,
+                         model.lambdas[np.argmin(model.cv_error)])
+        self.assertGreaterEqual(model.lam_1se, model.lam_min)
+
+        reference = ElasticNet(lam=model.lam, alpha=0.5).fit(x, y, tol=1e-10)
+        np.testing.assert_allclose(model.coef, reference.coef, atol=1e-6)
+        np.testing.assert_allclose(model.intercept, reference.intercept,
+                                   atol=1e-6)
+
+        # The one-standard-error rule picks a sparser model
+        model_1se = ElasticNetCV(alpha=0.5, n_lam=30, n_folds=5,
+                                 random_state=0)
+        model_1se.fit(x, y, tol=1e-10, rule="1se")
+        self.assertEqual(model_1se.lam, model.lam_1se)
+        self.assertLessEqual(np.count_nonzero(model_1se.coef),
+                             np.count_nonzero(model.coef))
+
+        # Parallel folds give the same result
+        model_par = ElasticNetCV(alpha=0.5, n_lam=30, n_folds=5,
+                                 random_state=0)
+        model_par.fit(x, y, tol=1e-10, n_jobs=2, backend="process")
+        np.testing.assert_allclose(model_par.cv_error, model.cv_error)
+        np.testing.assert_allclose(model_par.coef, model.coef)
+
+    def test_fold_standardization(self):
+        """Each fold's errors are those of an elastic net fitted to the
+        training observations alone.
+        """
+        rs = np.random.RandomState(5)
+        n, p = 120, 8
+        x = rs.normal(loc=3, scale=2, size=(n, p))
+        y = 1 + x[:, :3].dot([2, -1, 1]) + rs.normal(size=n)
+        test = np.arange(0, n, 4)
+        train = np.setdiff1d(np.arange(n), test)
+        lambdas = np.array([0.5, 0.1, 0.01])
+
+        # Make the held-out observations very different from the others
+        x[test] *= 5
+        xs = (x - x.mean(axis=0)) / x.std(axis=0)
+        y_std = y.std()
+        ys = (y - y.mean()) / y_std
+        errors = _enet_cv_fold(xs, ys, lambdas, 0.5, 1e-12, 10000, "naive",
+                               False, test)
+
+        for lam, error in zip(lambdas, errors):
+            model = ElasticNet(lam=lam, alpha=0.5)
+            model.fit(x[train], y[train], tol=1e-12, max_iter=10000,
+                      mode="naive")
+            mse = np.mean((y[test] - model.predict(x[test])) ** 2)
+            self.assertAlmostEqual(error * y_std ** 2, mse)
+
+
+if __name__ == "__main__":
+    unittest.main()
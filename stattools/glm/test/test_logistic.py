@@ -0,0 +1,262 @@
+"""Unit tests for the LogisticRegression class."""
+
+import itertools
+import unittest
+
+import numpy as np
+import scipy.sparse
+
+from stattools.glm import LogisticRegression
+from stattools.glm.glm import _StandardizedSparse
+from stattools.glm.logistic import CrossEntropyLoss
+from stattools.glm.logistic import SoftmaxCrossEntropyLoss
+from stattools.optimization import Adam
+from stattools.optimization import NewtonRaphson
+from stattools.regularization import ridge
+
+
+class _CountingArray(np.ndarray):
+    """Array counting its products x.dot(v) (not those of its transpose)."""
+
+    count = 0
+    design_shape = None
+
+    def dot(self, v):
+        if self.shape == _CountingArray.design_shape:
+            _CountingArray.count += 1
+        return np.asarray(self).dot(v)
+
+
+class TestLogisticRegression(unittest.TestCase):
+    def test_irls(self):
+        """IRLS gives the same estimates as Newton's method applied to the
+        loss function.
+        """
+        rs = np.random.RandomState(0)
+        n, p = 500, 5
+        x = rs.normal(size=(n, p))
+        logits = 0.5 + x[:, :3].dot([1, -2, 0.5])
+        y = (rs.uniform(size=n) < 1 / (1 + np.exp(-logits))).astype(int)
+
+        for reg, standardize in itertools.product((None, "l2"), (True, False)):
+            irls = LogisticRegression(reg=reg, penalty=0.01,
+                                      standardize=standardize)
+            irls.fit(x, y, tol=1e-12)
+            newton = LogisticRegression(reg=reg, penalty=0.01,
+                                        standardize=standardize)
+            newton.fit(x, y, NewtonRaphson(iterations=30))
+            np.testing.assert_allclose(irls.coef, newton.coef, atol=1e-8)
+            np.testing.assert_allclose(irls.intercept, newton.intercept,
+                                       atol=1e-8)
+
+        with self.assertRaises(ValueError):
+            LogisticRegression(reg="l1").fit(x, y, optimizer="irls")
+        with self.assertRaises(ValueError):
+            LogisticRegression().fit(x, y, optimizer="newton")
+
+    def test_separable(self):
+        """IRLS stays finite and classifies separable data perfectly."""
+        rs = np.random.RandomState(1)
+        x = np.concatenate((rs.normal(size=(50, 2)) + 3,
+                            rs.normal(size=(50, 2)) - 3))
+        y = np.repeat([1, 0], 50)
+
+        model = LogisticRegression().fit(x, y)
+        self.assertTrue(np.all(np.isfinite(model.coef)))
+        np.testing.assert_equal(model.predict(x), y)
+
+    def test_softmax_loss(self):
+        """The softmax cross entropy gradient, Hessian, and Hessian-vector
+        products agree with finite differences and with each other.
+        """
+        rs = np.random.RandomState(2)
+        n, p, k = 100, 3, 4
+        x = rs.normal(size=(n, p))
+        y = rs.randint(k, size=n)
+        loss = SoftmaxCrossEntropyLoss(x, y, k)
+        coef = rs.normal(size=p * k)
+        v = rs.normal(size=p * k)
+
+        eps = 1e-6
+        grad = [(loss(coef + eps * e) - loss(coef - eps * e)) / (2 * eps)
+                for e in np.identity(p * k)]
+        np.testing.assert_allclose(loss.grad(coef), grad, atol=1e-8)
+        value, grad = loss.value_and_grad(coef)
+        self.assertAlmostEqual(value, loss(coef))
+        np.testing.assert_allclose(grad, loss.grad(coef))
+        np.testing.assert_allclose(loss.hess(coef).dot(v), loss.hessp(coef, v))
+
+        loss = CrossEntropyLoss(x, y % 2)
+        coef, v = rs.normal(size=p), rs.normal(size=p)
+        np.testing.assert_allclose(loss.hess(coef).dot(v), loss.hessp(coef, v))
+
+    def test_multinomial(self):
+        """Multinomial logistic regression works with L-BFGS and the existing
+        optimizers, and reduces to binary logistic regression for two classes.
+        """
+        rs = np.random.RandomState(3)
+        n, p, k = 300, 4, 3
+        x = rs.normal(size=(n, p))
+        prob = np.exp(x.dot(2 * rs.normal(size=(p, k))))
+        prob /= prob.sum(axis=1, keepdims=True)
+        y = np.array(["abc"[rs.choice(k, p=q)] for q in prob])
+
+        lbfgs = LogisticRegression(reg="l2", penalty=1e-3, multinomial=True)
+        lbfgs.fit(x, y, tol=1e-10)
+        newton = LogisticRegression(reg="l2", penalty=1e-3, multinomial=True)
+        newton.fit(x, y, NewtonRaphson(iterations=30))
+        newton_cg = LogisticRegression(reg="l2", penalty=1e-3,
+                                       multinomial=True)
+        newton_cg.fit(x, y, "newton-cg", tol=1e-10)
+        np.testing.assert_allclose(newton_cg.predict_prob(x),
+                                   newton.predict_prob(x), atol=1e-6)
+        self.assertEqual(lbfgs.coef.shape, (p, k))
+        self.assertEqual(lbfgs.intercept.shape, (k,))
+        np.testing.assert_allclose(lbfgs.predict_prob(x),
+                                   newton.predict_prob(x), atol=1e-6)
+        np.testing.assert_allclose(lbfgs.predict_prob(x).sum(axis=1), 1)
+        self.assertGreater(np.mean(lbfgs.predict(x) == y), 0.7)
+
+        with self.assertRaises(ValueError):
+            LogisticRegression().fit(x, y)
+        with self.assertRaises(ValueError):
+            LogisticRegression(multinomial=True).fit(x, y, optimizer="irls")
+
+        y = (x[:, 0] + rs.normal(size=n) > 0).astype(int)
+        multinomial = LogisticRegression(multinomial=True)
+        multinomial.fit(x, y, tol=1e-10)
+        binary = LogisticRegression().fit(x, y, tol=1e-12)
+        np.testing.assert_allclose(multinomial.predict_prob(x),
+                                   binary.predict_prob(x), atol=1e-6)
+
+    def test_batch_loss(self):
+        """Mini-batch losses and gradients are the full ones restricted to
+        the batch, for dense and sparse explanatory variables.
+        """
+        rs = np.random.RandomState(4)
+        n, p, k = 60, 5, 3
+        x_sparse = scipy.sparse.random(n, p, density=0.3, random_state=rs,
+                                       format="csc")
+        x_std = _StandardizedSparse(x_sparse, rs.normal(size=p),
+                                    rs.uniform(1, 2, size=p))
+        x_dense = x_std.dot(np.identity(p))
+        y = rs.randint(k, size=n)
+        index = rs.choice(n, size=20, replace=False)
+
+        for x in (x_dense, x_sparse, x_std):
+            dense = x_dense if x is x_std else x
+            dense = dense.toarray() if scipy.sparse.issparse(dense) else dense
+            for loss, batch, coef in (
+                    (CrossEntropyLoss(x, y % 2),
+                     CrossEntropyLoss(dense[index], y[index] % 2),
+                     rs.normal(size=p)),
+                    (SoftmaxCrossEntropyLoss(x, y, k),
+                     SoftmaxCrossEntropyLoss(dense[index], y[index], k),
+                     rs.normal(size=p * k))):
+                self.assertAlmostEqual(loss(coef, index=index), batch(coef))
+                np.testing.assert_allclose(loss.grad(coef, index=index),
+                                           batch.grad(coef))
+                np.testing.assert_allclose(loss.grad(coef, index=slice(None)),
+                                           loss.grad(coef))
+
+    def test_stochastic(self):
+        """Mini-batch Adam approaches the maximum likelihood estimates."""
+        rs = np.random.RandomState(5)
+        n, p = 5000, 4
+        x = rs.normal(size=(n, p))
+        logits = 0.5 + x.dot([1, -1, 0.5, 0])
+        y = (rs.uniform(size=n) < 1 / (1 + np.exp(-logits))).astype(int)
+
+        irls = LogisticRegression(reg="l2", penalty=0.01).fit(x, y)
+        adam = Adam(rate=0.01, batch_size=50, epochs=20, schedule="inverse",
+                    decay=0.5, random_state=0)
+        model = LogisticRegression(reg="l2", penalty=0.01).fit(x, y, adam)
+        np.testing.assert_allclose(model.coef, irls.coef, atol=0.02)
+        np.testing.assert_allclose(model.intercept, irls.intercept, atol=0.02)
+
+    def test_fused_evaluation(self):
+        """The fused loss, gradient, and Hessian evaluations agree with the
+        separate ones and share one product with the design matrix.
+        """
+        rs = np.random.RandomState(6)
+        n, p = 100, 4
+        x = rs.normal(size=(n, p))
+        y = rs.randint(2, size=n)
+
+        for loss in (CrossEntropyLoss(x, y),
+                     ridge(penalty=0.1, loss=CrossEntropyLoss(x, y))):
+            coef = rs.normal(size=p)
+            value, grad = loss.value_and_grad(coef)
+            self.assertAlmostEqual(value, loss(coef))
+            np.testing.assert_allclose(grad, loss.grad(coef))
+            value, grad, hess = loss.value_grad_hess(coef)
+            self.assertAlmostEqual(value, loss(coef))
+            np.testing.assert_allclose(grad, loss.grad(coef))
+            np.testing.assert_allclose(hess, loss.hess(coef))
+
+        _CountingArray.design_shape = x.shape
+        loss = CrossEntropyLoss(x, y)
+        loss.x = x.view(_CountingArray)
+        coef = rs.normal(size=p)
+        loss(coef)
+        loss.grad(coef)
+        loss.hess(coef)
+        self.assertEqual(_CountingArray.count, 1)
+
+        # Modifying the coefficients in place invalidates the cache
+        coef += 1
+        self.assertAlmostEqual(loss(coef), CrossEntropyLoss(x, y)(coef))
+        self.assertEqual(_CountingArray.count, 2)
+
+        # Newton's method needs one product per iteration
+        _CountingArray.count = 0
+        newton = NewtonRaphson()
+        newton.optimize(x0=np.zeros(p), func=loss)
+        self.assertEqual(_CountingArray.count, newton.result.n_iter + 1)
+
+    def test_l1(self):
+        """The L1 penalty is minimized by the proximal gradient method, giving
+        coefficients that are exactly zero.
+        """
+        rs = np.random.RandomState(7)
+        n, p, penalty = 500, 20, 0.02
+        x = rs.normal(size=(n, p))
+        logits = x[:, :3].dot([2, -2, 1])
+        y = (rs.uniform(size=n) < 1 / (1 + np.exp(-logits))).astype(int)
+
+        model = LogisticRegression(reg="l1", penalty=penalty,
+                                   standardize=False, fit_intercept=False)
+        model.fit(x, y, tol=1e-9)
+        self.assertTrue(np.all(model.coef[:3] != 0))
+        self.assertGreater(np.sum(model.coef == 0), p // 2)
+
+        # Optimality conditions
+        grad = model.loss.smooth.grad(model.coef)
+        active = model.coef != 0
+        np.testing.assert_allclose(grad[active],
+                                   -penalty * np.sign(model.coef[active]),
+                                   atol=1e-6)
+        self.assertLessEqual(np.max(np.abs(grad[~active])), penalty)
+
+    def test_default_optimizer(self):
+        """IRLS is only the default for dense data with few features; sparse
+        data and many features default to L-BFGS.
+        """
+        rs = np.random.RandomState(8)
+        n, p = 500, 1000
+        x_sparse = scipy.sparse.random(n, p, density=0.01, random_state=rs,
+                                       format="csr")
+        x_wide = rs.normal(size=(n, 300))
+        x_narrow = x_wide[:, :5]
+        y = rs.randint(2, size=n)
+
+        for x, optimizer in ((x_sparse, "lbfgs"), (x_wide, "lbfgs"),
+                             (x_narrow, "irls")):
+            default = LogisticRegression(reg="l2", penalty=0.1).fit(x, y)
+            explicit = LogisticRegression(reg="l2", penalty=0.1)
+            explicit.fit(x, y, optimizer=optimizer)
+            np.testing.assert_array_equal(default.coef, explicit.coef)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,42 @@
 """Estimation and simulation for Gaussian mixture models."""
 
+import collections.abc
 import itertools
 import numbers
 
 import matplotlib.pyplot as plt
 import numpy as np
-import scipy.stats as st
+import scipy.linalg
+import scipy.special
 
 from ..cluster import KMeansCluster
 from ..generic import Classifier
+from ..utils import iter_batches
+from ..utils import parallel_map
+from ..utils import spawn_random_states
+from ..utils import validate_n_jobs
 from ..utils.validation import validate_bool
 from ..utils.validation import validate_float
 from ..utils.validation import validate_int
 from ..utils.validation import validate_sample
 
+# Memory budget (in bytes) for the blocks of intermediate values computed at
+# once for a chunk of observations in the EM algorithm
+_CHUNK_BYTES = 2 ** 25
+
+# Covariance structures of Gaussian mixture models, together with the shapes of
+# their compact covariance parameters given k and p:
+#   "full": a covariance matrix per component, shape (k, p, p),
+#   "diag": the diagonal of a covariance matrix per component, shape (k, p),
+#   "spherical": a variance per component, shape (k,),
+#   "tied": one covariance matrix for all components, shape (p, p).
+_COVARIANCE_TYPES = {
+    "full": lambda k, p: (k, p, p),
+    "diag": lambda k, p: (k, p),
+    "spherical": lambda k, p: (k,),
+    "tied": lambda k, p: (p, p),
+}
+
 
 class GaussianMixtureDensity(object):
     """Generate samples and other quantities from Gaussian mixture models.
@@ -40,8 +63,14 @@ class GaussianMixtureDensity(object):
     covs: np.ndarray
     weights: np.ndarray
 
-    # The Gaussian components as a list of frozen scipy.stats distributions
-    _components: list = None
+    # Cholesky factors of the covariance matrices, and the whitening maps of
+    # the components (see _whitening())
+    _chol: np.ndarray = None
+    _whitening: tuple = None
+
+    # Logarithms of the weights times the normalizing constants of the
+    # component densities
+    _log_norm: np.ndarray = None
 
     def __init__(self, means, covs=None, weights=None, random_state=None):
         """Initialize a GaussianMixtureGenerator.
@@ -150,10 +179,14 @@ class GaussianMixtureDensity(object):
         else:
             self.random_state = np.random.RandomState(random_state)
 
-        # Create the Gaussian component distributions
-        self._components = \
-            [st.multivariate_normal(mean=mean, cov=cov, seed=self.random_state)
-             for mean, cov in zip(self.means, self.covs)]
+        # Factorize the covariance matrices once
+        self._chol = _cholesky(self.covs)
+        self._whitening = _whitening(self.means, self._chol)
+        log_det = 2.0 * np.sum(
+            np.log(np.diagonal(self._chol, axis1=1, axis2=2)), axis=1)
+        with np.errstate(divide="ignore"):
+            self._log_norm = np.log(self.weights) \
+                - 0.5 * (log_det + self.p * np.log(2.0 * np.pi))
 
     def __call__(self, x):
         """Compute the Gaussian mixture model's density function.
@@ -171,7 +204,14 @@ class GaussianMixtureDensity(object):
             i-th row of x.
         """
         x = _validate_x(x=x, p=self.p)
-        return self.weights.dot([gauss.pdf(x) for gauss in self._components])
+        log_densities = _mahalanobis(x, self.means, self._chol,
+                                     self._whitening)
+        log_densities *= -0.5
+        log_densities += self._log_norm
+
+        # The mixture density underflows exactly when all the weighted
+        # component densities do, so no log-sum-exp shift is needed here
+        return np.exp(log_densities, out=log_densities).sum(axis=1)
 
     def plot(self, num=200, fill=True, ax=None, **kwargs):
         """Plot the Gaussian mixture density in the 1D and 2D cases.
@@ -250,19 +290,24 @@ class GaussianMixtureDensity(object):
         n = validate_int(n, "n", minimum=1)
         return_component = validate_bool(return_component, "return_component")
 
-        # Initialize arrays
-        if self.p == 1:
-            x = np.empty(shape=(n,), dtype=np.float_)
-        else:
-            x = np.empty(shape=(n, self.p), dtype=np.float)
-
-        # Choose which components to sample from
-        comp = self.random_state.choice(self.k, size=(n,), p=self.weights)
+        # Choose how many observations to sample from each component
+        counts = self.random_state.multinomial(n, self.weights)
+        comp = np.repeat(np.arange(self.k), counts)
 
+        # Transform standard normal observations by the Cholesky factor and
+        # mean of their component (a block of rows per component)
+        x = self.random_state.standard_normal(size=(n, self.p))
+        stops = np.cumsum(counts)
         for j in range(self.k):
-            # Sample from the j-th component
-            ind = (comp == j)
-            x[ind] = self._components[j].rvs(size=np.sum(ind))
+            block = x[stops[j] - counts[j]:stops[j]]
+            block[...] = block.dot(self._chol[j].T) + self.means[j]
+
+        # Shuffle the observations so that the components are mixed
+        ind = self.random_state.permutation(n)
+        x = x.take(ind, axis=0)
+        comp = comp.take(ind)
+        if self.p == 1:
+            x = x.ravel()
 
         if return_component:
             return x, comp
@@ -294,11 +339,15 @@ class GaussianMixture(Classifier):
     weights : numpy.ndarray
         Array of shape (k,) consisting of the mixture weights for each Gaussian
         component.
+    covariance_type : str
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
     random_state : numpy.random.RandomState
         The random number generator.
     scores : list
         List of lists consisting of the log-likelihood (score) at each iteration
         of the EM algorithm. There is one list for each run of the EM algorithm.
+        After online EM (see partial_fit()), there is a single list of the
+        average log-likelihood of each batch before the update it caused.
 
     References
     ----------
@@ -314,10 +363,23 @@ class GaussianMixture(Classifier):
     means: np.ndarray = None
     covs: np.ndarray = None
     weights: np.ndarray = None
+    covariance_type: str = "full"
     random_state: np.random.RandomState = None
     scores: list = None
 
-    def __init__(self, k, random_state=None):
+    # Covariance parameters in the compact form of the covariance type
+    _covs: np.ndarray = None
+
+    # Running sufficient statistics of online EM (see partial_fit()), and the
+    # number of batches they summarize
+    _stats: tuple = None
+    _n_batches: int = 0
+
+    # Reference point subtracted from the data in online EM to avoid
+    # cancellation in the second moments
+    _shift: np.ndarray = None
+
+    def __init__(self, k, random_state=None, covariance_type="full"):
         """Initialize a GMM by specifying the number of Gaussian components.
 
         Parameters
@@ -328,9 +390,22 @@ class GaussianMixture(Classifier):
             A numpy.random.RandomState object or a valid initializer for a
             numpy.random.RandomState object. To be used as the random number
             generator.
+        covariance_type : str, optional
+            Structure of the covariance matrices. One of
+                "full": each component has its own covariance matrix,
+                "diag": each component has its own diagonal covariance matrix,
+                "spherical": each component has its own multiple of the
+                    identity matrix as covariance matrix,
+                "tied": all components share one covariance matrix.
+            The restricted structures have fewer parameters and are cheaper to
+            fit: an EM iteration costs O(n * k * p) operations for "diag" and
+            "spherical" models instead of O(n * k * p^2) for "full" models.
         """
         # Validate parameters
         self.k = validate_int(k, "k", minimum=1)
+        if covariance_type not in _COVARIANCE_TYPES:
+            raise ValueError(f"Unknown covariance type: {covariance_type}")
+        self.covariance_type = covariance_type
 
         # Seed the RNG
         if isinstance(random_state, np.random.RandomState):
@@ -339,7 +414,7 @@ class GaussianMixture(Classifier):
             self.random_state = np.random.RandomState(random_state)
 
     def fit(self, x, repeats=5, tol=1e-6, iterations=None, init_repeats=30,
-            init_iter=10, kmc_kwargs=None):
+            init_iter=10, kmc_kwargs=None, n_jobs=1, backend="thread"):
         """Fit the Gaussian mixture model (i.e., estimate the parameters).
 
         Fitting is done using (potentially several runs of) the EM algorithm to
@@ -385,7 +460,19 @@ class GaussianMixture(Classifier):
         kmc_kwargs : dict, optional
             Dictionary of keyword arguments to pass to KMeansCluster.fit(). To
             be used when determining initial parameters for the EM algorithm by
-            k-means clustering.
+            k-means clustering. For example, {"init": "k-means||"} selects the
+            seeding of the k-means centers (k-means++ by default).
+        n_jobs : int or None, optional
+            Number of EM runs to perform in parallel. The short EM runs from
+            random cluster assignments are run in parallel first, then the
+            full EM runs. If negative, this counts backwards from the number of
+            CPUs (-1 means all CPUs). Each run draws from its own random number
+            generator spawned from `random_state`, so the result does not
+            depend on `n_jobs`.
+        backend : str, optional
+            Either "thread" or "process". The sample matrix is shared with the
+            workers without copying it in both cases. See
+            stattools.utils.parallel_map().
 
         Returns
         -------
@@ -410,21 +497,198 @@ class GaussianMixture(Classifier):
             kmc_kwargs = dict()
         elif not isinstance(kmc_kwargs, dict):
             raise TypeError("Parameter 'cluster_kwargs' must be a dict.")
+        n_jobs = validate_n_jobs(n_jobs)
+
+        # Single precision data is fitted in single precision
+        x = x.astype(_float_dtype(x), copy=False)
 
         # Get number of features
         self.p = x.shape[1]
 
         # Fit the model
-        self.means, self.covs, self.weights, self.scores = \
+        means, covs, weights, self.scores = \
             _gmm_fit(x, self.k, self.random_state, repeats, tol, iterations,
-                     init_repeats, init_iter, kmc_kwargs)
+                     init_repeats, init_iter, kmc_kwargs, self.covariance_type,
+                     n_jobs, backend)
+        self._set_param(means, covs, weights)
+        self._stats = None
 
-        # The classes are Gaussian components numbered 0, ..., k - 1
-        self.classes = np.arange(self.k)
+        self.fitted = True
+        return self
+
+    def fit_online(self, x, batch_size=1000, epochs=1, decay=0.6, offset=2.0):
+        """Fit the Gaussian mixture model using small batches of the data at a
+        time (online EM).
+
+        Only one batch needs to be in memory at a time, so the data can be
+        streamed from disk (e.g., a memory-mapped .npy file or a CSV reader).
+        See partial_fit() for the update made with each batch.
+
+        Parameters
+        ----------
+        x : array-like or iterator
+            Sample matrix of shape (n, p). This can be an array (including a
+            numpy.memmap) or an iterator of array-like chunks of rows. See
+            stattools.utils.iter_batches() for how each is split into batches.
+        batch_size : int, optional
+            Number of observations in each batch.
+        epochs : int, optional
+            Number of passes over the data. Must be 1 if `x` is an iterator,
+            since an iterator of chunks can only be consumed once.
+        decay : float, optional
+            Decay exponent of the step sizes. See partial_fit().
+        offset : float, optional
+            Offset of the step sizes. See partial_fit().
+
+        Returns
+        -------
+        This GaussianMixture instance.
+        """
+        # Validate parameters
+        batch_size = validate_int(batch_size, "batch_size", minimum=1)
+        epochs = validate_int(epochs, "epochs", minimum=1)
+        if epochs > 1 and isinstance(x, collections.abc.Iterator):
+            raise ValueError("Multiple epochs require an array of data.")
+
+        # Start from scratch
+        self._stats = None
+        self.fitted = False
+
+        for _ in range(epochs):
+            for batch in iter_batches(x, batch_size, self.random_state):
+                self.partial_fit(batch, decay=decay, offset=offset)
+
+        return self
+
+    def partial_fit(self, x, decay=0.6, offset=2.0):
+        """Update the Gaussian mixture model using one batch of observations.
+
+        This is one step of the online EM algorithm of Cappé & Moulines (2009).
+        The model keeps running averages of the sufficient statistics (the
+        responsibility-weighted counts, first moments, and second moments of
+        each component). The t-th batch (counting from 0) computes its
+        statistics from the responsibilities under the current parameters and
+        moves the running averages towards them with step size
+
+            (t + offset) ** (-decay),
+
+        and the parameters are then re-estimated from the running averages.
+        Unlike fit(), the covariance matrices are normalized by the weighted
+        counts (maximum likelihood estimates).
+
+        If the model has not been fitted yet, the first call starts from
+        scratch: the initial parameters are estimated from the batch by k-means
+        clustering, and the batch must contain at least k observations. The
+        first call after fit() instead starts from the fitted parameters, which
+        count as the sufficient statistics of one previous batch.
+
+        Parameters
+        ----------
+        x : array-like
+            Sample matrix of shape (n, p) of the batch.
+        decay : float, optional
+            Decay exponent of the step sizes, between 0.5 (exclusive) and 1
+            (inclusive). Smaller values forget old batches faster.
+        offset : float, optional
+            Nonnegative offset of the step sizes. Larger values make the first
+            steps smaller.
+
+        Returns
+        -------
+        This GaussianMixture instance.
+
+        References
+        ----------
+        Olivier Cappé and Eric Moulines. "On-line expectation-maximization
+            algorithm for latent data models". Journal of the Royal Statistical
+            Society: Series B. Vol. 71, No. 3 (2009), pp. 593--613.
+            DOI: https://doi.org/10.1111/j.1467-9868.2009.00698.x
+        """
+        # Validate parameters
+        x = validate_sample(x, n_dim=2)
+        decay = validate_float(decay, "decay", minimum=0.5, maximum=1)
+        if decay == 0.5:
+            raise ValueError("Parameter 'decay' must be greater than 0.5.")
+        offset = validate_float(offset, "offset", minimum=0)
+        if self.fitted and x.shape[1] != self.p:
+            raise ValueError(f"Data matrix has wrong number of columns: "
+                             f"expected {self.p}, found {x.shape[1]}")
+        if len(x) == 0:
+            return self
+        x = x.astype(_float_dtype(x), copy=False)
+
+        if self._stats is None:
+            if self.fitted:
+                # First batch after fit(): start from the fitted parameters
+                self._shift = self.weights.dot(self.means)
+                self._stats = _stats_from_param(self.means - self._shift,
+                                                self._covs, self.weights,
+                                                self.covariance_type)
+                self._n_batches = 1
+            else:
+                # First batch: initialize the parameters by k-means clustering
+                if len(x) < self.k:
+                    raise ValueError("The first batch must contain at least "
+                                     f"{self.k} observations.")
+                self.p = x.shape[1]
+                self._shift = np.mean(x, axis=0, dtype=np.float_)
+                self._n_batches = 0
+            self.scores = [[]]
+
+        if self._stats is None:
+            x = x - self._shift.astype(x.dtype)
+            means, covs, weights = \
+                _init_param_cluster(x, self.k, self.random_state,
+                                    self.covariance_type)
+        else:
+            x = x - self._shift.astype(x.dtype)
+            means = self.means - self._shift
+            covs, weights = self._covs, self.weights
+
+        # E step for the batch
+        log_densities = _log_densities(x, means, covs, self.covariance_type)
+        gamma, log_likelihood = _responsibility(log_densities, weights)
+        self.scores[-1].append(log_likelihood / len(x))
+
+        # Move the running sufficient statistics towards those of the batch
+        stats = _sufficient_stats(x, gamma, self.covariance_type)
+        if self._stats is None:
+            self._stats = stats
+        else:
+            step = (self._n_batches + offset) ** (-decay)
+            self._stats = tuple((1 - step) * s + step * s_batch
+                                for s, s_batch in zip(self._stats, stats))
+        self._n_batches += 1
+
+        # M step from the running sufficient statistics
+        means, covs, weights = _param_from_stats(*self._stats,
+                                                 self.covariance_type)
+        self._set_param(means + self._shift, covs, weights)
 
         self.fitted = True
         return self
 
+    def _set_param(self, means, covs, weights):
+        """Store fitted parameters.
+
+        Parameters
+        ----------
+        means : numpy.ndarray of shape (k, p)
+            Mean vectors.
+        covs : numpy.ndarray
+            Covariance parameters (see _COVARIANCE_TYPES for their shape).
+        weights : numpy.ndarray of shape (k,)
+            Mixture weights.
+        """
+        self.means = means.astype(np.float_)
+        self._covs = covs.astype(np.float_)
+        self.covs = _expand_covs(self._covs, self.covariance_type, self.k,
+                                 self.p)
+        self.weights = weights.astype(np.float_)
+
+        # The classes are Gaussian components numbered 0, ..., k - 1
+        self.classes = np.arange(self.k)
+
     def predict_prob(self, x):
         """Return probability that an observation belongs to each of the k
         components.
@@ -447,8 +711,10 @@ class GaussianMixture(Classifier):
 
         x = _validate_x(x, self.p)
 
-        densities = _densities(x, self.means, self.covs)
-        return _responsibility(densities, self.weights)
+        log_densities = _log_densities(x, self.means, self._covs,
+                                       self.covariance_type)
+        gamma, _ = _responsibility(log_densities, self.weights)
+        return gamma
 
     @property
     def pdf(self):
@@ -485,21 +751,24 @@ class GaussianMixture(Classifier):
 
         x = _validate_x(x=x, p=self.p)
 
-        densities = _densities(x, self.means, self.covs)
-        return _log_likelihood(self.weights, densities)
+        log_densities = _log_densities(x, self.means, self._covs,
+                                       self.covariance_type)
+        return _log_likelihood(self.weights, log_densities)
 
     @property
     def n_parameters(self):
         """Get the number of parameters of the Gaussian mixture model.
 
         Note that the number of parameters in a p-dimensional Gaussian mixture
-        model with k components is
+        model with k components and full covariance matrices is
 
             m = (k * p) + (k * p * (p + 1) / 2) + (k - 1)
 
         The first term comes from the k p-dimensional mean vectors, the second
         from the k p-by-p symmetric covariance matrices, and the third from the
-        k weights constrained to sum to 1.
+        k weights constrained to sum to 1. The second term is k * p for
+        diagonal covariance matrices, k for spherical covariance matrices, and
+        p * (p + 1) / 2 for a tied covariance matrix.
 
         Returns
         -------
@@ -507,8 +776,15 @@ class GaussianMixture(Classifier):
         """
         if not self.fitted:
             raise self.unfitted_exception
-        return (self.k * self.p + self.k * self.p * (self.p + 1) // 2
-                + self.k - 1)
+        if self.covariance_type == "full":
+            n_cov = self.k * self.p * (self.p + 1) // 2
+        elif self.covariance_type == "diag":
+            n_cov = self.k * self.p
+        elif self.covariance_type == "spherical":
+            n_cov = self.k
+        else:
+            n_cov = self.p * (self.p + 1) // 2
+        return self.k * self.p + n_cov + self.k - 1
 
     def aic(self, x, correction=True):
         """Compute the Akaike information criterion (AIC) or corrected Akaike
@@ -573,7 +849,8 @@ class GaussianMixture(Classifier):
 
 
 def _gmm_fit(x, k, random_state, repeats, tol, iterations, init_repeats,
-             init_iter, kmc_kwargs):
+             init_iter, kmc_kwargs, covariance_type="full", n_jobs=1,
+             backend="thread"):
     """Fit a Gaussian mixture model by repeatedly initializing the parameters
     and running the EM algorithm.
 
@@ -604,13 +881,19 @@ def _gmm_fit(x, k, random_state, repeats, tol, iterations, init_repeats,
         Dictionary of keyword arguments to pass to KMeansCluster.fit(). To be
         used when determining initial parameters for the EM algorithm by k-means
         clustering.
+    covariance_type : str, optional
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
+    n_jobs : int, optional
+        Number of EM runs to perform in parallel.
+    backend : str, optional
+        Either "thread" or "process" (see stattools.utils.parallel_map()).
 
     Returns
     -------
     means : numpy.ndarray of shape (k, p)
         Fitted mean vectors.
-    covs : numpy.ndarray of shape (k, p, p)
-        Fitted covariance matrices.
+    covs : numpy.ndarray
+        Fitted covariance parameters (see _COVARIANCE_TYPES for their shape).
     weights : numpy.ndarray of shape (k,)
         Fitted mixture weights.
     scores : list
@@ -620,48 +903,49 @@ def _gmm_fit(x, k, random_state, repeats, tol, iterations, init_repeats,
     # Get number of features
     n, p = x.shape
 
-    # Initialize arrays for the model parameters
-    means = np.empty(shape=(k, p), dtype=np.float_)
-    covs = np.empty(shape=(k, p, p), dtype=np.float_)
-    weights = np.empty(shape=(k,), dtype=np.float_)
-
-    # Repeat the EM algorithm with different initial parameter values. At
-    # the end, the parameter estimates yielding the highest log-likelihood
-    # will be selected.
-    scores = []
-    log_likelihood = -np.Inf
-    for r in range(repeats):
-        # Initialize the parameters of the model
-        if r == 0:
-            # First iteration: use k-means clustering to initialize
-            params = _init_param_cluster(x, k, random_state, **kmc_kwargs)
-        else:
-            # Subsequent iterations: use random cluster assignments
-            params = _init_param_random(x, k, random_state, init_repeats, tol,
-                                        init_iter)
-
-        # Fit the model using the EM algorithm
-        *params, log_likelihoods = _gmm_fit_em(x, *params, tol, iterations)
-        scores.append(log_likelihoods)
-
-        # Compare the new log-likelihood with the best log-likelihood so far
-        # and update the parameters if necessary
-        if log_likelihoods[-1] > log_likelihood:
-            log_likelihood = log_likelihoods[-1]
-            means, covs, weights = params
-
-        # Arrange the components so that the means are in increasing
-        # lexicographic order
-        ind = np.lexsort([means[:, p - i - 1] for i in range(p)])
-        means = means[ind]
+    # Initial parameters of the first EM run: use k-means clustering
+    init_params = [_init_param_cluster(x, k, random_state, covariance_type,
+                                       **kmc_kwargs)]
+
+    # Initial parameters of the subsequent EM runs: use the best of several
+    # short EM runs from random cluster assignments. All these short runs are
+    # independent, so they are done at once.
+    if repeats > 1:
+        tasks = [(rs,) for rs in
+                 spawn_random_states(random_state,
+                                     (repeats - 1) * init_repeats)]
+        runs = parallel_map(_init_param_random,
+                            (x, k, tol, init_iter, covariance_type), tasks,
+                            n_jobs=n_jobs, backend=backend)
+        for r in range(repeats - 1):
+            init_params.append(
+                _best_run(runs[r * init_repeats:(r + 1) * init_repeats]))
+
+    # Fit the model using the EM algorithm from each set of initial values
+    tasks = [(*params, tol, iterations, covariance_type)
+             for params in init_params]
+    runs = parallel_map(_gmm_fit_em, (x,), tasks, n_jobs=n_jobs,
+                        backend=backend)
+    scores = [log_likelihoods for *_, log_likelihoods in runs]
+
+    # The parameter estimates yielding the highest log-likelihood are selected
+    means, covs, weights = _best_run(
+        [(*params, log_likelihoods[-1]) for *params, log_likelihoods in runs])
+
+    # Arrange the components so that the means are in increasing lexicographic
+    # order
+    ind = np.lexsort([means[:, p - i - 1] for i in range(p)])
+    means = means[ind]
+    if covariance_type != "tied":
         covs = covs[ind]
-        weights = weights[ind]
+    weights = weights[ind]
 
     return means, covs, weights, scores
 
 
 def _init_param_cluster(x: np.ndarray, k: int,
-                        random_state: np.random.RandomState, **kwargs):
+                        random_state: np.random.RandomState,
+                        covariance_type: str = "full", **kwargs):
     """Initialize the parameters for Gaussian mixture model fitting using
     k-means clustering.
 
@@ -674,44 +958,37 @@ def _init_param_cluster(x: np.ndarray, k: int,
         Number of components in the Gaussian mixture model.
     random_state : numpy.random.RandomState
         Random number generator.
+    covariance_type : str, optional
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
     kwargs : dict
-        Additional keyword arguments to pass to the KMeansCluster model used to
-        partition the data.
+        Additional keyword arguments to pass to the fit() method of the
+        KMeansCluster model used to partition the data. In particular, `init`
+        chooses how the k-means centers are seeded. It defaults to "k-means++",
+        which usually makes a single k-means run sufficient.
 
     Returns
     -------
     means : numpy.ndarray of shape (k, p)
         Initial mean vectors for the EM algorithm.
-    covs : numpy.ndarray of shape (k, p, p)
-        Initial covariance matrices for the EM algorithm.
+    covs : numpy.ndarray
+        Initial covariance parameters for the EM algorithm (see
+        _COVARIANCE_TYPES for their shape).
     weights : numpy.ndarray of shape (k,)
         Initial weights for the EM algorithm.
     """
-    # n = number of observations, p = number of features
-    n, p = x.shape
-
-    # Initialize arrays for the parameters
-    means = np.empty(shape=(k, p), dtype=np.float_)
-    covs = np.empty(shape=(k, p, p), dtype=np.float_)
-    weights = np.empty(shape=(k,), dtype=np.float_)
-
     # Partition the data using k-means clustering
+    kwargs.setdefault("init", "k-means++")
     kmc = KMeansCluster(k=k, standardize=True, random_state=random_state)
     kmc.fit(x, **kwargs)
     clusters = kmc.predict(x=x)
 
     # Initialize the parameters using per-cluster estimates
-    for i in range(k):
-        means[i] = np.mean(x[clusters == i], axis=0)
-        covs[i] = np.cov(x[clusters == i], rowvar=False)
-        weights[i] = np.sum(clusters == i) / n
-
-    return means, covs, weights
+    return _update_param(x, np.eye(k)[clusters], covariance_type)
 
 
-def _init_param_random(x: np.ndarray, k: int,
-                       random_state: np.random.RandomState, repeats: int,
-                       tol: float, iterations: int):
+def _init_param_random(x: np.ndarray, k: int, tol: float, iterations: int,
+                       covariance_type: str,
+                       random_state: np.random.RandomState):
     """Initialize the parameters for Gaussian mixture model fitting using random
     cluster assignment and constrained EM iterations.
 
@@ -722,67 +999,78 @@ def _init_param_random(x: np.ndarray, k: int,
         features).
     k : int
         Number of components in the Gaussian mixture model.
-    random_state : numpy.random.RandomState
-        Random number generator.
-    repeats : int
-        Number of times to repeat the constrained EM iterations.
     tol : float
         Tolerance to determine early stopping of the EM algorithm (based on
         convergence of the log-likelihood).
     iterations: int
         Number of iterations of the EM algorithm.
+    covariance_type : str
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
+    random_state : numpy.random.RandomState
+        Random number generator.
 
     Returns
     -------
     means : numpy.ndarray of shape (k, p)
         Initial mean vectors for the EM algorithm.
-    covs : numpy.ndarray of shape (k, p, p)
-        Initial covariance matrices for the EM algorithm.
+    covs : numpy.ndarray
+        Initial covariance parameters for the EM algorithm (see
+        _COVARIANCE_TYPES for their shape).
     weights : numpy.ndarray of shape (k,)
         Initial weights for the EM algorithm.
+    log_likelihood : float
+        Log-likelihood of the initial parameters.
     """
-    # n = number of observations, p = number of features
-    n, p = x.shape
+    # n = number of observations
+    n = x.shape[0]
 
-    # Initialize arrays for the parameters
-    means = np.empty(shape=(k, p), dtype=np.float_)
-    covs = np.empty(shape=(k, p, p), dtype=np.float_)
-    weights = np.empty(shape=(k,), dtype=np.float_)
-
-    # Repeat the EM algorithm with different initial parameter values. At the
-    # end, the parameter estimates yielding the highest log-likelihood will be
-    # selected.
-    log_likelihood = -np.Inf
-    for _ in range(repeats):
-        # Randomly divide the data into k clusters
-        clusters = np.tile(np.arange(k), reps=(int(n / k) + 1))[:n]
-        random_state.shuffle(clusters)
-
-        # Initialize the parameters using per-cluster estimates
-        means_ = np.empty(shape=(k, p), dtype=np.float_)
-        covs_ = np.empty(shape=(k, p, p), dtype=np.float_)
-        weights_ = np.empty(shape=(k,), dtype=np.float_)
-        for i in range(k):
-            means_[i] = np.mean(x[clusters == i], axis=0)
-            covs_[i] = np.cov(x[clusters == i], rowvar=False)
-            weights_[i] = np.sum(clusters == i) / n
-
-        # Run the EM algorithm a restricted number of times and see which gives
-        # the best log-likelihood at the end.
-        *params, log_likelihoods = \
-            _gmm_fit_em(x, means_, covs_, weights_, tol, iterations)
-
-        # Compare the new log-likelihood with the best log-likelihood so far and
-        # update the parameters if necessary
-        if log_likelihoods[-1] > log_likelihood:
-            log_likelihood = log_likelihoods[-1]
-            means, covs, weights = params
+    # Randomly divide the data into k clusters
+    clusters = np.tile(np.arange(k), reps=(int(n / k) + 1))[:n]
+    random_state.shuffle(clusters)
 
-    return means, covs, weights
+    # Initialize the parameters using per-cluster estimates
+    params = _update_param(x, np.eye(k)[clusters], covariance_type)
+
+    # Run the EM algorithm a restricted number of times
+    *params, log_likelihoods = \
+        _gmm_fit_em(x, *params, tol, iterations, covariance_type)
+
+    return (*params, log_likelihoods[-1])
 
 
-def _densities(x: np.ndarray, means: np.ndarray, covs: np.ndarray):
-    """Compute the Gaussian density for each observation and each component.
+def _best_run(runs):
+    """Select the parameters with the highest log-likelihood.
+
+    Parameters
+    ----------
+    runs : list
+        List of tuples (means, covs, weights, log_likelihood).
+
+    Returns
+    -------
+    means : numpy.ndarray of shape (k, p)
+        Mean vectors of the best run.
+    covs : numpy.ndarray
+        Covariance parameters of the best run.
+    weights : numpy.ndarray of shape (k,)
+        Weights of the best run.
+    """
+    # Runs with undefined log-likelihoods are only selected if there is nothing
+    # else
+    best, log_likelihood = runs[0][:-1], -np.Inf
+    for *params, log_likelihood_ in runs:
+        if log_likelihood_ > log_likelihood:
+            best, log_likelihood = params, log_likelihood_
+    return tuple(best)
+
+
+def _log_densities(x: np.ndarray, means: np.ndarray, covs: np.ndarray,
+                   covariance_type: str = "full"):
+    """Compute the logarithm of the Gaussian density for each observation and
+    each component.
+
+    Working with log-densities avoids the underflow of the densities far from
+    the component means, which is common in higher dimensions.
 
     Parameters
     ----------
@@ -791,32 +1079,201 @@ def _densities(x: np.ndarray, means: np.ndarray, covs: np.ndarray):
         features).
     means : numpy.ndarray of shape (k, p)
         Mean vectors of the k Gaussian components.
-    covs : numpy.ndarray of shape (k, p, p)
-        Covariance matrices of the k Gaussian components.
+    covs : numpy.ndarray
+        Covariance parameters of the k Gaussian components (see
+        _COVARIANCE_TYPES for their shape).
+    covariance_type : str, optional
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
 
     Returns
     -------
-    densities : numpy.ndarray of shape (n, k)
-        The entry in the i-th row and j-th column is the density of the j-th
+    log_densities : numpy.ndarray of shape (n, k)
+        The entry in the i-th row and j-th column is the log-density of the j-th
         component at the i-th observation.
     """
-    # Compute matrix of normal density values
-    densities = np.empty(shape=(x.shape[0], means.shape[0]), dtype=np.float_)
-    for j in range(means.shape[0]):
-        densities[:, j] = st.multivariate_normal.pdf(x=x, mean=means[j],
-                                                     cov=covs[j])
-    return densities
+    p = x.shape[1]
+    dtype = _float_dtype(x)
+
+    if covariance_type == "full":
+        # Factorize each covariance matrix once
+        chol = _cholesky(covs)
+        log_det = 2.0 * np.sum(np.log(np.diagonal(chol, axis1=1, axis2=2)),
+                               axis=1)
+        maha = _mahalanobis(x, means, chol)
+    elif covariance_type == "tied":
+        # Whiten the data and the means with the common Cholesky factor
+        chol = _cholesky(covs[np.newaxis])[0]
+        log_det = 2.0 * np.sum(np.log(np.diag(chol)))
+        inv = scipy.linalg.solve_triangular(chol, np.eye(p), lower=True)
+        inv = inv.astype(dtype)
+        maha = _sq_distances(x.dot(inv.T), means.dot(inv.T))
+    else:
+        # Diagonal covariance matrices: weighted squared distances
+        if covariance_type == "spherical":
+            var = np.outer(covs, np.ones(p))
+        else:
+            var = covs
+        if np.any(var <= 0):
+            raise np.linalg.LinAlgError("Covariance matrix is not positive "
+                                        "definite.")
+        log_det = np.sum(np.log(var), axis=1)
+        prec = (1.0 / var).astype(dtype)
+        maha = (x * x).dot(prec.T)
+        maha -= 2.0 * x.dot((means * prec).T)
+        maha += np.sum(means * means * prec, axis=1)
+        np.maximum(maha, 0.0, out=maha)
+
+    maha += log_det + p * np.log(2.0 * np.pi)
+    maha *= -0.5
+    return maha
+
+
+def _sq_distances(x: np.ndarray, centers: np.ndarray):
+    """Compute squared Euclidean distances between observations and centers.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Sample matrix of shape (n, p).
+    centers : numpy.ndarray of shape (k, p)
+        Matrix of centers.
+
+    Returns
+    -------
+    sq_dist : numpy.ndarray of shape (n, k)
+        The entry in the i-th row and j-th column is the squared distance
+        between the i-th observation and the j-th center.
+    """
+    sq_dist = x.dot(centers.T)
+    sq_dist *= -2.0
+    sq_dist += np.sum(x * x, axis=1, keepdims=True)
+    sq_dist += np.sum(centers * centers, axis=1)
+    np.maximum(sq_dist, 0.0, out=sq_dist)
+    return sq_dist
 
 
-def _responsibility(densities: np.ndarray, weights: np.ndarray):
+def _cholesky(covs: np.ndarray) -> np.ndarray:
+    """Compute the lower triangular Cholesky factors of covariance matrices.
+
+    Parameters
+    ----------
+    covs : numpy.ndarray of shape (k, p, p)
+        Symmetric positive definite covariance matrices.
+
+    Returns
+    -------
+    chol : numpy.ndarray of shape (k, p, p)
+        Lower triangular matrices L such that L L^T is the corresponding
+        covariance matrix.
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError if a covariance matrix is not positive definite.
+    """
+    return np.linalg.cholesky(covs)
+
+
+def _mahalanobis(x: np.ndarray, means: np.ndarray, chol: np.ndarray,
+                 whitening=None):
+    """Compute squared Mahalanobis distances between each observation and each
+    component mean.
+
+    The inverse of each Cholesky factor is computed once by a triangular solve.
+    The whitened observations of all components then come from one matrix
+    product per chunk of rows.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Sample matrix of shape (n, p).
+    means : numpy.ndarray of shape (k, p)
+        Mean vectors of the k Gaussian components.
+    chol : numpy.ndarray of shape (k, p, p)
+        Lower triangular Cholesky factors of the covariance matrices.
+    whitening : tuple, optional
+        The value of _whitening(means, chol), if already computed.
+
+    Returns
+    -------
+    maha : numpy.ndarray of shape (n, k)
+        The entry in the i-th row and j-th column is the squared Mahalanobis
+        distance between the i-th observation and the j-th component.
+    """
+    n, p = x.shape
+    k = means.shape[0]
+    dtype = _float_dtype(x)
+
+    if whitening is None:
+        whitening = _whitening(means, chol)
+    w, b = (a.astype(dtype, copy=False) for a in whitening)
+
+    maha = np.empty(shape=(n, k), dtype=dtype)
+    chunk_size = _chunk_size(k * p)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        z = x[start:stop].dot(w)
+        z -= b
+        z = z.reshape(stop - start, k, p)
+        maha[start:stop] = np.einsum("ijk,ijk->ij", z, z)
+    return maha
+
+
+def _whitening(means: np.ndarray, chol: np.ndarray):
+    """Compute the whitening maps z = L^{-1} (x - mean) of Gaussian components,
+    stacked side by side so that x.dot(w) - b contains the whitened
+    observations of all components.
+
+    Parameters
+    ----------
+    means : numpy.ndarray of shape (k, p)
+        Mean vectors of the k Gaussian components.
+    chol : numpy.ndarray of shape (k, p, p)
+        Lower triangular Cholesky factors L of the covariance matrices.
+
+    Returns
+    -------
+    w : numpy.ndarray of shape (p, k * p)
+        Linear parts of the whitening maps.
+    b : numpy.ndarray of shape (k * p,)
+        Offsets of the whitening maps.
+    """
+    k, p = means.shape
+    identity = np.eye(p)
+    w = np.empty(shape=(p, k * p), dtype=np.float_)
+    b = np.empty(shape=(k * p,), dtype=np.float_)
+    for j in range(k):
+        inv = scipy.linalg.solve_triangular(chol[j], identity, lower=True)
+        w[:, j * p:(j + 1) * p] = inv.T
+        b[j * p:(j + 1) * p] = inv.dot(means[j])
+    return w, b
+
+
+def _chunk_size(width: int) -> int:
+    """Number of rows of a float array with `width` columns fitting in the
+    chunk memory budget.
+    """
+    row_bytes = np.dtype(np.float_).itemsize * max(width, 1)
+    return max(1, _CHUNK_BYTES // row_bytes)
+
+
+def _float_dtype(x: np.ndarray):
+    """Floating point type for computations with the data `x`: single precision
+    data stays in single precision, and anything else uses double precision.
+    """
+    return np.result_type(x.dtype, np.float32)
+
+
+def _responsibility(log_densities: np.ndarray, weights: np.ndarray):
     """Compute the responsibilities of a Gaussian mixture model.
 
     This is the E step of the EM algorithm for fitting Gaussian mixture models.
+    The responsibilities are normalized in log space, so they are well defined
+    even when every component density underflows.
 
     Parameters
     ----------
-    densities : numpy.ndarray of shape (n, k)
-        The entry in the i-th row and j-th column is the density of the j-th
+    log_densities : numpy.ndarray of shape (n, k)
+        The entry in the i-th row and j-th column is the log-density of the j-th
         component at the i-th observation.
     weights : numpy.ndarray of shape (k,)
         Mixture weights for each Gaussian component.
@@ -826,37 +1283,51 @@ def _responsibility(densities: np.ndarray, weights: np.ndarray):
     gamma : numpy.ndarray of shape (n, k)
         Matrix of responsibilities. Each column represents the responsibility
         of that Gaussian component for the data.
+    log_likelihood : float
+        The log-likelihood (a by-product of the normalization).
     """
-    # Compute matrix of responsibilities (Bishop (2006) calls it gamma)
-    gamma = weights * densities
-    gamma /= np.sum(gamma, axis=1, keepdims=True)
+    # Logarithm of the weighted densities
+    with np.errstate(divide="ignore"):
+        log_weights = np.log(weights).astype(log_densities.dtype)
+    log_gamma = log_densities + log_weights
+
+    # Normalize the rows to get the matrix of responsibilities (Bishop (2006)
+    # calls it gamma)
+    log_norm = scipy.special.logsumexp(log_gamma, axis=1, keepdims=True)
+    log_gamma -= log_norm
+    gamma = np.exp(log_gamma, out=log_gamma)
 
-    return gamma
+    return gamma, np.sum(log_norm, dtype=np.float_)
 
 
-def _log_likelihood(weights, densities):
+def _log_likelihood(weights, log_densities):
     """Compute the Gaussian mixture model log-likelihood.
 
     Parameters
     ----------
     weights : numpy.ndarray of shape (k,)
         Mixture weights for each Gaussian component.
-    densities : numpy.ndarray of shape (n, k)
-        The entry in the i-th row and j-th column is the density of the j-th
+    log_densities : numpy.ndarray of shape (n, k)
+        The entry in the i-th row and j-th column is the log-density of the j-th
         component at the i-th observation.
 
     Returns
     -------
     The log-likelihood.
     """
-    return np.sum(np.log(densities.dot(weights)))
+    log_norm = scipy.special.logsumexp(log_densities, axis=1, b=weights)
+    return np.sum(log_norm, dtype=np.float_)
 
 
-def _update_param(x: np.ndarray, gamma: np.ndarray):
+def _update_param(x: np.ndarray, gamma: np.ndarray,
+                  covariance_type: str = "full"):
     """Update the Gaussian mixture model parameters using the data and the
     responsibilities.
 
     This is the M step of the EM algorithm for fitting Gaussian mixture models.
+    The covariance matrices are normalized like numpy.cov() with the
+    responsibilities as `aweights`. A tied covariance matrix is the pooled
+    scatter of all the components divided by the sum of these normalizations.
 
     Parameters
     ----------
@@ -866,33 +1337,200 @@ def _update_param(x: np.ndarray, gamma: np.ndarray):
     gamma : numpy.ndarray of shape (n, k)
         Matrix of responsibilities. Each column represents the responsibility
         of that Gaussian component for the data.
+    covariance_type : str, optional
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
 
     Returns
     -------
     means : numpy.ndarray of shape (k, p)
         Updated mean vectors.
-    covs : numpy.ndarray of shape (k, p, p)
-        Updated covariance matrices.
+    covs : numpy.ndarray
+        Updated covariance parameters (see _COVARIANCE_TYPES for their shape).
     weights : numpy.ndarray of shape (k,)
         Updated weights.
     """
-    p = x.shape[1]
+    n, p = x.shape
     k = gamma.shape[1]
+    dtype = _float_dtype(x)
+
+    # Sums of the responsibilities and of their squares for each component
+    nk = np.sum(gamma, axis=0, dtype=np.float_)
+    nk2 = np.sum(gamma ** 2, axis=0, dtype=np.float_)
+    norm = nk - nk2 / nk
+
+    means = gamma.T.dot(x) / nk[:, np.newaxis]
+
+    if covariance_type in ("full", "tied"):
+        # Weighted scatter matrix of each component. One matrix product per
+        # component keeps the work in BLAS without an (n, k, p) intermediate.
+        covs = np.empty(shape=(k, p, p), dtype=dtype)
+        for j in range(k):
+            centered = x - means[j]
+            covs[j] = (centered * gamma[:, j, np.newaxis]).T.dot(centered)
+        if covariance_type == "full":
+            covs /= norm[:, np.newaxis, np.newaxis]
+        else:
+            covs = np.sum(covs, axis=0) / np.sum(norm)
+    else:
+        # Weighted variances of each feature for each component
+        covs = np.empty(shape=(k, p), dtype=dtype)
+        for j in range(k):
+            centered = x - means[j]
+            covs[j] = gamma[:, j].dot(centered * centered)
+        covs /= norm[:, np.newaxis]
+        if covariance_type == "spherical":
+            covs = np.mean(covs, axis=1)
+
+    weights = nk / n
 
-    means = np.empty(shape=(k, p), dtype=np.float_)
-    covs = np.zeros(shape=(k, p, p), dtype=np.float_)
-    for j in range(k):
-        responsibility = gamma.T[j].reshape(-1)
-        means[j] = np.average(x, axis=0, weights=responsibility)
-        covs[j] = np.cov(x, rowvar=False, aweights=responsibility)
+    return means, covs, weights
+
+
+def _sufficient_stats(x: np.ndarray, gamma: np.ndarray,
+                      covariance_type: str):
+    """Compute the average sufficient statistics of a Gaussian mixture model
+    over a sample.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Sample matrix of shape (n, p) (n=number of observations, p=number of
+        features).
+    gamma : numpy.ndarray of shape (n, k)
+        Matrix of responsibilities.
+    covariance_type : str
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
+
+    Returns
+    -------
+    s0 : numpy.ndarray of shape (k,)
+        Average responsibility of each component.
+    s1 : numpy.ndarray of shape (k, p)
+        Average responsibility-weighted observation of each component.
+    s2 : numpy.ndarray
+        Average responsibility-weighted outer products of the observations,
+        of shape (k, p, p), for "full" and "tied" models, or their diagonals,
+        of shape (k, p), for "diag" and "spherical" models.
+    """
+    n, p = x.shape
+    k = gamma.shape[1]
+
+    s0 = np.sum(gamma, axis=0, dtype=np.float_) / n
+    s1 = gamma.T.dot(x).astype(np.float_) / n
+    if covariance_type in ("full", "tied"):
+        s2 = np.empty(shape=(k, p, p), dtype=np.float_)
+        for j in range(k):
+            s2[j] = (x * gamma[:, j, np.newaxis]).T.dot(x)
+    else:
+        s2 = gamma.T.dot(x * x).astype(np.float_)
+    s2 /= n
+
+    return s0, s1, s2
 
-    weights = np.mean(gamma, axis=0)
+
+def _param_from_stats(s0: np.ndarray, s1: np.ndarray, s2: np.ndarray,
+                      covariance_type: str):
+    """Compute maximum likelihood Gaussian mixture model parameters from
+    average sufficient statistics.
+
+    Parameters
+    ----------
+    s0, s1, s2 : numpy.ndarray
+        Average sufficient statistics (see _sufficient_stats()).
+    covariance_type : str
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
+
+    Returns
+    -------
+    means : numpy.ndarray of shape (k, p)
+        Mean vectors.
+    covs : numpy.ndarray
+        Covariance parameters (see _COVARIANCE_TYPES for their shape).
+    weights : numpy.ndarray of shape (k,)
+        Mixture weights.
+    """
+    means = s1 / s0[:, np.newaxis]
+    if covariance_type == "full":
+        covs = s2 / s0[:, np.newaxis, np.newaxis]
+        covs -= np.einsum("ij,ik->ijk", means, means)
+    elif covariance_type == "tied":
+        covs = np.sum(s2, axis=0) - np.einsum("i,ij,ik->jk", s0, means, means)
+        covs /= np.sum(s0)
+    else:
+        covs = s2 / s0[:, np.newaxis] - means * means
+        if covariance_type == "spherical":
+            covs = np.mean(covs, axis=1)
+    weights = s0 / np.sum(s0)
 
     return means, covs, weights
 
 
+def _stats_from_param(means: np.ndarray, covs: np.ndarray,
+                      weights: np.ndarray, covariance_type: str):
+    """Compute average sufficient statistics from which _param_from_stats()
+    recovers given Gaussian mixture model parameters.
+
+    Parameters
+    ----------
+    means : numpy.ndarray of shape (k, p)
+        Mean vectors.
+    covs : numpy.ndarray
+        Covariance parameters (see _COVARIANCE_TYPES for their shape).
+    weights : numpy.ndarray of shape (k,)
+        Mixture weights.
+    covariance_type : str
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
+
+    Returns
+    -------
+    s0, s1, s2 : numpy.ndarray
+        Average sufficient statistics (see _sufficient_stats()).
+    """
+    s0 = np.array(weights, dtype=np.float_)
+    s1 = s0[:, np.newaxis] * means
+    if covariance_type in ("full", "tied"):
+        s2 = covs + np.einsum("ij,ik->ijk", means, means)
+        s2 *= s0[:, np.newaxis, np.newaxis]
+    else:
+        if covariance_type == "spherical":
+            covs = covs[:, np.newaxis]
+        s2 = s0[:, np.newaxis] * (covs + means * means)
+
+    return s0, s1, s2
+
+
+def _expand_covs(covs: np.ndarray, covariance_type: str, k: int, p: int):
+    """Expand compact covariance parameters into full covariance matrices.
+
+    Parameters
+    ----------
+    covs : numpy.ndarray
+        Covariance parameters (see _COVARIANCE_TYPES for their shape).
+    covariance_type : str
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
+    k : int
+        Number of components.
+    p : int
+        Number of features.
+
+    Returns
+    -------
+    covs : numpy.ndarray of shape (k, p, p)
+        Covariance matrix of each component.
+    """
+    if covariance_type == "full":
+        return covs
+    elif covariance_type == "diag":
+        return covs[:, :, np.newaxis] * np.eye(p)
+    elif covariance_type == "spherical":
+        return covs[:, np.newaxis, np.newaxis] * np.eye(p)
+    else:
+        return np.tile(covs, (k, 1, 1))
+
+
 def _gmm_fit_em(x: np.ndarray, means: np.ndarray, covs: np.ndarray,
-                weights: np.ndarray, tol: float, iterations: int):
+                weights: np.ndarray, tol: float, iterations: int,
+                covariance_type: str = "full"):
     """Perform the Gaussian mixture model EM algorithm given initial parameters.
 
     Parameters
@@ -902,8 +1540,9 @@ def _gmm_fit_em(x: np.ndarray, means: np.ndarray, covs: np.ndarray,
         features).
     means : numpy.ndarray of shape (k, p)
         Initial mean vectors for the EM algorithm.
-    covs : numpy.ndarray of shape (k, p, p)
-        Initial covariance matrices for the EM algorithm.
+    covs : numpy.ndarray
+        Initial covariance parameters for the EM algorithm (see
+        _COVARIANCE_TYPES for their shape).
     weights : numpy.ndarray of shape (k,)
         Initial weights for the EM algorithm.
     tol : float
@@ -914,13 +1553,15 @@ def _gmm_fit_em(x: np.ndarray, means: np.ndarray, covs: np.ndarray,
         Maximum number of iterations to perform. If None, no maximum number is
         imposed and the algorithm will continue running until the stopping
         criterion determined by `tol` is satisfied.
+    covariance_type : str, optional
+        Structure of the covariance matrices (see _COVARIANCE_TYPES).
 
     Returns
     -------
     means : numpy.ndarray of shape (k, p)
         Final mean vectors.
-    covs : numpy.ndarray of shape (k, p, p)
-        Final covariance matrices.
+    covs : numpy.ndarray
+        Final covariance parameters.
     weights : numpy.ndarray of shape (k,)
         Final weights.
     log_likelihoods : list
@@ -929,9 +1570,9 @@ def _gmm_fit_em(x: np.ndarray, means: np.ndarray, covs: np.ndarray,
     """
     log_likelihoods = []
 
-    # Compute initial log likelihood
-    densities = _densities(x, means, covs)
-    log_likelihood = _log_likelihood(weights, densities)
+    # Compute initial responsibilities and log likelihood
+    log_densities = _log_densities(x, means, covs, covariance_type)
+    gamma, log_likelihood = _responsibility(log_densities, weights)
     log_likelihoods.append(log_likelihood)
 
     # EM algorithm
@@ -939,15 +1580,12 @@ def _gmm_fit_em(x: np.ndarray, means: np.ndarray, covs: np.ndarray,
     for _ in counter:
         old_log_likelihood = log_likelihood
 
-        # E step
-        gamma = _responsibility(densities, weights)
-
         # M step
-        means, covs, weights = _update_param(x, gamma)
+        means, covs, weights = _update_param(x, gamma, covariance_type)
 
-        # Compute the new log-likelihood
-        densities = _densities(x, means, covs)
-        log_likelihood = _log_likelihood(weights, densities)
+        # E step, which also gives the new log-likelihood
+        log_densities = _log_densities(x, means, covs, covariance_type)
+        gamma, log_likelihood = _responsibility(log_densities, weights)
         log_likelihoods.append(log_likelihood)
 
         # Check for convergence
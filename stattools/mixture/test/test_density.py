@@ -1,11 +1,18 @@
 """Unit tests for stattools.mixture.gaussian."""
 
+import os
+import tempfile
 import unittest
 from itertools import product
 
 import numpy as np
 
-from stattools.mixture import GaussianMixtureDensity
+import scipy.stats as st
+
+from stattools.mixture import GaussianMixture, GaussianMixtureDensity
+from stattools.mixture.gaussian import _expand_covs
+from stattools.mixture.gaussian import _log_densities, _update_param
+from stattools.mixture.gaussian import _param_from_stats, _stats_from_param
 
 
 class TestGaussianMixtureDensity(unittest.TestCase):
@@ -61,6 +68,226 @@ class TestGaussianMixtureDensity(unittest.TestCase):
             gmd = GaussianMixtureDensity(means=means, covs=covs)
             np.testing.assert_equal(gmd.covs, covs)
 
+    def test_pdf(self):
+        """Compare the density with a direct computation."""
+        rs = np.random.RandomState(0)
+        k, p = 3, 2
+        means = rs.normal(scale=3, size=(k, p))
+        a = rs.normal(size=(k, p, p))
+        covs = np.matmul(a, a.transpose(0, 2, 1)) + np.eye(p)
+        weights = np.array([0.2, 0.3, 0.5])
+        gmd = GaussianMixtureDensity(means=means, covs=covs, weights=weights)
+
+        x = rs.normal(scale=3, size=(1000, p))
+        pdf = sum(w * st.multivariate_normal.pdf(x, mean=m, cov=c)
+                  for m, c, w in zip(means, covs, weights))
+        np.testing.assert_allclose(gmd(x), pdf, rtol=1e-10)
+
+    def test_sample(self):
+        """Check the moments of samples of each component."""
+        means = np.array([[-10.0, 0.0], [10.0, 5.0]])
+        covs = np.array([[[2.0, 0.5], [0.5, 1.0]], np.eye(2)])
+        gmd = GaussianMixtureDensity(means=means, covs=covs,
+                                     weights=[0.25, 0.75], random_state=0)
+        x, comp = gmd.sample(n=20000, return_component=True)
+        self.assertEqual(x.shape, (20000, 2))
+        self.assertAlmostEqual(np.mean(comp), 0.75, delta=0.01)
+
+        # The observations are shuffled together with their components
+        self.assertFalse(np.all(np.diff(comp) >= 0))
+        for j in range(2):
+            np.testing.assert_allclose(np.mean(x[comp == j], axis=0),
+                                       means[j], atol=0.05)
+            np.testing.assert_allclose(np.cov(x[comp == j], rowvar=False),
+                                       covs[j], atol=0.1)
+
+        # One-dimensional mixtures give vectors of observations
+        gmd = GaussianMixtureDensity(means=[0, 1], random_state=0)
+        self.assertEqual(gmd.sample(n=10).shape, (10,))
+
+
+class TestGaussianMixtureEM(unittest.TestCase):
+    def test_em_steps(self):
+        """Compare the vectorized E and M steps with direct computations."""
+        rs = np.random.RandomState(0)
+        n, p, k = 500, 3, 4
+        x = rs.normal(loc=10, size=(n, p))
+        means = rs.normal(size=(k, p))
+        a = rs.normal(size=(k, p, p))
+        covs = np.matmul(a, a.transpose(0, 2, 1)) + np.eye(p)
+
+        log_densities = _log_densities(x, means, covs)
+        for j in range(k):
+            log_pdf = st.multivariate_normal.logpdf(x, mean=means[j],
+                                                    cov=covs[j])
+            np.testing.assert_allclose(log_densities[:, j], log_pdf,
+                                       rtol=1e-10)
+
+        gamma = rs.dirichlet(np.ones(k), size=n)
+        means, covs, weights = _update_param(x, gamma)
+        for j in range(k):
+            np.testing.assert_allclose(
+                means[j], np.average(x, axis=0, weights=gamma[:, j]))
+            np.testing.assert_allclose(
+                covs[j], np.cov(x, rowvar=False, aweights=gamma[:, j]))
+        np.testing.assert_allclose(weights, np.mean(gamma, axis=0))
+
+    def test_covariance_types(self):
+        """Restricted covariance structures in the E and M steps."""
+        rs = np.random.RandomState(0)
+        n, p, k = 300, 3, 4
+        x = rs.normal(loc=5, size=(n, p))
+        gamma = rs.dirichlet(np.ones(k), size=n)
+        _, covs_full, _ = _update_param(x, gamma, "full")
+
+        expected = {
+            "full": covs_full,
+            "diag": np.diagonal(covs_full, axis1=1, axis2=2),
+            "spherical": np.mean(np.diagonal(covs_full, axis1=1, axis2=2),
+                                 axis=1),
+        }
+        for covariance_type, covs in expected.items():
+            means, covs_, _ = _update_param(x, gamma, covariance_type)
+            np.testing.assert_allclose(covs_, covs)
+
+            log_densities = _log_densities(x, means, covs_, covariance_type)
+            covs_ = _expand_covs(covs_, covariance_type, k, p)
+            for j in range(k):
+                log_pdf = st.multivariate_normal.logpdf(x, mean=means[j],
+                                                        cov=covs_[j])
+                np.testing.assert_allclose(log_densities[:, j], log_pdf)
+
+        # With hard assignments, the tied covariance matrix is the pooled
+        # within-cluster covariance matrix
+        clusters = np.arange(n) % k
+        means, covs, _ = _update_param(x, np.eye(k)[clusters], "tied")
+        pooled = sum((x[clusters == j] - means[j]).T.dot(
+            x[clusters == j] - means[j]) for j in range(k)) / (n - k)
+        np.testing.assert_allclose(covs, pooled)
+
+        n_parameters = {"full": 29, "diag": 20, "spherical": 14, "tied": 17}
+        for covariance_type, m in n_parameters.items():
+            gmm = GaussianMixture(k=3, random_state=0,
+                                  covariance_type=covariance_type)
+            gmm.fit(x, repeats=1)
+            self.assertEqual(gmm.n_parameters, m)
+            self.assertEqual(gmm.covs.shape, (3, p, p))
+
+        with self.assertRaises(ValueError):
+            GaussianMixture(k=3, covariance_type="banded")
+
+    def test_log_space(self):
+        """Responsibilities and log-likelihoods far from every component, where
+        all the densities underflow.
+        """
+        rs = np.random.RandomState(0)
+        p = 50
+        x = rs.normal(size=(200, p))
+        gmm = GaussianMixture(k=2, random_state=rs).fit(x, repeats=1)
+
+        x_far = x + 100
+        log_densities = np.column_stack([
+            st.multivariate_normal.logpdf(x_far, mean=gmm.means[j],
+                                          cov=gmm.covs[j])
+            for j in range(gmm.k)])
+        self.assertTrue(np.all(np.exp(log_densities) == 0))
+
+        prob = gmm.predict_prob(x_far)
+        self.assertTrue(np.all(np.isfinite(prob)))
+        np.testing.assert_allclose(prob.sum(axis=1), 1)
+
+        ll = np.sum(np.logaddexp(np.log(gmm.weights[0]) + log_densities[:, 0],
+                                 np.log(gmm.weights[1]) + log_densities[:, 1]))
+        self.assertAlmostEqual(gmm.log_likelihood(x_far) / ll, 1)
+        self.assertTrue(np.isfinite(gmm.bic(x_far)))
+
+    def test_parallel_fit(self):
+        """The fitted parameters do not depend on the number of workers."""
+        rs = np.random.RandomState(0)
+        x = np.concatenate([rs.normal(loc=-3, size=(200, 2)),
+                            rs.normal(loc=3, size=(200, 2))])
+        fit_kwargs = dict(repeats=3, init_repeats=4, iterations=20)
+        gmm = GaussianMixture(k=2, random_state=1).fit(x, **fit_kwargs)
+        for n_jobs, backend in product((2, -1), ("thread", "process")):
+            gmm_ = GaussianMixture(k=2, random_state=1)
+            gmm_.fit(x, n_jobs=n_jobs, backend=backend, **fit_kwargs)
+            np.testing.assert_allclose(gmm_.means, gmm.means)
+            np.testing.assert_allclose(gmm_.covs, gmm.covs)
+            np.testing.assert_allclose(gmm_.weights, gmm.weights)
+            self.assertEqual(len(gmm_.scores), 3)
+            for scores, scores_ in zip(gmm.scores, gmm_.scores):
+                np.testing.assert_allclose(scores_, scores)
+
+    def test_online(self):
+        """Online EM from arrays, memory-mapped arrays, lists, and chunk
+        iterators.
+        """
+        rs = np.random.RandomState(0)
+        x = np.concatenate([rs.normal(loc=-5, size=(3000, 2)),
+                            rs.normal(loc=5, scale=2, size=(3000, 2))])
+        rs.shuffle(x)
+        gmm = GaussianMixture(k=2, random_state=0).fit(x, repeats=1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "x.npy")
+            np.save(filename, x)
+            sources = (lambda: x,
+                       lambda: np.load(filename, mmap_mode="r"),
+                       lambda: x.tolist(),
+                       lambda: iter(np.array_split(x, 6)))
+            for source, covariance_type in product(sources, ("full", "diag")):
+                gmm_ = GaussianMixture(k=2, random_state=0,
+                                       covariance_type=covariance_type)
+                gmm_.fit_online(source(), batch_size=250)
+                np.testing.assert_allclose(gmm_.means, gmm.means, atol=0.1)
+                np.testing.assert_allclose(gmm_.weights, gmm.weights,
+                                           atol=0.02)
+                self.assertEqual(len(gmm_.scores[0]), 24)
+
+        # Further batches keep updating the model
+        gmm_.partial_fit(x[:100])
+        self.assertEqual(len(gmm_.scores[0]), 25)
+        with self.assertRaises(ValueError):
+            gmm_.partial_fit(x[:100, :1])
+
+    def test_partial_fit_after_fit(self):
+        """Online EM after fit() continues from the fitted model."""
+        rs = np.random.RandomState(1)
+        x = np.concatenate([rs.normal(loc=0, size=(1000, 2)),
+                            rs.normal(loc=5, size=(1000, 2))])
+        rs.shuffle(x)
+
+        for covariance_type in ("full", "diag", "spherical", "tied"):
+            gmm = GaussianMixture(k=2, random_state=0,
+                                  covariance_type=covariance_type)
+            gmm.fit(x, repeats=1)
+            means = gmm.means.copy()
+
+            # The fitted parameters are recovered from their statistics
+            stats = _stats_from_param(gmm.means, gmm._covs, gmm.weights,
+                                      covariance_type)
+            for param, param_ in zip(_param_from_stats(*stats,
+                                                       covariance_type),
+                                     (gmm.means, gmm._covs, gmm.weights)):
+                np.testing.assert_allclose(param, param_, atol=1e-10)
+
+            gmm.partial_fit(x[:50])
+            np.testing.assert_allclose(gmm.means, means, atol=0.5)
+            self.assertEqual(len(gmm.scores), 1)
+            self.assertEqual(len(gmm.scores[0]), 1)
+
+    def test_single_precision(self):
+        """Fitting single precision data."""
+        rs = np.random.RandomState(0)
+        x = np.concatenate([rs.normal(loc=-5, size=(500, 3)),
+                            rs.normal(loc=5, size=(500, 3))])
+        gmm64 = GaussianMixture(k=2, random_state=0).fit(x, repeats=1)
+        gmm32 = GaussianMixture(k=2, random_state=0).fit(x.astype(np.float32),
+                                                         repeats=1)
+        self.assertEqual(gmm32.means.dtype, np.float_)
+        np.testing.assert_allclose(gmm32.means, gmm64.means, atol=1e-3)
+        np.testing.assert_allclose(gmm32.covs, gmm64.covs, atol=1e-3)
+        np.testing.assert_allclose(gmm32.weights, gmm64.weights, atol=1e-4)
 
 
 if __name__ == "__main__":
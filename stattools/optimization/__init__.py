@@ -2,4 +2,10 @@
 
 from .base import Optimizer
 from .gradient_descent import GradientDescent
+from .lbfgs import LBFGS
+from .newton_cg import NewtonCG
 from .newton_raphson import NewtonRaphson
+from .proximal import ProximalGradient
+from .stochastic import AdaGrad
+from .stochastic import Adam
+from .stochastic import SGD
@@ -1,6 +1,10 @@
-"""Defines the Optimizer abstract base class."""
+"""Defines the Optimizer abstract base class and the OptimizationResult
+class."""
 
 import abc
+import time
+
+import numpy as np
 
 
 class Optimizer(metaclass=abc.ABCMeta):
@@ -9,8 +13,243 @@ class Optimizer(metaclass=abc.ABCMeta):
     Subclasses should have an `__init__` method which sets the optimzation
     algorithm parameters and a `optimize` method that accepts an objective
     function, an initial optimizer guess, and other optional parameters.
+
+    Properties
+    ----------
+    result : OptimizationResult
+        Summary of the last run of `optimize`.
     """
 
+    result = None
+
     @abc.abstractmethod
     def optimize(self, *args, **kwargs):
         pass
+
+
+class OptimizationResult(object):
+    """Summary of a run of an optimization algorithm.
+
+    Properties
+    ----------
+    x : numpy.ndarray
+        The approximate minimizer.
+    converged : bool
+        Indicates whether a stopping criterion other than the maximum number
+        of iterations was met.
+    message : str
+        Reason the algorithm stopped.
+    n_iter : int
+        Number of iterations performed.
+    n_fev : int
+        Number of objective function evaluations.
+    n_gev : int
+        Number of gradient evaluations.
+    n_hev : int
+        Number of Hessian (or Hessian-vector product) evaluations.
+    grad_norm : float
+        Largest absolute value of the gradient at `x` (NaN if the final
+        gradient was not computed).
+    iteration_times : numpy.ndarray
+        Wall time (in seconds) of each iteration.
+    trace : dict or None
+        If the optimizer was run with trace=True, a dictionary of arrays with
+        one row per iteration (the first row is the initial guess): "x" (the
+        parameter), "f" (the objective function value), and "grad_norm" (the
+        largest absolute value of the gradient). Otherwise None.
+    """
+
+    def __init__(self, x, converged, message, n_iter, n_fev, n_gev, n_hev,
+                 grad_norm, iteration_times, trace=None):
+        self.x = x
+        self.converged = converged
+        self.message = message
+        self.n_iter = n_iter
+        self.n_fev = n_fev
+        self.n_gev = n_gev
+        self.n_hev = n_hev
+        self.grad_norm = grad_norm
+        self.iteration_times = iteration_times
+        self.trace = trace
+
+    def __repr__(self):
+        return (f"OptimizationResult(converged={self.converged}, "
+                f"message={self.message!r}, n_iter={self.n_iter}, "
+                f"n_fev={self.n_fev}, n_gev={self.n_gev}, n_hev={self.n_hev}, "
+                f"grad_norm={self.grad_norm:.3g})")
+
+
+class _Monitor(object):
+    """Count function evaluations, time iterations, and optionally trace the
+    iterates of an optimization run.
+
+    The trace is written into arrays preallocated for the maximum number of
+    iterations, so tracing costs one array assignment per iteration (plus an
+    objective function evaluation if the algorithm does not compute it).
+    """
+
+    def __init__(self, func, grad=None, hess=None, value_and_grad=None,
+                 value_grad_hess=None, args=(), kwargs=None, iterations=0,
+                 trace=False, x0=None):
+        """Initialize a monitor.
+
+        Parameters
+        ----------
+        func, grad, hess : callable
+            The objective function and its derivatives (if needed).
+        value_and_grad, value_grad_hess : callable, optional
+            Functions evaluating the objective function together with its
+            derivatives (e.g., sharing the linear predictor of a loss
+            function). If None, the separate functions are used.
+        args : sequence, optional
+            Extra positional arguments for `func`, `grad`, and `hess`.
+        kwargs : dict, optional
+            Extra keyword arguments for `func`, `grad`, and `hess`.
+        iterations : int
+            Maximum number of iterations.
+        trace : bool, optional
+            Indicates whether to record the iterates.
+        x0 : array-like, optional
+            Initial guess (used to allocate the trace).
+        """
+        self._func, self._grad, self._hess = func, grad, hess
+        self._value_and_grad = value_and_grad
+        self._value_grad_hess = value_grad_hess
+        self._args, self._kwargs = args, ({} if kwargs is None else kwargs)
+        self.n_fev = self.n_gev = self.n_hev = 0
+        self._times = np.empty(iterations + 1)
+        self._times[0] = time.perf_counter()
+        if trace:
+            self._trace = {"x": np.empty((iterations + 1,) + np.shape(x0)),
+                           "f": np.empty(iterations + 1),
+                           "grad_norm": np.empty(iterations + 1)}
+        else:
+            self._trace = None
+
+    def func(self, x):
+        """Evaluate the objective function."""
+        self.n_fev += 1
+        return self._func(x, *self._args, **self._kwargs)
+
+    def grad(self, x, **extra):
+        """Evaluate the gradient (with extra keyword arguments, e.g., the
+        mini-batch index of stochastic optimizers)."""
+        self.n_gev += 1
+        return self._grad(x, *self._args, **self._kwargs, **extra)
+
+    def hess(self, x, *more):
+        """Evaluate the Hessian (or a Hessian-vector product)."""
+        self.n_hev += 1
+        return self._hess(x, *more, *self._args, **self._kwargs)
+
+    def value_and_grad(self, x, **extra):
+        """Evaluate the objective function and the gradient."""
+        if self._value_and_grad is None:
+            return self.func(x), self.grad(x, **extra)
+        self.n_fev += 1
+        self.n_gev += 1
+        return self._value_and_grad(x, *self._args, **self._kwargs, **extra)
+
+    def value_grad_hess(self, x):
+        """Evaluate the objective function, the gradient, and the Hessian."""
+        if self._value_grad_hess is None:
+            return (*self.value_and_grad(x), self.hess(x))
+        self.n_fev += 1
+        self.n_gev += 1
+        self.n_hev += 1
+        return self._value_grad_hess(x, *self._args, **self._kwargs)
+
+    def record(self, i, x, f=None, grad_norm=np.nan):
+        """Record the end of iteration i (i=0 for the initial guess).
+
+        Parameters
+        ----------
+        i : int
+            Iteration number.
+        x : numpy.ndarray
+            Current parameter.
+        f : float, optional
+            Objective function value at `x` (evaluated if needed for the trace
+            and not given).
+        grad_norm : float, optional
+            Largest absolute value of the gradient at `x`.
+        """
+        self._times[i] = time.perf_counter()
+        if self._trace is not None:
+            self._trace["x"][i] = x
+            self._trace["f"][i] = self.func(x) if f is None else f
+            self._trace["grad_norm"][i] = grad_norm
+
+    def result(self, x, n_iter, converged, message, grad_norm=np.nan):
+        """Summarize the optimization run.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            The approximate minimizer.
+        n_iter : int
+            Number of iterations performed.
+        converged : bool
+            Indicates whether a stopping criterion was met.
+        message : str
+            Reason the algorithm stopped.
+        grad_norm : float, optional
+            Largest absolute value of the gradient at `x`.
+
+        Returns
+        -------
+        An OptimizationResult.
+        """
+        if self._trace is None:
+            trace = None
+        else:
+            trace = {key: value[:n_iter + 1]
+                     for key, value in self._trace.items()}
+        return OptimizationResult(
+            x=x, converged=converged, message=message, n_iter=n_iter,
+            n_fev=self.n_fev, n_gev=self.n_gev, n_hev=self.n_hev,
+            grad_norm=grad_norm,
+            iteration_times=np.diff(self._times[:n_iter + 1]), trace=trace)
+
+
+def _max_abs(x):
+    """Largest absolute value of an array (the infinity norm)."""
+    return float(np.max(np.abs(x), initial=0.0))
+
+
+def _converged(gtol, xtol, ftol, grad_norm, x, step, f_old, f):
+    """Check the stopping criteria shared by the optimizers.
+
+    Parameters
+    ----------
+    gtol : float
+        Tolerance for the largest absolute value of the gradient.
+    xtol : float
+        Tolerance for the largest absolute value of the step, relative to the
+        largest absolute value of the parameter (or 1 if that is smaller).
+    ftol : float
+        Tolerance for the change of the objective function, relative to the
+        largest absolute value of the old and new objective function values
+        (or 1 if these are smaller).
+    grad_norm : float
+        Largest absolute value of the gradient at the new parameter.
+    x : numpy.ndarray
+        The new parameter.
+    step : numpy.ndarray
+        Difference between the new and old parameter.
+    f_old, f : float or None
+        The old and new objective function values (None if not computed).
+
+    Returns
+    -------
+    message : str or None
+        Description of the first criterion that is met, or None.
+    """
+    if grad_norm <= gtol:
+        return "gradient norm below gtol"
+    if _max_abs(step) <= xtol * max(_max_abs(x), 1.0):
+        return "step size below xtol"
+    if f is not None and f_old is not None \
+            and abs(f_old - f) <= ftol * max(abs(f_old), abs(f), 1.0):
+        return "objective change below ftol"
+    return None
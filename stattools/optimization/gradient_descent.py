@@ -5,6 +5,9 @@ import warnings
 import numpy as np
 
 from .base import Optimizer
+from .base import _Monitor
+from .base import _converged
+from .base import _max_abs
 from ..utils import validate_bool
 from ..utils import validate_float
 from ..utils import validate_int
@@ -43,10 +46,15 @@ def validate_gd_params(rate, momentum, nesterov, anneal, iterations):
 
 
 class GradientDescent(Optimizer):
-    """Unconstrained batch gradient descent with momentum."""
+    """Unconstrained batch gradient descent with momentum.
+
+    The algorithm stops after `iterations` iterations or as soon as one of the
+    tolerance criteria (gradient norm, step size, objective change) is met. A
+    summary of each run is stored in the `result` attribute.
+    """
 
     def __init__(self, rate=0.1, momentum=0.0, nesterov=False, anneal=np.inf,
-                 iterations=10000):
+                 iterations=10000, gtol=1e-8, xtol=0.0, ftol=0.0):
         """Initialize the parameters of a gradient descent object.
 
         Parameters
@@ -63,13 +71,29 @@ class GradientDescent(Optimizer):
             be positive. Smaller values lead to faster shrinking of the learning
             rate over time.
         iterations: int, optional
-            Number of iterations of the algorithm to perform. Must be positive.
+            Maximum number of iterations of the algorithm to perform. Must be
+            positive.
+        gtol: float, optional
+            The algorithm stops when the largest absolute value of the gradient
+            is at most `gtol`.
+        xtol: float, optional
+            The algorithm stops when the largest absolute value of the step is
+            at most `xtol` times max(1, largest absolute value of the
+            parameter).
+        ftol: float, optional
+            The algorithm stops when the change of the objective function,
+            |f_old - f| / max(|f_old|, |f|, 1), is at most `ftol`. If positive,
+            the objective function is evaluated at every iteration (gradient
+            descent otherwise only needs the gradient).
         """
         self.rate, self.momentum, self.nesterov, self.anneal, self.iterations \
             = validate_gd_params(rate, momentum, nesterov, anneal, iterations)
+        self.gtol = validate_float(gtol, "gtol", minimum=0.0)
+        self.xtol = validate_float(xtol, "xtol", minimum=0.0)
+        self.ftol = validate_float(ftol, "ftol", minimum=0.0)
 
     def optimize(self, x0, func, grad=None, args=None, kwargs=None,
-                 callback=None):
+                 callback=None, trace=False):
         """Approximate a minimizer of the objective function.
 
         Parameters
@@ -81,7 +105,9 @@ class GradientDescent(Optimizer):
         grad: callable, optional
             Gradient/Jacobian (vector of first derivatives) of the objective
             function. This must be a function returning a 1D array. If it is not
-            specified, then `func` needs to have a 'grad' attribute.
+            specified, then `func` needs to have a 'grad' attribute (and if
+            `func` has a 'value_and_grad' attribute, it is used whenever the
+            objective function is needed too).
         args: sequence, optional
             Extra positional arguments to pass to the objective function and
             gradient.
@@ -94,6 +120,11 @@ class GradientDescent(Optimizer):
             along with the extra arguments specified by `args` and `kwargs`.
             For example, `callback` could be a function that prints the value of
             the objective function at each iteration.
+        trace: bool, optional
+            If True, the parameter, objective function value, and gradient norm
+            at each iteration are recorded in preallocated arrays and stored in
+            the `trace` attribute of `self.result`. This is a cheaper
+            alternative to a `callback` recording the same information.
 
         Returns
         -------
@@ -103,9 +134,11 @@ class GradientDescent(Optimizer):
         if not callable(func):
             raise ValueError(f"Objective function {func} is not callable")
 
+        value_and_grad = None
         if grad is None:
             if hasattr(func, "grad"):
                 grad = func.grad
+                value_and_grad = getattr(func, "value_and_grad", None)
             else:
                 raise ValueError("Could not detect objective function gradient")
         if not callable(grad):
@@ -116,24 +149,53 @@ class GradientDescent(Optimizer):
         if kwargs is None:
             kwargs = {}
 
+        trace = validate_bool(trace, "trace")
+        monitor = _Monitor(func=func, grad=grad, value_and_grad=value_and_grad,
+                           args=args, kwargs=kwargs, iterations=self.iterations,
+                           trace=trace, x0=x0)
+
+        def evaluate(x):
+            # The objective function is only needed for the ftol criterion
+            if self.ftol > 0:
+                return monitor.value_and_grad(x)
+            return None, monitor.grad(x)
+
         x = np.asarray(x0)
         u = np.zeros(x.shape)
+        f, g = evaluate(x)
+        grad_norm = _max_abs(g)
+        monitor.record(0, x, f, grad_norm)
         if callback is not None:
             callback(x, *args, **kwargs)
 
-        if self.nesterov:
-            for t in range(int(self.iterations)):
-                rate = self.rate / (1 + t / self.anneal)
-                u_prev = u
-                u = self.momentum * u - rate * grad(x, *args, **kwargs)
-                x = x - self.momentum * u_prev + (1 + self.momentum) * u
-                if callback is not None:
-                    callback(x, *args, **kwargs)
-        else:
-            for t in range(int(self.iterations)):
-                rate = self.rate / (1 + t / self.anneal)
-                u = self.momentum * u - rate * grad(x, *args, **kwargs)
-                x = x + u
-                if callback is not None:
-                    callback(x, *args, **kwargs)
+        message = None
+        t = 0
+        if grad_norm <= self.gtol:
+            message = "gradient norm below gtol"
+        while message is None and t < self.iterations:
+            rate = self.rate / (1 + t / self.anneal)
+            u_prev = u
+            u = self.momentum * u - rate * g
+            if self.nesterov:
+                step = (1 + self.momentum) * u - self.momentum * u_prev
+            else:
+                step = u
+            x = x + step
+            t += 1
+
+            f_old = f
+            f, g = evaluate(x)
+            grad_norm = _max_abs(g)
+            monitor.record(t, x, f, grad_norm)
+            if callback is not None:
+                callback(x, *args, **kwargs)
+
+            message = _converged(self.gtol, self.xtol, self.ftol, grad_norm, x,
+                                 step, f_old, f)
+
+        converged = message is not None
+        if not converged:
+            message = "maximum number of iterations reached"
+        self.result = monitor.result(x=x, n_iter=t, converged=converged,
+                                     message=message, grad_norm=grad_norm)
         return x
@@ -0,0 +1,350 @@
+"""Defines the LBFGS class.
+
+References
+----------
+Jorge Nocedal and Stephen J. Wright. Numerical Optimization. Second edition.
+    Springer Series in Operations Research and Financial Engineering (2006).
+    DOI: https://doi.org/10.1007/978-0-387-40065-5
+"""
+
+import collections
+
+import numpy as np
+
+from .base import Optimizer
+from .base import _Monitor
+from .base import _max_abs
+from ..utils import validate_bool
+from ..utils import validate_float
+from ..utils import validate_int
+
+
+class LBFGS(Optimizer):
+    """Minimize functions using the limited-memory BFGS quasi-Newton method.
+
+    The inverse Hessian approximation is represented implicitly by the last
+    `m` pairs of parameter and gradient differences, so each iteration costs
+    O(m * p) operations and memory for p parameters (in addition to the
+    function and gradient evaluations). Step sizes are chosen by a line search
+    satisfying the strong Wolfe conditions (Nocedal and Wright (2006),
+    Algorithms 7.4, 7.5, 3.5, and 3.6). A summary of each run is stored in the
+    `result` attribute.
+    """
+
+    def __init__(self, m=10, iterations=1000, gtol=1e-6, ftol=1e-12, c1=1e-4,
+                 c2=0.9, max_ls=25):
+        """Initialize the parameters of an L-BFGS optimizer.
+
+        Parameters
+        ----------
+        m : int, optional
+            Number of previous iterations used to approximate the inverse
+            Hessian.
+        iterations : int, optional
+            Maximum number of iterations of the algorithm to perform.
+        gtol : float, optional
+            The algorithm stops when the largest absolute value of the gradient
+            is at most `gtol`.
+        ftol : float, optional
+            The algorithm stops when the relative decrease of the objective
+            function, (f_old - f) / max(|f_old|, |f|, 1), is at most `ftol`.
+        c1 : float, optional
+            Sufficient decrease (Armijo) parameter of the line search.
+        c2 : float, optional
+            Curvature parameter of the line search (c1 < c2 < 1).
+        max_ls : int, optional
+            Maximum number of function evaluations in each line search.
+        """
+        self.m = validate_int(m, "m", minimum=1)
+        self.iterations = validate_int(iterations, "iterations", minimum=1)
+        self.gtol = validate_float(gtol, "gtol", minimum=0.0)
+        self.ftol = validate_float(ftol, "ftol", minimum=0.0)
+        self.c1 = validate_float(c1, "c1", positive=True)
+        self.c2 = validate_float(c2, "c2", minimum=self.c1, maximum=1.0)
+        self.max_ls = validate_int(max_ls, "max_ls", minimum=1)
+
+    def optimize(self, x0, func, grad=None, args=None, kwargs=None,
+                 callback=None, trace=False):
+        """Approximate a minimizer of the objective function.
+
+        Parameters
+        ----------
+        x0: array-like
+            Initial guess for the minimizer.
+        func: callable
+            The objective function to minimize.
+        grad: callable, optional
+            Gradient/Jacobian (vector of first derivatives) of the objective
+            function. This must be a function returning an array of the same
+            shape as `x0`. If it is not specified, then `func` needs to have a
+            'grad' attribute (and if `func` has a 'value_and_grad' attribute,
+            it is used to evaluate the function and its gradient together).
+        args: sequence, optional
+            Extra positional arguments to pass to the objective function and
+            gradient.
+        kwargs: dict, optional
+            Extra keyword arguments to pass to the objective function and
+            gradient.
+        callback: callable, optional
+            Function to call at every iteration of the algorithm. The function
+            is called on the current value of the parameter being minimized
+            along with the extra arguments specified by `args` and `kwargs`.
+            For example, `callback` could be a function that prints the value of
+            the objective function at each iteration.
+        trace: bool, optional
+            If True, the parameter, objective function value, and gradient norm
+            at each iteration are recorded in preallocated arrays and stored in
+            the `trace` attribute of `self.result`. This is a cheaper
+            alternative to a `callback` recording the same information.
+
+        Returns
+        -------
+        x : array-like
+            The approximate minimizer of the objective function.
+        """
+        if not callable(func):
+            raise ValueError(f"Objective function {func} is not callable")
+
+        value_and_grad = None
+        if grad is None:
+            if hasattr(func, "value_and_grad"):
+                value_and_grad = func.value_and_grad
+            elif hasattr(func, "grad"):
+                grad = func.grad
+            else:
+                raise ValueError("Could not detect objective function gradient")
+        if value_and_grad is None and not callable(grad):
+            raise ValueError(f"Gradient {grad} is not callable")
+
+        if args is None:
+            args = ()
+        if kwargs is None:
+            kwargs = {}
+
+        trace = validate_bool(trace, "trace")
+        monitor = _Monitor(func=func, grad=grad, value_and_grad=value_and_grad,
+                           args=args, kwargs=kwargs, iterations=self.iterations,
+                           trace=trace, x0=x0)
+
+        # The algorithm works with flattened parameters
+        shape = np.shape(x0)
+
+        def fg(x):
+            value, gradient = monitor.value_and_grad(x.reshape(shape))
+            return float(value), np.ravel(gradient).astype(np.float_)
+
+        x = np.array(x0, dtype=np.float_).ravel()
+        f, g = fg(x)
+        monitor.record(0, x.reshape(shape), f, _max_abs(g))
+        if callback is not None:
+            callback(x.reshape(shape), *args, **kwargs)
+
+        # Parameter and gradient differences, and their inner products
+        history = collections.deque(maxlen=self.m)
+
+        message = None
+        t = 0
+        while t < self.iterations:
+            if _max_abs(g) <= self.gtol:
+                message = "gradient norm below gtol"
+                break
+
+            # Search direction
+            d = -_two_loop(g, history)
+            if g.dot(d) >= 0:
+                # Not a descent direction (the history is inaccurate); restart
+                history.clear()
+                d = -g
+
+            # Initial step: unit step, except for the first iteration (without
+            # curvature information) where the step has unit length
+            alpha = 1.0 if history else min(1.0, 1.0 / np.linalg.norm(d))
+            alpha, f_new, g_new = _line_search(fg, x, f, g, d, alpha,
+                                               self.c1, self.c2, self.max_ls)
+            if alpha is None:
+                # The line search made no progress
+                message = "line search failed"
+                break
+
+            s = alpha * d
+            y = g_new - g
+            sy = s.dot(y)
+            if sy > np.finfo(np.float_).eps * y.dot(y):
+                history.append((s, y, 1.0 / sy))
+
+            x = x + s
+            f_old, f, g = f, f_new, g_new
+            t += 1
+            monitor.record(t, x.reshape(shape), f, _max_abs(g))
+            if callback is not None:
+                callback(x.reshape(shape), *args, **kwargs)
+
+            if f_old - f <= self.ftol * max(abs(f_old), abs(f), 1.0):
+                message = "objective change below ftol"
+                break
+
+        # Only a failed line search does not count as convergence
+        converged = message is not None and message != "line search failed"
+        if message is None:
+            if _max_abs(g) <= self.gtol:
+                converged, message = True, "gradient norm below gtol"
+            else:
+                message = "maximum number of iterations reached"
+        x = x.reshape(shape)
+        self.result = monitor.result(x=x, n_iter=t, converged=converged,
+                                     message=message, grad_norm=_max_abs(g))
+        return x
+
+
+def _two_loop(g, history):
+    """Multiply a gradient by the L-BFGS inverse Hessian approximation using
+    the two-loop recursion (Nocedal and Wright (2006), Algorithm 7.4).
+
+    Parameters
+    ----------
+    g : numpy.ndarray
+        The gradient.
+    history : sequence of tuples
+        The pairs (s, y, 1 / s.dot(y)) of parameter and gradient differences,
+        from oldest to newest.
+
+    Returns
+    -------
+    The product of the inverse Hessian approximation and `g`.
+    """
+    q = g.copy()
+    alphas = []
+    for s, y, rho in reversed(history):
+        a = rho * s.dot(q)
+        q -= a * y
+        alphas.append(a)
+
+    # Initial inverse Hessian approximation gamma * I (Equation 7.20)
+    if history:
+        s, y, rho = history[-1]
+        q *= 1.0 / (rho * y.dot(y))
+
+    for (s, y, rho), a in zip(history, reversed(alphas)):
+        b = rho * y.dot(q)
+        q += (a - b) * s
+    return q
+
+
+def _line_search(fg, x, f0, g0, d, alpha, c1, c2, max_ls):
+    """Find a step size satisfying the strong Wolfe conditions
+        f(x + alpha * d) <= f(x) + c1 * alpha * g(x).dot(d),
+        |g(x + alpha * d).dot(d)| <= c2 * |g(x).dot(d)|
+    (Nocedal and Wright (2006), Algorithms 3.5 and 3.6).
+
+    Parameters
+    ----------
+    fg : callable
+        Function returning the objective function value and gradient.
+    x : numpy.ndarray
+        Current point.
+    f0 : float
+        Objective function value at `x`.
+    g0 : numpy.ndarray
+        Gradient at `x`.
+    d : numpy.ndarray
+        Descent direction.
+    alpha : float
+        Initial step size.
+    c1, c2 : float
+        Line search parameters.
+    max_ls : int
+        Maximum number of function evaluations.
+
+    Returns
+    -------
+    alpha : float or None
+        The step size. If no step satisfying the conditions is found, this is
+        the step with the smallest sufficiently decreased function value found,
+        or None if there is no such step.
+    f : float
+        The function value at the step.
+    g : numpy.ndarray
+        The gradient at the step.
+    """
+    dphi0 = g0.dot(d)
+
+    # Best sufficiently decreased point found so far (returned if the search
+    # fails), and number of function evaluations
+    best = (None, f0, g0)
+    n_eval = 0
+
+    def evaluate(a):
+        nonlocal best, n_eval
+        n_eval += 1
+        f, g = fg(x + a * d)
+        if f <= f0 + c1 * a * dphi0 and f < best[1]:
+            best = (a, f, g)
+        return f, g, g.dot(d)
+
+    # Bracketing phase: increase the step until an interval containing
+    # acceptable steps is found
+    lo = (0.0, f0, dphi0)
+    hi = None
+    while n_eval < max_ls:
+        f, g, dphi = evaluate(alpha)
+        if not np.isfinite(f) or f > f0 + c1 * alpha * dphi0 \
+                or (n_eval > 1 and f >= lo[1]):
+            hi = (alpha, f, dphi)
+            break
+        if abs(dphi) <= -c2 * dphi0:
+            return alpha, f, g
+        if dphi >= 0:
+            lo, hi = (alpha, f, dphi), lo
+            break
+        lo = (alpha, f, dphi)
+        alpha *= 2.0
+    if hi is None:
+        return best
+
+    # Zoom phase: shrink the interval between lo (the end with the smaller
+    # function value) and hi until an acceptable step is found
+    while n_eval < max_ls:
+        alpha = _cubic_step(lo, hi)
+        f, g, dphi = evaluate(alpha)
+        if not np.isfinite(f) or f > f0 + c1 * alpha * dphi0 or f >= lo[1]:
+            hi = (alpha, f, dphi)
+        else:
+            if abs(dphi) <= -c2 * dphi0:
+                return alpha, f, g
+            if dphi * (hi[0] - lo[0]) >= 0:
+                hi = lo
+            lo = (alpha, f, dphi)
+        if abs(hi[0] - lo[0]) <= np.finfo(np.float_).eps * abs(lo[0]):
+            break
+    return best
+
+
+def _cubic_step(lo, hi):
+    """Minimize the cubic interpolating the function values and directional
+    derivatives at the ends of a line search interval (Nocedal and Wright
+    (2006), Equation 3.59), safeguarded to lie in the middle 80% of the
+    interval (bisection is used if the cubic has no minimizer).
+
+    Parameters
+    ----------
+    lo, hi : tuple
+        The triples (step size, function value, directional derivative) at the
+        ends of the interval.
+
+    Returns
+    -------
+    The new step size.
+    """
+    (a_lo, f_lo, d_lo), (a_hi, f_hi, d_hi) = lo, hi
+    width = a_hi - a_lo
+    if np.all(np.isfinite([f_lo, f_hi, d_lo, d_hi])):
+        d1 = d_lo + d_hi - 3 * (f_lo - f_hi) / (a_lo - a_hi)
+        radicand = d1 ** 2 - d_lo * d_hi
+        if radicand >= 0:
+            d2 = np.sign(width) * np.sqrt(radicand)
+            denom = d_hi - d_lo + 2 * d2
+            if denom != 0:
+                alpha = a_hi - width * (d_hi + d2 - d1) / denom
+                if 0.1 <= (alpha - a_lo) / width <= 0.9:
+                    return alpha
+    return a_lo + 0.5 * width
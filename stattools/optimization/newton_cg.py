@@ -0,0 +1,240 @@
+"""Defines the NewtonCG class.
+
+References
+----------
+Jorge Nocedal and Stephen J. Wright. Numerical Optimization. Second edition.
+    Springer Series in Operations Research and Financial Engineering (2006).
+    DOI: https://doi.org/10.1007/978-0-387-40065-5
+"""
+
+import numpy as np
+
+from .base import Optimizer
+from .base import _Monitor
+from .base import _converged
+from .base import _max_abs
+from .lbfgs import _line_search
+from ..utils import validate_bool
+from ..utils import validate_float
+from ..utils import validate_int
+
+
+class NewtonCG(Optimizer):
+    """Minimize functions using the line search Newton-CG (truncated Newton)
+    method.
+
+    Each Newton step is computed approximately by the conjugate gradient
+    method, which only needs products of the Hessian with vectors. The Hessian
+    is never formed, so for p parameters each iteration needs O(p) memory in
+    addition to the Hessian-vector products, and the conjugate gradient
+    iterations are stopped early when the Newton step is inaccurate anyway
+    (far from the minimizer) or when negative curvature is detected
+    (Nocedal and Wright (2006), Algorithm 7.1). Step sizes are chosen by a line
+    search satisfying the strong Wolfe conditions. A summary of each run is
+    stored in the `result` attribute.
+    """
+
+    def __init__(self, iterations=100, gtol=1e-8, xtol=0.0, ftol=0.0,
+                 cg_iterations=None):
+        """Initialize the parameters of a Newton-CG optimizer.
+
+        Parameters
+        ----------
+        iterations : int, optional
+            Maximum number of (outer) Newton iterations.
+        gtol : float, optional
+            The algorithm stops when the largest absolute value of the gradient
+            is at most `gtol`.
+        xtol : float, optional
+            The algorithm stops when the largest absolute value of the step is
+            at most `xtol` times max(1, largest absolute value of the
+            parameter).
+        ftol : float, optional
+            The algorithm stops when the change of the objective function,
+            |f_old - f| / max(|f_old|, |f|, 1), is at most `ftol`.
+        cg_iterations : int, optional
+            Maximum number of conjugate gradient iterations per Newton
+            iteration. If None, this is the number of parameters.
+        """
+        self.iterations = validate_int(iterations, "iterations", minimum=1)
+        self.gtol = validate_float(gtol, "gtol", minimum=0.0)
+        self.xtol = validate_float(xtol, "xtol", minimum=0.0)
+        self.ftol = validate_float(ftol, "ftol", minimum=0.0)
+        if cg_iterations is not None:
+            cg_iterations = validate_int(cg_iterations, "cg_iterations",
+                                         minimum=1)
+        self.cg_iterations = cg_iterations
+
+    def optimize(self, x0, func, grad=None, hessp=None, args=None,
+                 kwargs=None, callback=None, trace=False):
+        """Approximate a minimizer of the objective function.
+
+        Parameters
+        ----------
+        x0: array-like
+            Initial guess for the minimizer.
+        func: callable
+            The objective function to minimize.
+        grad: callable, optional
+            Gradient/Jacobian (vector of first derivatives) of the objective
+            function. This must be a function returning an array of the same
+            shape as `x0`. If it is not specified, then `func` needs to have a
+            'grad' attribute (and if `func` has a 'value_and_grad' attribute,
+            it is used to evaluate the function and its gradient together).
+        hessp: callable, optional
+            Function hessp(x, v) computing the product of the Hessian of the
+            objective function at `x` with a vector `v` of the same shape as
+            `x0`. If it is not specified, then `func` needs to have a 'hessp'
+            attribute.
+        args: sequence, optional
+            Extra positional arguments to pass to the objective function,
+            gradient, and Hessian-vector product.
+        kwargs: dict, optional
+            Extra keyword arguments to pass to the objective function,
+            gradient, and Hessian-vector product.
+        callback: callable, optional
+            Function to call at every iteration of the algorithm. The function
+            is called on the current value of the parameter being minimized
+            along with the extra arguments specified by `args` and `kwargs`.
+        trace: bool, optional
+            If True, the parameter, objective function value, and gradient norm
+            at each iteration are recorded in preallocated arrays and stored in
+            the `trace` attribute of `self.result`.
+
+        Returns
+        -------
+        x : array-like
+            The approximate minimizer of the objective function.
+        """
+        if not callable(func):
+            raise ValueError(f"Objective function {func} is not callable")
+
+        value_and_grad = None
+        if grad is None:
+            if hasattr(func, "grad"):
+                grad = func.grad
+                value_and_grad = getattr(func, "value_and_grad", None)
+            else:
+                raise ValueError("Could not detect objective function gradient")
+        if not callable(grad):
+            raise ValueError(f"Gradient {grad} is not callable")
+
+        if hessp is None:
+            if hasattr(func, "hessp"):
+                hessp = func.hessp
+            else:
+                raise ValueError("Could not detect objective function "
+                                 "Hessian-vector product")
+        if not callable(hessp):
+            raise ValueError(f"Hessian-vector product {hessp} is not callable")
+
+        if args is None:
+            args = ()
+        if kwargs is None:
+            kwargs = {}
+
+        trace = validate_bool(trace, "trace")
+        monitor = _Monitor(func=func, grad=grad, hess=hessp,
+                           value_and_grad=value_and_grad, args=args,
+                           kwargs=kwargs, iterations=self.iterations,
+                           trace=trace, x0=x0)
+
+        # The algorithm works with flattened parameters
+        shape = np.shape(x0)
+
+        def fg(x):
+            value, gradient = monitor.value_and_grad(x.reshape(shape))
+            return float(value), np.ravel(gradient).astype(np.float_)
+
+        def hv(x, v):
+            return np.ravel(monitor.hess(x.reshape(shape), v.reshape(shape)))
+
+        x = np.array(x0, dtype=np.float_).ravel()
+        f, g = fg(x)
+        grad_norm = _max_abs(g)
+        monitor.record(0, x.reshape(shape), f, grad_norm)
+        if callback is not None:
+            callback(x.reshape(shape), *args, **kwargs)
+
+        max_cg = x.size if self.cg_iterations is None else self.cg_iterations
+
+        message = None
+        t = 0
+        if grad_norm <= self.gtol:
+            message = "gradient norm below gtol"
+        while message is None and t < self.iterations:
+            d = _truncated_cg(lambda v: hv(x, v), g, max_cg)
+            alpha, f_new, g_new = _line_search(fg, x, f, g, d, 1.0, c1=1e-4,
+                                               c2=0.9, max_ls=25)
+            if alpha is None:
+                message = "line search failed"
+                break
+
+            step = alpha * d
+            x = x + step
+            f_old, f, g = f, f_new, g_new
+            grad_norm = _max_abs(g)
+            t += 1
+            monitor.record(t, x.reshape(shape), f, grad_norm)
+            if callback is not None:
+                callback(x.reshape(shape), *args, **kwargs)
+
+            message = _converged(self.gtol, self.xtol, self.ftol, grad_norm, x,
+                                 step, f_old, f)
+
+        converged = message is not None and message != "line search failed"
+        if message is None:
+            message = "maximum number of iterations reached"
+        x = x.reshape(shape)
+        self.result = monitor.result(x=x, n_iter=t, converged=converged,
+                                     message=message, grad_norm=grad_norm)
+        return x
+
+
+def _truncated_cg(hv, g, max_iter):
+    """Approximately solve the Newton equations H d = -g by the conjugate
+    gradient method (Nocedal and Wright (2006), Algorithm 7.1).
+
+    The iterations stop when the relative residual is below
+    min(0.5, sqrt(|g|)) (giving superlinear convergence of the Newton
+    iterations), when negative curvature is detected, or after `max_iter`
+    iterations.
+
+    Parameters
+    ----------
+    hv : callable
+        Function computing the product of the Hessian with a vector.
+    g : numpy.ndarray
+        The gradient.
+    max_iter : int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    d : numpy.ndarray
+        A descent direction (the steepest descent direction -g if the Hessian
+        has negative curvature along it).
+    """
+    g_norm = np.linalg.norm(g)
+    tol = min(0.5, np.sqrt(g_norm)) * g_norm
+
+    d = np.zeros_like(g)
+    r = g.copy()
+    p = -r
+    rr = r.dot(r)
+    for i in range(max_iter):
+        hp = hv(p)
+        curvature = p.dot(hp)
+        if curvature <= 0:
+            # Negative curvature: return the current iterate (or steepest
+            # descent in the first iteration)
+            return -g if i == 0 else d
+        a = rr / curvature
+        d += a * p
+        r += a * hp
+        rr_new = r.dot(r)
+        if np.sqrt(rr_new) <= tol:
+            break
+        p = -r + (rr_new / rr) * p
+        rr = rr_new
+    return d
@@ -3,24 +3,48 @@
 import numpy as np
 
 from .base import Optimizer
+from .base import _Monitor
+from .base import _converged
+from .base import _max_abs
+from ..utils import validate_bool
+from ..utils import validate_float
 from ..utils import validate_int
 
 
 class NewtonRaphson(Optimizer):
-    """Find stationary points of functions using the Newton-Raphson method."""
+    """Find stationary points of functions using the Newton-Raphson method.
 
-    def __init__(self, iterations=1000):
+    The algorithm stops after `iterations` iterations or as soon as one of the
+    tolerance criteria (gradient norm, step size, objective change) is met. A
+    summary of each run is stored in the `result` attribute.
+    """
+
+    def __init__(self, iterations=1000, gtol=1e-8, xtol=0.0, ftol=0.0):
         """Initialize the parameters of a Newton-Raphson method object.
 
         Parameters
         ----------
         iterations: int, optional
-            Number of iterations of the algorithm to perform.
+            Maximum number of iterations of the algorithm to perform.
+        gtol: float, optional
+            The algorithm stops when the largest absolute value of the gradient
+            is at most `gtol`.
+        xtol: float, optional
+            The algorithm stops when the largest absolute value of the step is
+            at most `xtol` times max(1, largest absolute value of the
+            parameter).
+        ftol: float, optional
+            The algorithm stops when the change of the objective function,
+            |f_old - f| / max(|f_old|, |f|, 1), is at most `ftol`. If positive,
+            the objective function is evaluated at every iteration.
         """
         self.iterations = validate_int(iterations, "iterations", minimum=1)
+        self.gtol = validate_float(gtol, "gtol", minimum=0.0)
+        self.xtol = validate_float(xtol, "xtol", minimum=0.0)
+        self.ftol = validate_float(ftol, "ftol", minimum=0.0)
 
     def optimize(self, x0, func, grad=None, hess=None, args=None, kwargs=None,
-                 callback=None):
+                 callback=None, trace=False):
         """Approximate a stationary point of the objective function.
 
         Parameters
@@ -36,7 +60,10 @@ class NewtonRaphson(Optimizer):
         hess: callable, optional
             Hessian (matrix of mixed second derivatives) of the objective
             function. This must be a function returning a 2D array. If it is not
-            specified, then `func` needs to have a 'hess' attribute.
+            specified, then `func` needs to have a 'hess' attribute. If neither
+            `grad` nor `hess` is specified, the 'value_and_grad' and
+            'value_grad_hess' attributes of `func` (if any) are used to
+            evaluate the function and its derivatives together.
         args: sequence, optional
             Extra positional arguments to pass to the objective function and
             gradient.
@@ -49,6 +76,11 @@ class NewtonRaphson(Optimizer):
             along with the extra arguments specified by `args` and `kwargs`.
             For example, `callback` could be a function that prints the value of
             the objective function at each iteration.
+        trace: bool, optional
+            If True, the parameter, objective function value, and gradient norm
+            at each iteration are recorded in preallocated arrays and stored in
+            the `trace` attribute of `self.result`. This is a cheaper
+            alternative to a `callback` recording the same information.
 
         Returns
         -------
@@ -58,9 +90,11 @@ class NewtonRaphson(Optimizer):
         if not callable(func):
             raise ValueError(f"Objective function {func} is not callable")
 
+        value_and_grad = value_grad_hess = None
         if grad is None:
             if hasattr(func, "grad"):
                 grad = func.grad
+                value_and_grad = getattr(func, "value_and_grad", None)
             else:
                 raise ValueError("Could not detect objective function gradient")
         if not callable(grad):
@@ -69,6 +103,8 @@ class NewtonRaphson(Optimizer):
         if hess is None:
             if hasattr(func, "hess"):
                 hess = func.hess
+                if value_and_grad is not None:
+                    value_grad_hess = getattr(func, "value_grad_hess", None)
             else:
                 raise ValueError("Could not detect objective function Hessian")
         if not callable(hess):
@@ -79,15 +115,63 @@ class NewtonRaphson(Optimizer):
         if kwargs is None:
             kwargs = {}
 
+        trace = validate_bool(trace, "trace")
+        monitor = _Monitor(func=func, grad=grad, hess=hess,
+                           value_and_grad=value_and_grad,
+                           value_grad_hess=value_grad_hess, args=args,
+                           kwargs=kwargs, iterations=self.iterations,
+                           trace=trace, x0=x0)
+
+        def evaluate(x):
+            # The objective function is only needed for the ftol criterion
+            if self.ftol > 0:
+                f, g = monitor.value_and_grad(x)
+            else:
+                f, g = None, monitor.grad(x)
+            return f, np.atleast_1d(g)
+
         x = np.asarray(x0)
+        if value_grad_hess is None:
+            f, g = evaluate(x)
+            a = None
+        else:
+            # The first iteration needs all three at the initial guess
+            f, g, a = monitor.value_grad_hess(x)
+            g = np.atleast_1d(g)
+        grad_norm = _max_abs(g)
+        monitor.record(0, x, f, grad_norm)
         if callback is not None:
             callback(x, *args, **kwargs)
 
-        for _ in range(int(self.iterations)):
-            a = np.atleast_2d(hess(x, *args, **kwargs))
-            b = np.atleast_1d(grad(x, *args, **kwargs))
-            u, *_ = np.linalg.lstsq(a, b, rcond=None)
+        message = None
+        t = 0
+        if grad_norm <= self.gtol:
+            message = "gradient norm below gtol"
+        while message is None and t < self.iterations:
+            if a is None:
+                a = monitor.hess(x)
+            u, *_ = np.linalg.lstsq(np.atleast_2d(a), g, rcond=None)
+            u = u.reshape(np.shape(x))
             x = x - u
+            t += 1
+
+            # The Hessian at the new point is only computed if the algorithm
+            # continues (a loss function caching its linear predictor shares
+            # it between the gradient and the Hessian)
+            f_old = f
+            f, g = evaluate(x)
+            a = None
+            grad_norm = _max_abs(g)
+            monitor.record(t, x, f, grad_norm)
             if callback is not None:
                 callback(x, *args, **kwargs)
+
+            message = _converged(self.gtol, self.xtol, self.ftol, grad_norm, x,
+                                 u, f_old, f)
+
+        converged = message is not None
+        if not converged:
+            message = "maximum number of iterations reached"
+        self.result = monitor.result(x=x, n_iter=t, converged=converged,
+                                     message=message, grad_norm=grad_norm)
         return x
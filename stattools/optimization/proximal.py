@@ -0,0 +1,227 @@
+"""Defines the ProximalGradient class.
+
+References
+----------
+Amir Beck and Marc Teboulle. A fast iterative shrinkage-thresholding algorithm
+    for linear inverse problems. SIAM Journal on Imaging Sciences 2.1 (2009),
+    183-202. DOI: https://doi.org/10.1137/080716542
+Brendan O'Donoghue and Emmanuel Candes. Adaptive restart for accelerated
+    gradient schemes. Foundations of Computational Mathematics 15.3 (2015),
+    715-732. DOI: https://doi.org/10.1007/s10208-013-9150-3
+"""
+
+import numpy as np
+
+from .base import Optimizer
+from .base import _Monitor
+from .base import _converged
+from ..utils import validate_bool
+from ..utils import validate_float
+from ..utils import validate_int
+
+
+class ProximalGradient(Optimizer):
+    """Minimize functions of the form f(x) + g(x), where f is smooth and g has
+    an inexpensive proximal operator
+        prox(v, step) = argmin_x g(x) + ||x - v||^2 / (2 * step),
+    using the proximal gradient method (ISTA) or its accelerated version
+    (FISTA), with backtracking step sizes (Beck and Teboulle (2009)).
+
+    For example, the proximal operator of the L1 penalty is soft-thresholding,
+    so the iterates of L1-penalized losses have exact zeros. Losses penalized
+    by the stattools.regularization.lasso decorator are recognized
+    automatically. A summary of each run is stored in the `result` attribute;
+    its gradient norm is that of the gradient mapping
+        (y - prox(y - step * grad f(y), step)) / step,
+    which vanishes exactly at the minimizers.
+    """
+
+    def __init__(self, accelerated=True, iterations=1000, step=1.0,
+                 shrink=0.5, restart=True, gtol=1e-6, xtol=0.0, ftol=0.0):
+        """Initialize the parameters of a proximal gradient optimizer.
+
+        Parameters
+        ----------
+        accelerated : bool, optional
+            If True, use FISTA (Nesterov's acceleration). If False, use ISTA.
+        iterations : int, optional
+            Maximum number of iterations of the algorithm to perform.
+        step : float, optional
+            Initial step size (the reciprocal of an estimate of the Lipschitz
+            constant of the gradient of f). It is multiplied by `shrink` until
+            the backtracking condition holds, and never increased.
+        shrink : float, optional
+            Backtracking factor (in (0, 1)).
+        restart : bool, optional
+            If True (and `accelerated` is True), the momentum is reset
+            whenever the step goes against the momentum (the gradient restart
+            scheme of O'Donoghue and Candes (2015)).
+        gtol : float, optional
+            The algorithm stops when the largest absolute value of the
+            gradient mapping is at most `gtol`.
+        xtol : float, optional
+            The algorithm stops when the largest absolute value of the step is
+            at most `xtol` times max(1, largest absolute value of the
+            parameter).
+        ftol : float, optional
+            The algorithm stops when the change of the objective function,
+            |f_old - f| / max(|f_old|, |f|, 1), is at most `ftol`. If positive,
+            the objective function is evaluated at every iteration.
+        """
+        self.accelerated = validate_bool(accelerated, "accelerated")
+        self.iterations = validate_int(iterations, "iterations", minimum=1)
+        self.step = validate_float(step, "step", positive=True)
+        self.shrink = validate_float(shrink, "shrink", positive=True,
+                                     maximum=1.0)
+        if self.shrink == 1.0:
+            raise ValueError("Parameter 'shrink' must be less than 1.")
+        self.restart = validate_bool(restart, "restart")
+        self.gtol = validate_float(gtol, "gtol", minimum=0.0)
+        self.xtol = validate_float(xtol, "xtol", minimum=0.0)
+        self.ftol = validate_float(ftol, "ftol", minimum=0.0)
+
+    def optimize(self, x0, func, grad=None, prox=None, args=None, kwargs=None,
+                 callback=None, trace=False):
+        """Approximate a minimizer of the objective function.
+
+        Parameters
+        ----------
+        x0: array-like
+            Initial guess for the minimizer.
+        func: callable
+            The objective function to minimize. If `prox` is not specified and
+            `func` has 'prox' and 'smooth' attributes (like losses penalized by
+            the stattools.regularization.lasso decorator), these are the
+            proximal operator of g and the smooth part f. Otherwise, `func` is
+            the smooth part f.
+        grad: callable, optional
+            Gradient of the smooth part f of the objective function. If it is
+            not specified, then f needs to have a 'grad' attribute (and if f
+            has a 'value_and_grad' attribute, it is used to evaluate the
+            function and its gradient together).
+        prox: callable, optional
+            Proximal operator prox(v, step) of the nonsmooth part g. If neither
+            this nor `func.prox` is available, g is 0 (and the algorithm is
+            gradient descent with backtracking).
+        args: sequence, optional
+            Extra positional arguments to pass to the objective function and
+            gradient.
+        kwargs: dict, optional
+            Extra keyword arguments to pass to the objective function and
+            gradient.
+        callback: callable, optional
+            Function to call at every iteration of the algorithm. The function
+            is called on the current value of the parameter being minimized
+            along with the extra arguments specified by `args` and `kwargs`.
+        trace: bool, optional
+            If True, the parameter, objective function value, and gradient
+            mapping norm at each iteration are recorded in preallocated arrays
+            and stored in the `trace` attribute of `self.result`.
+
+        Returns
+        -------
+        x : array-like
+            The approximate minimizer of the objective function.
+        """
+        if not callable(func):
+            raise ValueError(f"Objective function {func} is not callable")
+
+        if prox is None and hasattr(func, "prox"):
+            prox = func.prox
+            smooth = func.smooth
+        else:
+            smooth = func
+        if prox is None:
+            def prox(v, _):
+                return v
+        if not callable(prox):
+            raise ValueError(f"Proximal operator {prox} is not callable")
+
+        value_and_grad = None
+        if grad is None:
+            if hasattr(smooth, "grad"):
+                grad = smooth.grad
+                value_and_grad = getattr(smooth, "value_and_grad", None)
+            else:
+                raise ValueError("Could not detect objective function gradient")
+        if not callable(grad):
+            raise ValueError(f"Gradient {grad} is not callable")
+
+        if args is None:
+            args = ()
+        if kwargs is None:
+            kwargs = {}
+
+        trace = validate_bool(trace, "trace")
+        monitor = _Monitor(func=smooth, grad=grad,
+                           value_and_grad=value_and_grad, args=args,
+                           kwargs=kwargs, iterations=self.iterations,
+                           trace=trace, x0=x0)
+
+        def objective(x):
+            # The full objective function is only needed for the ftol criterion
+            # and the trace
+            if self.ftol > 0 or trace:
+                monitor.n_fev += 1
+                return func(x, *args, **kwargs)
+            return None
+
+        # Slack in the backtracking condition for rounding errors
+        eps = 10 * np.finfo(np.float_).eps
+
+        x = np.array(x0, dtype=np.float_)
+        lipschitz = 1.0 / self.step
+        y = x
+        momentum = 1.0
+        f_y, g_y = monitor.value_and_grad(y)
+        f = objective(x)
+        monitor.record(0, x, f)
+        if callback is not None:
+            callback(x, *args, **kwargs)
+
+        message = None
+        t = 0
+        while message is None and t < self.iterations:
+            # Backtracking: increase the Lipschitz constant estimate until the
+            # quadratic model at y majorizes f at the proximal step
+            while True:
+                x_new = prox(y - g_y / lipschitz, 1.0 / lipschitz)
+                d = x_new - y
+                f_new = monitor.func(x_new)
+                bound = f_y + np.vdot(g_y, d) + 0.5 * lipschitz * np.vdot(d, d)
+                if f_new <= bound + eps * abs(f_y):
+                    break
+                lipschitz /= self.shrink
+            grad_norm = lipschitz * np.max(np.abs(d), initial=0.0)
+
+            step = x_new - x
+            if self.accelerated:
+                if self.restart and np.vdot(y - x_new, step) > 0:
+                    momentum = 1.0
+                momentum_new = 0.5 * (1.0 + np.sqrt(1.0 + 4.0 * momentum ** 2))
+                y = x_new + ((momentum - 1.0) / momentum_new) * step
+                momentum = momentum_new
+            else:
+                y = x_new
+            x = x_new
+            t += 1
+
+            f_old, f = f, objective(x)
+            monitor.record(t, x, f, grad_norm)
+            if callback is not None:
+                callback(x, *args, **kwargs)
+
+            message = _converged(self.gtol, self.xtol, self.ftol, grad_norm, x,
+                                 step, f_old, f)
+            if message is None:
+                if y is x:
+                    f_y, g_y = f_new, monitor.grad(y)
+                else:
+                    f_y, g_y = monitor.value_and_grad(y)
+
+        converged = message is not None
+        if not converged:
+            message = "maximum number of iterations reached"
+        self.result = monitor.result(x=x, n_iter=t, converged=converged,
+                                     message=message, grad_norm=grad_norm)
+        return x
@@ -0,0 +1,349 @@
+"""Defines mini-batch stochastic gradient optimizers: the SGD, Adam, and
+AdaGrad classes.
+
+References
+----------
+John Duchi, Elad Hazan, and Yoram Singer. Adaptive subgradient methods for
+    online learning and stochastic optimization. Journal of Machine Learning
+    Research 12 (2011), 2121-2159.
+Diederik P. Kingma and Jimmy Ba. Adam: A method for stochastic optimization.
+    arXiv preprint (2014). URL: https://arxiv.org/abs/1412.6980
+"""
+
+import abc
+
+import numpy as np
+
+from .base import Optimizer
+from .base import _Monitor
+from ..utils import validate_bool
+from ..utils import validate_float
+from ..utils import validate_int
+
+
+class StochasticOptimizer(Optimizer, metaclass=abc.ABCMeta):
+    """Abstract base class for mini-batch stochastic gradient optimizers.
+
+    The objective function must be an average over n observations whose
+    gradient accepts an `index` keyword argument selecting the observations of
+    a mini-batch (e.g., stattools.glm.MSELoss or
+    stattools.glm.CrossEntropyLoss, possibly penalized). Each epoch visits the
+    observations once, in mini-batches of `batch_size` observations, and
+    updates the parameter after each mini-batch. The learning rate is constant
+    within an epoch and follows a schedule across epochs.
+
+    Subclasses implement `_init_state` and `_step` to define the update rule.
+    """
+
+    def __init__(self, rate, batch_size=32, epochs=10, schedule="constant",
+                 decay=0.0, shuffle=True, tol=0.0, random_state=None):
+        """Initialize the parameters of a stochastic optimizer.
+
+        Parameters
+        ----------
+        rate : float
+            Initial step size/learning rate. Must be positive.
+        batch_size : int, optional
+            Number of observations in each mini-batch.
+        epochs : int, optional
+            Maximum number of passes through the observations.
+        schedule : str or callable, optional
+            Learning rate schedule across epochs. Acceptable values:
+                "constant" (default):
+                    The learning rate is `rate` in every epoch.
+                "inverse":
+                    The learning rate in epoch t is rate / (1 + decay * t).
+                "exponential":
+                    The learning rate in epoch t is rate * exp(-decay * t).
+                callable:
+                    A function of the epoch number t (starting at 0) returning
+                    the learning rate.
+        decay : float, optional
+            Decay parameter of the "inverse" and "exponential" schedules.
+        shuffle : bool, optional
+            Indicates whether the observations are visited in a new random
+            order in each epoch. If False, the mini-batches are consecutive
+            blocks of observations in their original order.
+        tol : float, optional
+            If positive, the full objective function is evaluated after each
+            epoch, and the algorithm stops when its relative decrease,
+            (f_old - f) / max(|f_old|, |f|, 1), is at most `tol`.
+        random_state : int or numpy.random.RandomState object, optional
+            A valid initializer for a numpy.random.RandomState object, used to
+            shuffle the observations.
+        """
+        self.rate = validate_float(rate, "rate", positive=True)
+        self.batch_size = validate_int(batch_size, "batch_size", minimum=1)
+        self.epochs = validate_int(epochs, "epochs", minimum=1)
+        if not callable(schedule) \
+                and schedule not in ("constant", "inverse", "exponential"):
+            raise ValueError(f"Unknown learning rate schedule: {schedule}")
+        self.schedule = schedule
+        self.decay = validate_float(decay, "decay", minimum=0.0)
+        self.shuffle = validate_bool(shuffle, "shuffle")
+        self.tol = validate_float(tol, "tol", minimum=0.0)
+        if isinstance(random_state, np.random.RandomState):
+            self.random_state = random_state
+        else:
+            self.random_state = np.random.RandomState(random_state)
+
+    def _rate(self, epoch):
+        """Learning rate in an epoch."""
+        if callable(self.schedule):
+            return self.schedule(epoch)
+        elif self.schedule == "inverse":
+            return self.rate / (1.0 + self.decay * epoch)
+        elif self.schedule == "exponential":
+            return self.rate * np.exp(-self.decay * epoch)
+        else:
+            return self.rate
+
+    @abc.abstractmethod
+    def _init_state(self, x):
+        """Initialize the state of the update rule (e.g., moment estimates).
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            The initial parameter.
+
+        Returns
+        -------
+        A dictionary holding the state.
+        """
+        pass
+
+    @abc.abstractmethod
+    def _step(self, g, rate, state):
+        """Compute the parameter update from a mini-batch gradient.
+
+        Parameters
+        ----------
+        g : numpy.ndarray
+            The mini-batch gradient.
+        rate : float
+            The current learning rate.
+        state : dict
+            The state of the update rule (updated in place).
+
+        Returns
+        -------
+        The step to add to the parameter.
+        """
+        pass
+
+    def optimize(self, x0, func, grad=None, n=None, args=None, kwargs=None,
+                 callback=None, trace=False):
+        """Approximate a minimizer of the objective function.
+
+        Parameters
+        ----------
+        x0: array-like
+            Initial guess for the minimizer.
+        func: callable
+            The objective function to minimize (an average over the
+            observations).
+        grad: callable, optional
+            Gradient of the objective function. This must be a function
+            accepting the mini-batch as a keyword argument `index` (an integer
+            array or a slice of observations) and returning an array of the
+            same shape as `x0`. If it is not specified, then `func` needs to
+            have a 'grad' attribute.
+        n: int, optional
+            Number of observations. If it is not specified, then `func` needs
+            to have an 'n' attribute.
+        args: sequence, optional
+            Extra positional arguments to pass to the objective function and
+            gradient.
+        kwargs: dict, optional
+            Extra keyword arguments to pass to the objective function and
+            gradient.
+        callback: callable, optional
+            Function to call after every epoch. The function is called on the
+            current value of the parameter being minimized along with the extra
+            arguments specified by `args` and `kwargs`.
+        trace: bool, optional
+            If True, the parameter and objective function value after each
+            epoch are recorded and stored in the `trace` attribute of
+            `self.result`.
+
+        Returns
+        -------
+        x : array-like
+            The approximate minimizer of the objective function.
+        """
+        if not callable(func):
+            raise ValueError(f"Objective function {func} is not callable")
+
+        if grad is None:
+            if hasattr(func, "grad"):
+                grad = func.grad
+            else:
+                raise ValueError("Could not detect objective function gradient")
+        if not callable(grad):
+            raise ValueError(f"Gradient {grad} is not callable")
+
+        if n is None:
+            if hasattr(func, "n"):
+                n = func.n
+            else:
+                raise ValueError("Could not detect the number of observations")
+        n = validate_int(n, "n", minimum=1)
+
+        if args is None:
+            args = ()
+        if kwargs is None:
+            kwargs = {}
+
+        trace = validate_bool(trace, "trace")
+        monitor = _Monitor(func=func, grad=grad, args=args, kwargs=kwargs,
+                           iterations=self.epochs, trace=trace, x0=x0)
+
+        x = np.array(x0, dtype=np.float_)
+        state = self._init_state(x)
+        f = monitor.func(x) if self.tol > 0 else None
+        monitor.record(0, x, f)
+        if callback is not None:
+            callback(x, *args, **kwargs)
+
+        message = None
+        epoch = 0
+        while message is None and epoch < self.epochs:
+            rate = self._rate(epoch)
+            if self.shuffle:
+                order = self.random_state.permutation(n)
+            for start in range(0, n, self.batch_size):
+                if self.shuffle:
+                    index = order[start:start + self.batch_size]
+                else:
+                    index = slice(start, start + self.batch_size)
+                x += self._step(monitor.grad(x, index=index), rate, state)
+            epoch += 1
+
+            f_old, f = f, (monitor.func(x) if self.tol > 0 else None)
+            monitor.record(epoch, x, f)
+            if callback is not None:
+                callback(x, *args, **kwargs)
+
+            if f is not None \
+                    and f_old - f <= self.tol * max(abs(f_old), abs(f), 1.0):
+                message = "objective change below tol"
+
+        converged = message is not None
+        if not converged:
+            message = "maximum number of epochs reached"
+        self.result = monitor.result(x=x, n_iter=epoch, converged=converged,
+                                     message=message)
+        return x
+
+
+class SGD(StochasticOptimizer):
+    """Mini-batch stochastic gradient descent with momentum."""
+
+    def __init__(self, rate=0.01, momentum=0.0, nesterov=False, **kwargs):
+        """Initialize the parameters of a stochastic gradient descent object.
+
+        Parameters
+        ----------
+        rate : float, optional
+            Initial step size/learning rate. Must be positive.
+        momentum : float, optional
+            Momentum parameter. Must be nonnegative.
+        nesterov : bool, optional
+            If True, the update rule is Nesterov's accelerated gradient descent.
+            If False, the update rule is gradient descent with momentum.
+        kwargs : dict, optional
+            Mini-batch parameters batch_size, epochs, schedule, decay, shuffle,
+            tol, and random_state. See StochasticOptimizer.
+        """
+        super(SGD, self).__init__(rate=rate, **kwargs)
+        self.momentum = validate_float(momentum, "momentum", minimum=0.0)
+        self.nesterov = validate_bool(nesterov, "nesterov")
+
+    def _init_state(self, x):
+        return {"u": np.zeros(x.shape)}
+
+    def _step(self, g, rate, state):
+        u_prev = state["u"]
+        u = self.momentum * u_prev - rate * g
+        state["u"] = u
+        if self.nesterov:
+            return (1 + self.momentum) * u - self.momentum * u_prev
+        else:
+            return u
+
+
+class Adam(StochasticOptimizer):
+    """The Adam optimizer (Kingma and Ba (2014)): stochastic gradient descent
+    with step sizes adapted to bias-corrected estimates of the first and second
+    moments of the gradient."""
+
+    def __init__(self, rate=0.001, beta1=0.9, beta2=0.999, eps=1e-8,
+                 **kwargs):
+        """Initialize the parameters of an Adam optimizer.
+
+        Parameters
+        ----------
+        rate : float, optional
+            Initial step size/learning rate. Must be positive.
+        beta1 : float, optional
+            Exponential decay rate of the first moment estimates (in [0, 1)).
+        beta2 : float, optional
+            Exponential decay rate of the second moment estimates (in [0, 1)).
+        eps : float, optional
+            Small positive constant preventing division by zero.
+        kwargs : dict, optional
+            Mini-batch parameters batch_size, epochs, schedule, decay, shuffle,
+            tol, and random_state. See StochasticOptimizer.
+        """
+        super(Adam, self).__init__(rate=rate, **kwargs)
+        self.beta1 = validate_float(beta1, "beta1", minimum=0.0, maximum=1.0)
+        self.beta2 = validate_float(beta2, "beta2", minimum=0.0, maximum=1.0)
+        if self.beta1 == 1.0 or self.beta2 == 1.0:
+            raise ValueError("Parameters 'beta1' and 'beta2' must be less "
+                             "than 1.")
+        self.eps = validate_float(eps, "eps", positive=True)
+
+    def _init_state(self, x):
+        return {"m": np.zeros(x.shape), "v": np.zeros(x.shape), "t": 0}
+
+    def _step(self, g, rate, state):
+        state["t"] += 1
+        m, v, t = state["m"], state["v"], state["t"]
+        m *= self.beta1
+        m += (1 - self.beta1) * g
+        v *= self.beta2
+        v += (1 - self.beta2) * g * g
+        # Bias corrections folded into the step size
+        rate_t = rate * np.sqrt(1 - self.beta2 ** t) / (1 - self.beta1 ** t)
+        return -rate_t * m / (np.sqrt(v) + self.eps)
+
+
+class AdaGrad(StochasticOptimizer):
+    """The AdaGrad optimizer (Duchi et al. (2011)): stochastic gradient descent
+    with per-coordinate step sizes inversely proportional to the root sum of
+    squares of the past gradients."""
+
+    def __init__(self, rate=0.01, eps=1e-8, **kwargs):
+        """Initialize the parameters of an AdaGrad optimizer.
+
+        Parameters
+        ----------
+        rate : float, optional
+            Initial step size/learning rate. Must be positive.
+        eps : float, optional
+            Small positive constant preventing division by zero.
+        kwargs : dict, optional
+            Mini-batch parameters batch_size, epochs, schedule, decay, shuffle,
+            tol, and random_state. See StochasticOptimizer.
+        """
+        super(AdaGrad, self).__init__(rate=rate, **kwargs)
+        self.eps = validate_float(eps, "eps", positive=True)
+
+    def _init_state(self, x):
+        return {"g2": np.zeros(x.shape)}
+
+    def _step(self, g, rate, state):
+        g2 = state["g2"]
+        g2 += g * g
+        return -rate * g / (np.sqrt(g2) + self.eps)
@@ -98,6 +98,47 @@ class TestGradientDescent(unittest.TestCase):
             x = gd.optimize(x0=x0, func=func, grad=grad)
             np.testing.assert_almost_equal(x, np.zeros(size))
 
+    def test_stopping_and_result(self):
+        """Gradient descent stops once the tolerance criteria are met and
+        records a summary of the run.
+        """
+
+        def func(x):
+            return np.dot(x, x)
+
+        func.grad = lambda x: 2.0 * np.asarray(x)
+        x0 = np.arange(1.0, 6.0)
+
+        gd = GradientDescent(rate=0.1, iterations=10000, gtol=1e-8)
+        x = gd.optimize(x0=x0, func=func)
+        result = gd.result
+        self.assertTrue(result.converged)
+        self.assertLess(result.n_iter, 200)
+        self.assertLessEqual(result.grad_norm, 1e-8)
+        self.assertEqual(result.n_gev, result.n_iter + 1)
+        self.assertEqual(result.n_fev, 0)
+        self.assertEqual(result.iteration_times.shape, (result.n_iter,))
+        self.assertIsNone(result.trace)
+        np.testing.assert_almost_equal(x, np.zeros(5))
+
+        # The objective change criterion needs function evaluations
+        gd = GradientDescent(rate=0.1, gtol=0.0, ftol=1e-6)
+        gd.optimize(x0=x0, func=func)
+        self.assertEqual(gd.result.message, "objective change below ftol")
+        self.assertEqual(gd.result.n_fev, gd.result.n_iter + 1)
+
+        # Without tolerances, all iterations are performed
+        gd = GradientDescent(rate=0.1, iterations=50, gtol=0.0)
+        gd.optimize(x0=x0, func=func, trace=True)
+        result = gd.result
+        self.assertFalse(result.converged)
+        self.assertEqual(result.n_iter, 50)
+        self.assertEqual(result.trace["x"].shape, (51, 5))
+        np.testing.assert_array_equal(result.trace["x"][0], x0)
+        np.testing.assert_allclose(result.trace["f"],
+                                   [func(x) for x in result.trace["x"]])
+        self.assertTrue(np.all(np.diff(result.trace["grad_norm"]) < 0))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+"""Unit tests for the LBFGS class."""
+
+import unittest
+
+import numpy as np
+
+from stattools.glm import LinearRegression
+from stattools.optimization import LBFGS
+
+
+class TestLBFGS(unittest.TestCase):
+    def test_quadratic_function_of_one_variable(self):
+        """Minimize f(x)=x^2 (one-dimensional)"""
+
+        def func(x):
+            return x * x
+
+        def grad(x):
+            return 2.0 * x
+
+        x = LBFGS().optimize(x0=100, func=func, grad=grad)
+        self.assertAlmostEqual(x, 0.0)
+
+    def test_ill_conditioned_quadratic(self):
+        """Minimize f(x)=0.5*x.dot(a).dot(x)-b.dot(x) for an ill-conditioned
+        matrix a."""
+        rs = np.random.RandomState(0)
+        p = 50
+        q, _ = np.linalg.qr(rs.normal(size=(p, p)))
+        a = q.dot(np.diag(np.geomspace(1e-2, 1e2, p))).dot(q.T)
+        b = rs.normal(size=p)
+
+        def func(x):
+            return 0.5 * x.dot(a).dot(x) - b.dot(x)
+
+        func.grad = lambda x: a.dot(x) - b
+
+        x = LBFGS(gtol=1e-8, ftol=0.0).optimize(x0=np.zeros(p), func=func)
+        np.testing.assert_allclose(x, np.linalg.solve(a, b), rtol=1e-4)
+
+    def test_rosenbrock(self):
+        """Minimize the Rosenbrock function, evaluating the function and its
+        gradient together."""
+        calls = []
+
+        class Rosenbrock(object):
+            def __call__(self, x):
+                raise AssertionError("value_and_grad() should be used")
+
+            def grad(self, x):
+                raise AssertionError("value_and_grad() should be used")
+
+            def value_and_grad(self, x):
+                calls.append(x)
+                value = np.sum(100 * (x[1:] - x[:-1] ** 2) ** 2
+                               + (1 - x[:-1]) ** 2)
+                grad = np.zeros_like(x)
+                grad[:-1] = -400 * x[:-1] * (x[1:] - x[:-1] ** 2) \
+                    - 2 * (1 - x[:-1])
+                grad[1:] += 200 * (x[1:] - x[:-1] ** 2)
+                return value, grad
+
+        for x0 in ([-1.2, 1.0], np.zeros(10)):
+            x = LBFGS(gtol=1e-8).optimize(x0=x0, func=Rosenbrock())
+            np.testing.assert_allclose(x, np.ones(len(x0)), atol=1e-6)
+        self.assertLess(len(calls), 200)
+
+    def test_linear_regression(self):
+        """L-BFGS minimizes the mean squared error of linear regression."""
+        rs = np.random.RandomState(1)
+        n, p = 200, 30
+        x = rs.normal(size=(n, p))
+        y = 1 + x.dot(rs.normal(size=p)) + rs.normal(size=n)
+
+        model = LinearRegression().fit(x, y, solver=LBFGS(gtol=1e-10,
+                                                          ftol=0.0))
+        expected = LinearRegression().fit(x, y)
+        np.testing.assert_allclose(model.coef, expected.coef, atol=1e-8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""Unit tests for the NewtonCG class."""
+
+import unittest
+
+import numpy as np
+
+from stattools.glm import LinearRegression
+from stattools.glm.linear import MSELoss
+from stattools.optimization import NewtonCG
+from stattools.regularization import ridge
+
+
+class TestNewtonCG(unittest.TestCase):
+    def test_rosenbrock(self):
+        """Minimize the Rosenbrock function, whose Hessian is indefinite away
+        from the minimizer.
+        """
+
+        def func(x):
+            return 100 * (x[1] - x[0] ** 2) ** 2 + (1 - x[0]) ** 2
+
+        def grad(x):
+            return np.array([-400 * x[0] * (x[1] - x[0] ** 2)
+                             - 2 * (1 - x[0]), 200 * (x[1] - x[0] ** 2)])
+
+        def hessp(x, v):
+            hess = np.array([[1200 * x[0] ** 2 - 400 * x[1] + 2,
+                              -400 * x[0]], [-400 * x[0], 200]])
+            return hess.dot(v)
+
+        newton_cg = NewtonCG(gtol=1e-8)
+        x = newton_cg.optimize(x0=[-1.2, 1.0], func=func, grad=grad,
+                               hessp=hessp)
+        np.testing.assert_allclose(x, [1.0, 1.0], atol=1e-6)
+        self.assertTrue(newton_cg.result.converged)
+
+    def test_hessp(self):
+        """Hessian-vector products agree with the Hessians, and minimizing a
+        ridge-penalized least squares loss gives the ridge solution.
+        """
+        rs = np.random.RandomState(0)
+        n, p = 200, 30
+        x = rs.normal(size=(n, p))
+        y = x.dot(rs.normal(size=p)) + rs.normal(size=n)
+        v = rs.normal(size=p)
+
+        loss = ridge(penalty=0.1, loss=MSELoss(x, y))
+        np.testing.assert_allclose(loss.hessp(v, v), loss.hess(v).dot(v))
+
+        newton_cg = NewtonCG(gtol=1e-10)
+        coef = newton_cg.optimize(x0=np.zeros(p), func=loss)
+        expected = np.linalg.solve(x.T.dot(x) / n + 0.2 * np.identity(p),
+                                   x.T.dot(y) / n)
+        np.testing.assert_allclose(coef, expected, atol=1e-8)
+
+        model = LinearRegression().fit(x, y, solver=NewtonCG(gtol=1e-10))
+        expected = LinearRegression().fit(x, y)
+        np.testing.assert_allclose(model.coef, expected.coef, atol=1e-8)
+
+        with self.assertRaises(ValueError):
+            NewtonCG().optimize(x0=np.zeros(p), func=lambda b: 0.0,
+                                grad=lambda b: b)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -43,6 +43,33 @@ class TestNewtonRaphson(unittest.TestCase):
             x = nr.optimize(x0=x0, func=func)
             np.testing.assert_almost_equal(x, np.zeros(size))
 
+    def test_stopping_and_result(self):
+        """Newton-Raphson stops once the gradient vanishes and records a
+        summary of the run.
+        """
+
+        def func(x):
+            return np.sum(x ** 4) + np.dot(x, x)
+
+        func.grad = lambda x: 4 * x ** 3 + 2 * x
+        func.hess = lambda x: np.diag(12 * x ** 2 + 2)
+
+        nr = NewtonRaphson(iterations=1000, gtol=1e-10)
+        x = nr.optimize(x0=np.array([1.0, -2.0, 3.0]), func=func, trace=True)
+        result = nr.result
+        np.testing.assert_almost_equal(x, np.zeros(3))
+        self.assertTrue(result.converged)
+        self.assertLess(result.n_iter, 20)
+        self.assertEqual(result.n_hev, result.n_iter)
+        self.assertEqual(result.trace["f"].shape, (result.n_iter + 1,))
+        self.assertTrue(np.all(np.diff(result.trace["f"]) < 0))
+
+        # A loose step size tolerance stops the algorithm earlier
+        nr = NewtonRaphson(gtol=0.0, xtol=1e-2)
+        nr.optimize(x0=np.array([1.0, -2.0, 3.0]), func=func)
+        self.assertEqual(nr.result.message, "step size below xtol")
+        self.assertLess(nr.result.n_iter, result.n_iter)
+
 
 if __name__ == "__main__":
     unittest.main()
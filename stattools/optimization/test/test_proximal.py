@@ -0,0 +1,59 @@
+"""Unit tests for the ProximalGradient class."""
+
+import unittest
+
+import numpy as np
+
+from stattools.glm.linear import MSELoss
+from stattools.optimization import ProximalGradient
+from stattools.regularization import lasso
+
+
+class TestProximalGradient(unittest.TestCase):
+    def test_lasso(self):
+        """ISTA and FISTA solve the lasso problem with exact zeros, and FISTA
+        needs fewer iterations.
+        """
+        rs = np.random.RandomState(0)
+        n, p, lam = 200, 50, 0.1
+        x = rs.normal(size=(n, p))
+        y = x[:, :5].dot([3, -2, 1.5, 1, -1]) + rs.normal(size=n)
+        loss = lasso(penalty=lam, loss=MSELoss(x, y))
+
+        n_iter = {}
+        for accelerated in (False, True):
+            optimizer = ProximalGradient(accelerated=accelerated, gtol=1e-8,
+                                         iterations=10000)
+            coef = optimizer.optimize(x0=np.zeros(p), func=loss)
+            self.assertTrue(optimizer.result.converged)
+            n_iter[accelerated] = optimizer.result.n_iter
+
+            # Optimality conditions of the lasso problem
+            grad = x.T.dot(y - x.dot(coef)) / n
+            active = coef != 0
+            self.assertLess(np.max(np.abs(grad[active] - lam
+                                          * np.sign(coef[active]))), 1e-6)
+            self.assertLessEqual(np.max(np.abs(grad[~active])), lam)
+            self.assertGreater(np.sum(~active), p // 2)
+        self.assertLess(n_iter[True], n_iter[False])
+
+    def test_smooth(self):
+        """Without a proximal operator, the algorithm minimizes the smooth
+        function, and the trace records the objective function.
+        """
+        rs = np.random.RandomState(1)
+        n, p = 100, 10
+        x = rs.normal(size=(n, p))
+        y = x.dot(rs.normal(size=p)) + rs.normal(size=n)
+        loss = MSELoss(x, y)
+
+        optimizer = ProximalGradient(step=10.0, gtol=1e-10)
+        coef = optimizer.optimize(x0=np.zeros(p), func=loss, trace=True)
+        expected, *_ = np.linalg.lstsq(x, y, rcond=None)
+        np.testing.assert_allclose(coef, expected, atol=1e-8)
+        np.testing.assert_allclose(optimizer.result.trace["f"][-1],
+                                   loss(coef))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Unit tests for the stochastic optimizers."""
+
+import unittest
+
+import numpy as np
+
+from stattools.glm.linear import MSELoss
+from stattools.optimization import AdaGrad
+from stattools.optimization import Adam
+from stattools.optimization import SGD
+
+
+class TestStochastic(unittest.TestCase):
+    def test_least_squares(self):
+        """Minimize the mean squared error of a linear model from mini-batch
+        gradients.
+        """
+        rs = np.random.RandomState(0)
+        n, p = 2000, 5
+        x = rs.normal(size=(n, p))
+        y = x.dot(np.arange(1, p + 1)) + 0.1 * rs.normal(size=n)
+        coef, *_ = np.linalg.lstsq(x, y, rcond=None)
+        loss = MSELoss(x, y)
+
+        optimizers = (
+            SGD(rate=0.05, momentum=0.5, epochs=20, random_state=0,
+                schedule="inverse", decay=1.0),
+            SGD(rate=0.05, momentum=0.5, nesterov=True, epochs=20,
+                random_state=0, schedule="inverse", decay=1.0),
+            Adam(rate=0.05, epochs=20, random_state=0,
+                 schedule="exponential", decay=0.2),
+            AdaGrad(rate=0.5, epochs=20, random_state=0))
+        for optimizer in optimizers:
+            x_opt = optimizer.optimize(x0=np.zeros(p), func=loss)
+            np.testing.assert_allclose(x_opt, coef, atol=1e-2)
+            result = optimizer.result
+            self.assertEqual(result.n_iter, 20)
+            self.assertEqual(result.n_gev, 20 * (n // 32 + 1))
+            self.assertEqual(result.n_fev, 0)
+
+    def test_options(self):
+        """Shuffling is reproducible, and the tolerance stops the algorithm
+        early.
+        """
+        rs = np.random.RandomState(1)
+        n, p = 500, 3
+        x = rs.normal(size=(n, p))
+        y = x.dot([1, 2, 3]) + rs.normal(size=n)
+        loss = MSELoss(x, y)
+
+        x1 = SGD(random_state=2).optimize(x0=np.zeros(p), func=loss)
+        x2 = SGD(random_state=2).optimize(x0=np.zeros(p), func=loss)
+        np.testing.assert_array_equal(x1, x2)
+
+        sgd = SGD(epochs=100, shuffle=False, tol=1e-4)
+        sgd.optimize(x0=np.zeros(p), func=loss, trace=True)
+        self.assertTrue(sgd.result.converged)
+        self.assertLess(sgd.result.n_iter, 100)
+        self.assertEqual(sgd.result.n_fev, sgd.result.n_iter + 1)
+        self.assertEqual(sgd.result.trace["f"].shape, (sgd.result.n_iter + 1,))
+
+        # The learning rate schedule can be any function of the epoch
+        sgd = SGD(epochs=3, schedule=lambda t: 0.01 / 2 ** t)
+        self.assertEqual(sgd._rate(2), 0.0025)
+
+        with self.assertRaises(ValueError):
+            SGD(schedule="cosine")
+        with self.assertRaises(ValueError):
+            SGD().optimize(x0=np.zeros(p), func=lambda b: 0.0,
+                           grad=lambda b: b)
+
+
+if __name__ == "__main__":
+    unittest.main()
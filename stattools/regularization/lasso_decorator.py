@@ -8,6 +8,10 @@ from ..utils import validate_float
 def lasso(penalty, loss=None):
     """Create a LASSO regression (L1 regularization/penalty) decorator.
 
+    The penalized loss function has a `prox` method (the soft-thresholding
+    operator) and a `smooth` attribute (the unpenalized loss function), so it
+    can be minimized by stattools.optimization.ProximalGradient.
+
     Parameters
     ----------
     penalty : float
@@ -32,16 +36,35 @@ def lasso(penalty, loss=None):
             def __init__(self):
                 self.func = func
                 self.penalty = penalty
+                # The smooth part of the penalized loss (used by proximal
+                # gradient methods together with prox())
+                self.smooth = func
+                if hasattr(func, "n"):
+                    # Number of observations (used by stochastic optimizers)
+                    self.n = func.n
 
             def __call__(self, x, *args, **kwargs):
                 penalty = self.penalty * np.linalg.norm(x, ord=1)
                 return self.func(x, *args, **kwargs) + penalty
 
+            def prox(self, x, step):
+                """Proximal operator of step * penalty * ||.||_1, i.e.,
+                soft-thresholding at step * penalty."""
+                threshold = step * self.penalty
+                return np.sign(x) * np.maximum(np.abs(x) - threshold, 0.0)
+
             if hasattr(func, "grad") and callable(func.grad):
                 def grad(self, x, *args, **kwargs):
                     penalty = self.penalty * np.sign(x)
                     return self.func.grad(x, *args, **kwargs) + penalty
 
+            if hasattr(func, "value_and_grad") \
+                    and callable(func.value_and_grad):
+                def value_and_grad(self, x, *args, **kwargs):
+                    value, grad = self.func.value_and_grad(x, *args, **kwargs)
+                    value += self.penalty * np.linalg.norm(x, ord=1)
+                    return value, grad + self.penalty * np.sign(x)
+
         return LASSODecorator()
 
     if loss is None:
@@ -32,6 +32,9 @@ def ridge(penalty, loss=None):
             def __init__(self):
                 self.func = func
                 self.penalty = penalty
+                if hasattr(func, "n"):
+                    # Number of observations (used by stochastic optimizers)
+                    self.n = func.n
 
             def __call__(self, x, *args, **kwargs):
                 penalty = self.penalty * np.dot(x, x)
@@ -47,6 +50,28 @@ def ridge(penalty, loss=None):
                     penalty = 2.0 * self.penalty * np.identity(np.shape(x)[0])
                     return self.func.hess(x, *args, **kwargs) + penalty
 
+            if hasattr(func, "hessp") and callable(func.hessp):
+                def hessp(self, x, v, *args, **kwargs):
+                    penalty = 2.0 * np.multiply(self.penalty, v)
+                    return self.func.hessp(x, v, *args, **kwargs) + penalty
+
+            if hasattr(func, "value_and_grad") \
+                    and callable(func.value_and_grad):
+                def value_and_grad(self, x, *args, **kwargs):
+                    value, grad = self.func.value_and_grad(x, *args, **kwargs)
+                    value += self.penalty * np.dot(x, x)
+                    return value, grad + 2.0 * np.multiply(self.penalty, x)
+
+            if hasattr(func, "value_grad_hess") \
+                    and callable(func.value_grad_hess):
+                def value_grad_hess(self, x, *args, **kwargs):
+                    value, grad, hess = self.func.value_grad_hess(x, *args,
+                                                                  **kwargs)
+                    value += self.penalty * np.dot(x, x)
+                    grad = grad + 2.0 * np.multiply(self.penalty, x)
+                    hess = hess + 2.0 * self.penalty * np.identity(np.size(x))
+                    return value, grad, hess
+
         return RidgeDecorator()
 
     if loss is None:
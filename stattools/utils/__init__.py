@@ -1,5 +1,9 @@
 """Miscellaneous utility functions and classes for StatTools."""
 
+from .batch import iter_batches
+from .parallel import parallel_map
+from .parallel import spawn_random_states
+from .parallel import validate_n_jobs
 from .summary import BaseSummary
 from .validation import validate_bool
 from .validation import validate_float
@@ -0,0 +1,68 @@
+"""Functions for iterating over data in batches."""
+
+import collections.abc
+
+import numpy as np
+
+from .validation import validate_int
+
+
+def iter_batches(data, batch_size, random_state=None):
+    """Split data into batches of consecutive rows.
+
+    Parameters
+    ----------
+    data : array-like or iterator
+        The data to split. This can be one of the following.
+            *   A numpy.ndarray or another array-like (e.g., a list of rows or a
+                pandas.DataFrame), which is converted to a numpy.ndarray. If
+                `random_state` is given, each batch consists of randomly chosen
+                rows.
+            *   A numpy.memmap (e.g., from numpy.load(..., mmap_mode="r")). Only
+                one batch is read into memory at a time. If `random_state` is
+                given, the batches are visited in random order, but each batch
+                is a block of consecutive rows to keep disk reads sequential.
+            *   An iterator of array-like chunks (e.g., a generator or a CSV
+                reader such as pandas.read_csv(..., chunksize=...)). Each chunk
+                is split into batches separately, so only one chunk is held in
+                memory at a time. If `random_state` is given, the rows of each
+                chunk are shuffled first.
+    batch_size : int
+        Maximum number of rows in each batch.
+    random_state : numpy.random.RandomState, optional
+        Random number generator used to shuffle the data. If None, the batches
+        are produced in order.
+
+    Yields
+    ------
+    batch : numpy.ndarray
+        A batch of at most `batch_size` rows.
+    """
+    batch_size = validate_int(batch_size, "batch_size", minimum=1)
+
+    # Only iterators are streams of chunks; other iterables (e.g., lists of
+    # rows) are arrays
+    if not isinstance(data, (np.ndarray, collections.abc.Iterator)):
+        data = np.asarray(data)
+
+    if isinstance(data, np.memmap):
+        starts = np.arange(0, len(data), batch_size)
+        if random_state is not None:
+            random_state.shuffle(starts)
+        for start in starts:
+            yield np.asarray(data[start:start + batch_size])
+    elif isinstance(data, np.ndarray):
+        if random_state is None:
+            for start in range(0, len(data), batch_size):
+                yield data[start:start + batch_size]
+        else:
+            order = random_state.permutation(len(data))
+            for start in range(0, len(data), batch_size):
+                yield data[np.sort(order[start:start + batch_size])]
+    else:
+        for chunk in data:
+            chunk = np.asarray(chunk)
+            if random_state is not None:
+                chunk = chunk[random_state.permutation(len(chunk))]
+            for start in range(0, len(chunk), batch_size):
+                yield chunk[start:start + batch_size]
@@ -0,0 +1,200 @@
+"""Functions for running independent computations in parallel."""
+
+import collections
+import concurrent.futures
+import multiprocessing
+import numbers
+import os
+
+import numpy as np
+
+# Arrays shared with forked worker processes. Worker processes inherit this
+# dictionary from the parent process, so the arrays are never copied.
+_FORK_SHARED = {}
+
+# Description of an array placed in shared memory
+_SharedArray = collections.namedtuple("_SharedArray",
+                                      ["name", "shape", "dtype"])
+
+
+def validate_n_jobs(n_jobs) -> int:
+    """Validate the number of parallel workers.
+
+    Parameters
+    ----------
+    n_jobs : int or None
+        Number of workers. If None, 1 worker is used. If negative, this counts
+        backwards from the number of CPUs (-1 means all CPUs, -2 means all but
+        one CPU, and so on).
+
+    Returns
+    -------
+    The number of workers as a positive int.
+
+    Raises
+    ------
+    TypeError if n_jobs is not None or an int.
+    ValueError if n_jobs is 0.
+    """
+    if n_jobs is None:
+        return 1
+    if not isinstance(n_jobs, numbers.Integral):
+        raise TypeError("Parameter 'n_jobs' must be an int or None.")
+    n_jobs = int(n_jobs)
+    if n_jobs == 0:
+        raise ValueError("Parameter 'n_jobs' cannot be 0.")
+    if n_jobs < 0:
+        n_jobs = max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def spawn_random_states(random_state: np.random.RandomState, n: int) -> list:
+    """Create independent child random number generators.
+
+    The children are derived from a single draw from `random_state`, so the
+    streams depend only on the state of `random_state` and not on how the
+    children are later distributed among parallel workers.
+
+    Parameters
+    ----------
+    random_state : numpy.random.RandomState
+        Parent random number generator.
+    n : int
+        Number of children.
+
+    Returns
+    -------
+    List of n numpy.random.RandomState objects with statistically independent
+    streams.
+    """
+    entropy = random_state.randint(2 ** 32, size=4, dtype=np.uint64)
+    seeds = np.random.SeedSequence([int(e) for e in entropy]).spawn(n)
+    return [np.random.RandomState(np.random.MT19937(seed)) for seed in seeds]
+
+
+def parallel_map(func, shared, tasks, n_jobs=1, backend="thread") -> list:
+    """Evaluate func(*shared, *task) for each task, possibly in parallel.
+
+    Parameters
+    ----------
+    func : callable
+        Function to evaluate. For the "process" backend, this must be picklable
+        (e.g., defined at the top level of a module).
+    shared : sequence
+        Arguments common to every task (typically large arrays). These are
+        passed to the workers without copying: threads share them directly,
+        forked processes inherit them, and other processes attach to a shared
+        memory copy made once.
+    tasks : iterable of sequences
+        The remaining positional arguments of `func` for each task.
+    n_jobs : int or None, optional
+        Number of workers. See validate_n_jobs().
+    backend : str, optional
+        Either "thread" (a thread pool; NumPy releases the GIL in most of its
+        heavy computations) or "process" (a process pool).
+
+    Returns
+    -------
+    List of the values of `func` for each task, in the order of `tasks`.
+    """
+    n_jobs = validate_n_jobs(n_jobs)
+    if backend not in ("thread", "process"):
+        raise ValueError(f"Unknown parallel backend: {backend}")
+    shared = tuple(shared)
+    tasks = [tuple(task) for task in tasks]
+
+    if n_jobs == 1 or len(tasks) <= 1:
+        return [func(*shared, *task) for task in tasks]
+
+    n_jobs = min(n_jobs, len(tasks))
+    if backend == "thread":
+        with concurrent.futures.ThreadPoolExecutor(n_jobs) as executor:
+            futures = [executor.submit(func, *shared, *task) for task in tasks]
+            return [future.result() for future in futures]
+    elif "fork" in multiprocessing.get_all_start_methods():
+        return _map_forked(func, shared, tasks, n_jobs)
+    else:
+        return _map_shared_memory(func, shared, tasks, n_jobs)
+
+
+def _map_forked(func, shared, tasks, n_jobs):
+    """Evaluate tasks in forked worker processes which inherit the shared
+    arguments from the parent process.
+    """
+    key = id(shared)
+    _FORK_SHARED[key] = shared
+    try:
+        # A multiprocessing pool rather than a ProcessPoolExecutor, whose
+        # start method can only be chosen in Python 3.7 or later
+        context = multiprocessing.get_context("fork")
+        with context.Pool(n_jobs) as pool:
+            return pool.starmap(_call_forked,
+                                [(func, key, task) for task in tasks])
+    finally:
+        del _FORK_SHARED[key]
+
+
+def _call_forked(func, key, task):
+    """Evaluate a task in a forked worker process."""
+    return func(*_FORK_SHARED[key], *task)
+
+
+def _map_shared_memory(func, shared, tasks, n_jobs):
+    """Evaluate tasks in worker processes which attach to shared memory copies
+    of the array arguments.
+    """
+    # Shared memory blocks need Python 3.8 or later (they are only used on
+    # platforms without the "fork" start method). Otherwise, each task gets a
+    # copy of the shared arguments.
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        with concurrent.futures.ProcessPoolExecutor(n_jobs) as pool:
+            futures = [pool.submit(func, *shared, *task) for task in tasks]
+            return [future.result() for future in futures]
+
+    blocks = []
+    specs = []
+    try:
+        for arg in shared:
+            if isinstance(arg, np.ndarray):
+                block = shared_memory.SharedMemory(create=True,
+                                                   size=max(arg.nbytes, 1))
+                blocks.append(block)
+                view = np.ndarray(arg.shape, dtype=arg.dtype, buffer=block.buf)
+                view[...] = arg
+                del view
+                specs.append(_SharedArray(block.name, arg.shape,
+                                          arg.dtype.str))
+            else:
+                specs.append(arg)
+
+        with concurrent.futures.ProcessPoolExecutor(n_jobs) as pool:
+            futures = [pool.submit(_call_shared_memory, func, specs, task)
+                       for task in tasks]
+            return [future.result() for future in futures]
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _call_shared_memory(func, specs, task):
+    """Evaluate a task in a worker process attached to shared memory."""
+    from multiprocessing import shared_memory
+
+    blocks = []
+    args = []
+    try:
+        for spec in specs:
+            if isinstance(spec, _SharedArray):
+                block = shared_memory.SharedMemory(name=spec.name)
+                blocks.append(block)
+                args.append(np.ndarray(spec.shape, dtype=spec.dtype,
+                                       buffer=block.buf))
+            else:
+                args.append(spec)
+        return func(*args, *task)
+    finally:
+        for block in blocks:
+            block.close()
@@ -0,0 +1,49 @@
+"""Unit tests for stattools.utils.parallel."""
+
+import unittest
+
+import numpy as np
+
+from stattools.utils import parallel_map
+from stattools.utils import spawn_random_states
+from stattools.utils import validate_n_jobs
+
+
+def _weighted_sum(x, w, random_state):
+    """Example task: a shared array combined with per-task arguments."""
+    return w * x.sum() + random_state.uniform()
+
+
+class TestParallel(unittest.TestCase):
+    def test_validate_n_jobs(self):
+        """Check the interpretation of the number of workers."""
+        self.assertEqual(validate_n_jobs(None), 1)
+        self.assertEqual(validate_n_jobs(3), 3)
+        self.assertGreaterEqual(validate_n_jobs(-1), 1)
+        with self.assertRaises(ValueError):
+            validate_n_jobs(0)
+        with self.assertRaises(TypeError):
+            validate_n_jobs(1.5)
+
+    def test_parallel_map(self):
+        """Check that every backend gives the serial results in order."""
+        x = np.arange(100.0)
+        random_states = spawn_random_states(np.random.RandomState(0), 5)
+        tasks = list(zip(range(5), random_states))
+        expected = [_weighted_sum(x, *task) for task in tasks]
+
+        for n_jobs, backend in ((1, "thread"), (2, "thread"), (2, "process")):
+            random_states = spawn_random_states(np.random.RandomState(0), 5)
+            tasks = list(zip(range(5), random_states))
+            self.assertEqual(parallel_map(_weighted_sum, (x,), tasks,
+                                          n_jobs=n_jobs, backend=backend),
+                             expected)
+
+        with self.assertRaises(ValueError):
+            parallel_map(_weighted_sum, (x,), tasks, n_jobs=2, backend="gpu")
+        with self.assertRaises(ValueError):
+            parallel_map(_weighted_sum, (x,), tasks, n_jobs=1, backend="gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()